@@ -1,7 +1,11 @@
+import multiprocessing
+
 import customtkinter as ctk
 from ui.dashboard import WorkDashboard
 
 if __name__ == "__main__":
+    # Office text extraction runs in a process pool (also when frozen)
+    multiprocessing.freeze_support()
     app = WorkDashboard()
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
     app.mainloop()
@@ -0,0 +1,289 @@
+"""
+Content Index - Incremental SQLite FTS5 index of text file contents.
+
+"Content" search used to open every text file of the folder and read its
+first 10,000 characters on every keystroke, missing anything past that.
+The ContentIndex keeps the text of those files (up to MAX_FILE_BYTES
+each) in an FTS5 table with the trigram tokenizer, which answers
+case-insensitive substring queries of three or more characters.
+Each file is stored with the (size, mtime_ns) it had when read; a lookup
+only trusts rows whose key still matches the listing, and queues the
+files that are new or changed for the background indexer. Files the
+index cannot answer for yet are still read directly by the caller.
+Office documents are indexed with their extracted text
+(services/office_text.py), so each version is only parsed once.
+
+The database lives at ``<app data>/content_index.sqlite3``; it is read
+from the listing threads (one connection per thread) and written by a
+single indexer thread. Without FTS5's trigram tokenizer (SQLite < 3.34)
+the index stays off and content search reads files as before.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from config.manager import get_app_data_dir
+from services.directory_scanner import FileEntry
+from services.office_text import OFFICE_EXTS, OfficeText
+from services.text_search import detect_encoding
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    dir TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE VIRTUAL TABLE IF NOT EXISTS content USING fts5 (body, tokenize = 'trigram');
+"""
+
+# Shortest term the trigram tokenizer can look up
+MIN_TERM_LENGTH = 3
+
+
+def decode_text(data: bytes) -> str:
+    """Text of file bytes, undecodable bytes dropped.
+
+    The encoding is detected as content search detects it (UTF-8, or
+    UTF-16 with or without a BOM), so the index finds the same files.
+    """
+    encoding, start = detect_encoding(data[:512])
+    return data[start:].decode(encoding, errors="ignore")
+
+
+def read_text(path: str, limit: int) -> str:
+    """Text of the first ``limit`` bytes of a file."""
+    with open(path, "rb") as f:
+        return decode_text(f.read(limit))
+
+
+def match_expression(term: str) -> str:
+    """FTS5 query for ``term`` as a literal substring."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+class ContentIndex:
+    """Process-wide content index, written by one background thread."""
+
+    # Bytes of each file that are indexed
+    MAX_FILE_BYTES = 2 * 1024 * 1024
+
+    # Files written per transaction
+    BATCH_SIZE = 100
+
+    # Overridable for tests; defaults to <app data>/content_index.sqlite3
+    path = None
+    enabled = True
+
+    _local = threading.local()
+    _lock = threading.Lock()
+    _pending: Dict[str, FileEntry] = {}
+    _drain_queued = False
+    _available = None
+
+    # Indexing throughput, for display
+    indexed_files = 0
+    indexed_bytes = 0
+    indexing_seconds = 0.0
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Single writer thread."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="content-index")
+            return cls._executor
+
+    @classmethod
+    def configure(cls, enabled: bool = True, path: Optional[str] = None) -> None:
+        """Turn the index on or off (and point it at another database)."""
+        with cls._lock:
+            cls.enabled = enabled
+            if path is not None and path != cls.path:
+                cls.path = path
+                cls._available = None
+                cls._local = threading.local()
+
+    @classmethod
+    def db_path(cls) -> str:
+        if cls.path is None:
+            cls.path = os.path.join(get_app_data_dir(), "content_index.sqlite3")
+        return cls.path
+
+    @classmethod
+    def _connection(cls) -> Optional[sqlite3.Connection]:
+        """This thread's connection, or None if the index is unavailable."""
+        if not cls.enabled or cls._available is False:
+            return None
+        conn = getattr(cls._local, "conn", None)
+        if conn is not None and getattr(cls._local, "path", None) == cls.db_path():
+            return conn
+        try:
+            conn = sqlite3.connect(cls.db_path(), timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            print(f"Content index unavailable: {e}")
+            cls._available = False
+            return None
+        cls._available = True
+        cls._local.conn = conn
+        cls._local.path = cls.db_path()
+        return conn
+
+    @classmethod
+    def available(cls) -> bool:
+        return cls._connection() is not None
+
+    @classmethod
+    def lookup(cls, entries: Iterable[FileEntry], term: str) -> Dict[str, bool]:
+        """Answer "does this file contain ``term``" from the index.
+
+        Only files whose indexed (size, mtime_ns) match the entry are
+        answered; the others are queued for indexing and left out, so the
+        caller reads them itself. Files larger than MAX_FILE_BYTES are
+        only answered when the indexed part contains the term.
+
+        Args:
+            entries: Text files to check
+            term: Lower-case search term
+
+        Returns:
+            path -> whether the file contains ``term``, for indexed files
+        """
+        entries = [e for e in entries if e.mtime_ns >= 0]
+        conn = cls._connection()
+        if conn is None or not entries:
+            return {}
+        by_dir: Dict[str, List[FileEntry]] = {}
+        for entry in entries:
+            by_dir.setdefault(os.path.dirname(entry.path), []).append(entry)
+
+        answers: Dict[str, bool] = {}
+        stale = []
+        try:
+            for folder, files in by_dir.items():
+                rows = {path: (size, mtime_ns) for path, size, mtime_ns in conn.execute(
+                    "SELECT path, size, mtime_ns FROM files WHERE dir = ?", (folder,))}
+                fresh = []
+                for entry in files:
+                    if rows.get(entry.path) == (entry.size, entry.mtime_ns):
+                        fresh.append(entry)
+                    else:
+                        stale.append(entry)
+                if not fresh or len(term) < MIN_TERM_LENGTH:
+                    continue
+                hits = {path for (path,) in conn.execute(
+                    "SELECT files.path FROM content JOIN files ON files.id = content.rowid "
+                    "WHERE files.dir = ? AND content MATCH ?", (folder, match_expression(term)))}
+                for entry in fresh:
+                    if entry.path in hits:
+                        answers[entry.path] = True
+                    elif entry.size <= cls.MAX_FILE_BYTES:
+                        # Only the start of larger files is indexed
+                        answers[entry.path] = False
+        except sqlite3.Error as e:
+            print(f"Content index lookup failed: {e}")
+            return {}
+        if stale:
+            cls.enqueue(stale)
+        return answers
+
+    @classmethod
+    def enqueue(cls, entries: Iterable[FileEntry]) -> None:
+        """Index (or re-index) ``entries`` in the background."""
+        with cls._lock:
+            for entry in entries:
+                cls._pending[entry.path] = entry
+            if cls._drain_queued or not cls._pending:
+                return
+            cls._drain_queued = True
+        cls.executor().submit(cls._drain)
+
+    @classmethod
+    def stats(cls) -> Dict[str, float]:
+        """Indexed files, database bytes, queue length and indexing rate."""
+        conn = cls._connection()
+        files = 0
+        if conn is not None:
+            try:
+                files = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        size = 0
+        for suffix in ("", "-wal"):
+            try:
+                size += os.path.getsize(cls.db_path() + suffix)
+            except OSError:
+                pass
+        with cls._lock:
+            pending = len(cls._pending)
+        rate = cls.indexed_bytes / cls.indexing_seconds if cls.indexing_seconds else 0.0
+        return {"files": files, "bytes": size, "pending": pending, "bytes_per_second": rate}
+
+    @classmethod
+    def _drain(cls) -> None:
+        """Index queued files, BATCH_SIZE per transaction, until none are left."""
+        while True:
+            with cls._lock:
+                batch = [cls._pending.pop(path) for path in list(cls._pending)[:cls.BATCH_SIZE]]
+                if not batch:
+                    cls._drain_queued = False
+                    return
+            conn = cls._connection()
+            if conn is None:
+                with cls._lock:
+                    cls._pending.clear()
+                    cls._drain_queued = False
+                return
+            started = time.perf_counter()
+            read = 0
+            try:
+                with conn:
+                    for entry in batch:
+                        read += cls._index_file(conn, entry)
+            except sqlite3.Error as e:
+                print(f"Content indexing failed: {e}")
+            cls.indexed_files += len(batch)
+            cls.indexed_bytes += read
+            cls.indexing_seconds += time.perf_counter() - started
+
+    @classmethod
+    def _index_file(cls, conn: sqlite3.Connection, entry: FileEntry) -> int:
+        """Store one file's text under its current key; returns bytes read."""
+        row = conn.execute("SELECT id, size, mtime_ns FROM files WHERE path = ?", (entry.path,)).fetchone()
+        if row is not None and (row[1], row[2]) == (entry.size, entry.mtime_ns):
+            return 0
+        try:
+            st = os.stat(entry.path)
+            if entry.ext in OFFICE_EXTS:
+                text = OfficeText.get(entry.path)
+            else:
+                text = read_text(entry.path, cls.MAX_FILE_BYTES)
+        except OSError:
+            if row is not None:
+                conn.execute("DELETE FROM content WHERE rowid = ?", (row[0],))
+                conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+            return 0
+        if row is None:
+            file_id = conn.execute(
+                "INSERT INTO files (path, dir, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                (entry.path, os.path.dirname(entry.path), st.st_size, st.st_mtime_ns)).lastrowid
+        else:
+            file_id = row[0]
+            conn.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?",
+                         (st.st_size, st.st_mtime_ns, file_id))
+            conn.execute("DELETE FROM content WHERE rowid = ?", (file_id,))
+        conn.execute("INSERT INTO content (rowid, body) VALUES (?, ?)", (file_id, text))
+        return min(st.st_size, cls.MAX_FILE_BYTES)
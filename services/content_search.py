@@ -0,0 +1,167 @@
+"""
+Content Search - Streams "Content" search matches from a worker pool.
+
+The listing worker answers a content search with the name matches only,
+plus the text files whose names did not match (see
+content_candidates()). A panel's ContentSearch then checks those files:
+the ContentIndex rules out the files it knows do not match, and the rest
+are searched whole on a shared pool (services/text_search.py, up to
+``max_file_bytes`` each). Matches are queued with their line number and
+snippet as they are found and the panel adds them to the listing as it
+polls.
+
+Each search has a byte budget; once the files searched add up to it, the
+remaining ones are skipped and reported as such. Every new request (or
+cancel(), called on each keystroke) bumps the generation and the
+in-flight reads of older searches stop at the next file.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from services import text_search
+from services.content_index import ContentIndex
+from services.directory_scanner import FileEntry
+from services.text_search import TextMatch, search_file
+
+
+class ContentProgress:
+    """How far a content search has got."""
+
+    __slots__ = ("total", "checked", "skipped", "bytes_read", "budget")
+
+    def __init__(self, total: int, budget: int):
+        self.total = total
+        self.checked = 0
+        self.skipped = 0
+        self.bytes_read = 0
+        self.budget = budget
+
+    @property
+    def done(self) -> bool:
+        return self.checked + self.skipped >= self.total
+
+
+class ContentSearch:
+    """Per-panel front end to the shared content search pool."""
+
+    MAX_WORKERS = 4
+
+    # Bytes searched in each file, and in all files of one search
+    MAX_FILE_BYTES = text_search.MAX_FILE_BYTES
+    BYTE_BUDGET = 1024 * 1024 * 1024
+
+    # Files per pool task
+    CHUNK_SIZE = 16
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Shared pool for all panels, created on first use."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.MAX_WORKERS, thread_name_prefix="content")
+            return cls._executor
+
+    def __init__(self, budget: Optional[int] = None, max_file_bytes: Optional[int] = None):
+        self.budget = budget or self.BYTE_BUDGET
+        self.max_file_bytes = max_file_bytes or self.MAX_FILE_BYTES
+        self.generation = 0
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self.progress: Optional[ContentProgress] = None
+        # path -> first match, for the files found so far
+        self.hits: Dict[str, TextMatch] = {}
+
+    def start(self, candidates: List[FileEntry], term: str) -> int:
+        """Look for ``term`` (lower-case) in ``candidates``; older searches stop.
+
+        Returns:
+            The generation ID of this search
+        """
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+            self.progress = ContentProgress(len(candidates), self.budget)
+        self.hits = {}
+        self.executor().submit(self._run, generation, list(candidates), term)
+        return generation
+
+    def cancel(self) -> None:
+        """Stop the current search."""
+        with self._lock:
+            self.generation += 1
+            self.progress = None
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    @property
+    def active(self) -> bool:
+        progress = self.progress
+        return progress is not None and not progress.done
+
+    def poll(self) -> Tuple[List[FileEntry], Optional[ContentProgress]]:
+        """Files found since the last poll, and the current progress.
+
+        Their first matches are added to ``hits``. Must be called from the
+        Tk thread.
+        """
+        found = []
+        while True:
+            try:
+                generation, entry, match = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if self.is_current(generation):
+                found.append(entry)
+                self.hits[entry.path] = match
+        return found, self.progress
+
+    # ========== Worker side ==========
+
+    def _run(self, generation: int, candidates: List[FileEntry], term: str) -> None:
+        """Drop the files the index rules out, then fan the rest out over the pool.
+
+        Files the index says match are still searched, for the line and
+        snippet; the search stops at the first match.
+        """
+        if not self.is_current(generation):
+            return
+        answers = ContentIndex.lookup(candidates, term)
+        todo = [e for e in candidates if answers.get(e.path, True)]
+        with self._lock:
+            if not self.is_current(generation):
+                return
+            self.progress.checked += len(candidates) - len(todo)
+        for i in range(0, len(todo), self.CHUNK_SIZE):
+            self.executor().submit(self._read_chunk, generation, todo[i:i + self.CHUNK_SIZE], term)
+
+    def _read_chunk(self, generation: int, entries: List[FileEntry], term: str) -> None:
+        for index, entry in enumerate(entries):
+            with self._lock:
+                if not self.is_current(generation):
+                    return
+                progress = self.progress
+                if progress.bytes_read >= progress.budget:
+                    progress.skipped += len(entries) - index
+                    return
+            try:
+                matches = search_file(entry.path, term, limit=self.max_file_bytes)
+            except Exception:
+                # Unreadable, or a broken Office document: no match, but
+                # still checked, or the search would never be done
+                matches = []
+            searched = matches[0].offset if matches else min(max(entry.size, 0), self.max_file_bytes)
+            with self._lock:
+                if not self.is_current(generation):
+                    return
+                progress.checked += 1
+                progress.bytes_read += searched
+                if matches:
+                    self.results.put((generation, entry, matches[0]))
@@ -0,0 +1,220 @@
+"""
+Directory Scanner - Single-pass directory listing built on os.scandir.
+
+Every entry is classified and stat'ed at most once. Type information comes
+from the ``os.DirEntry`` cache (free on Windows and on most POSIX
+filesystems), and only regular files are stat'ed for size and date.
+Entries matching the panel's ignore rules (services/ignore_rules.py) are
+dropped before that stat, and counted.
+The scanner has no UI dependencies so it can be called from any thread.
+"""
+
+import os
+import datetime
+from typing import Callable, Iterable, Optional
+
+
+# Entries read between checks of a scan's is_cancelled callback
+CANCEL_CHECK_INTERVAL = 256
+
+# Returned by entry_from_direntry for entries matching the ignore rules
+IGNORED = object()
+
+# FileEntry.mtime_ns of a file listed without a stat (slow filesystems),
+# and of one whose stat failed or timed out afterwards
+MTIME_PENDING = -2
+MTIME_UNAVAILABLE = -3
+
+
+class FileEntry:
+    """A single directory entry captured at scan time.
+
+    ``mtime_ns`` is -1 when the entry could not be stat'ed, MTIME_PENDING
+    while its stat has not been done yet and MTIME_UNAVAILABLE when it
+    failed or timed out.
+    """
+
+    __slots__ = ("name", "path", "is_dir", "size", "mtime_ns")
+
+    def __init__(self, name: str, path: str, is_dir: bool,
+                 size: int = 0, mtime_ns: int = -1):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    @property
+    def ext(self) -> str:
+        """Lower-cased extension including the dot ('' for folders)."""
+        if self.is_dir:
+            return ""
+        return os.path.splitext(self.name)[1].lower()
+
+    @property
+    def size_mb(self) -> float:
+        return self.size / (1024 * 1024)
+
+    @property
+    def size_str(self) -> str:
+        """Size as shown in the file list ('' for folders)."""
+        if self.is_dir:
+            return ""
+        return format_size(self.size, self.mtime_ns)
+
+    @property
+    def mod_str(self) -> str:
+        """Modification date as shown in the file list ('' for folders)."""
+        if self.is_dir:
+            return ""
+        return format_date(self.mtime_ns)
+
+    def __repr__(self):
+        kind = "dir" if self.is_dir else "file"
+        return f"FileEntry({self.name!r}, {kind}, size={self.size})"
+
+
+class Listing(list):
+    """The entries of one scanned directory.
+
+    ``ignored`` is the number of entries the ignore rules left out.
+    """
+
+    __slots__ = ("ignored",)
+
+    def __init__(self, entries: Iterable[FileEntry] = (), ignored: int = 0):
+        super().__init__(entries)
+        self.ignored = ignored
+
+
+def format_size(size: int, mtime_ns: int) -> str:
+    """Size column text for a file (``mtime_ns`` tells whether it is known)."""
+    if mtime_ns == MTIME_PENDING:
+        return "…"
+    if mtime_ns == MTIME_UNAVAILABLE:
+        return "unavailable"
+    return f"{size / (1024 * 1024):.2f} MB"
+
+
+def format_date(mtime_ns: int) -> str:
+    """Date column text for a file."""
+    if mtime_ns == MTIME_PENDING:
+        return "…"
+    if mtime_ns == MTIME_UNAVAILABLE:
+        return "unavailable"
+    if mtime_ns < 0:
+        return "Unknown"
+    return format_mtime(mtime_ns)
+
+
+def format_mtime(mtime_ns: int) -> str:
+    """Format a nanosecond timestamp the same way as get_file_info."""
+    try:
+        return datetime.datetime.fromtimestamp(mtime_ns / 1e9).strftime('%Y-%m-%d %H:%M')
+    except (OverflowError, OSError, ValueError):
+        return "Unknown"
+
+
+class DirectoryScanner:
+    """Static methods for listing directories."""
+
+    @staticmethod
+    def scan(path: str, show_hidden_dirs: bool = False,
+             is_cancelled: Optional[Callable[[], bool]] = None,
+             max_entries: Optional[int] = None,
+             ignore=None, stat_files: bool = True) -> Optional[Listing]:
+        """List a directory in a single pass.
+
+        Folders come first, then files, each sorted case-insensitively,
+        matching the order the file list displays. Dot-folders are skipped
+        unless ``show_hidden_dirs`` is set. Entries that are neither folders
+        nor regular files (sockets, broken links) are skipped.
+
+        Args:
+            path: Directory to list
+            show_hidden_dirs: Include folders whose name starts with '.'
+            is_cancelled: Optional callable polled while reading; the scan
+                is abandoned (returns None) once it returns True
+            max_entries: Optional cap; larger directories return None
+            ignore: Optional IgnoreMatcher; matching entries are skipped
+            stat_files: If False, files are listed by name only with
+                mtime_ns MTIME_PENDING (for slow filesystems)
+
+        Returns:
+            Listing of FileEntry objects, or None if cancelled or over the cap
+
+        Raises:
+            OSError: If the directory cannot be opened
+        """
+        folders = []
+        files = []
+        ignored = 0
+        with os.scandir(path) as it:
+            for count, de in enumerate(it, 1):
+                if count % CANCEL_CHECK_INTERVAL == 0 and is_cancelled and is_cancelled():
+                    return None
+                if max_entries is not None and count > max_entries:
+                    return None
+                entry = DirectoryScanner.entry_from_direntry(de, show_hidden_dirs, ignore, stat_files)
+                if entry is None:
+                    continue
+                if entry is IGNORED:
+                    ignored += 1
+                elif entry.is_dir:
+                    folders.append(entry)
+                else:
+                    files.append(entry)
+
+        folders.sort(key=lambda e: e.name.lower())
+        files.sort(key=lambda e: e.name.lower())
+        return Listing(folders + files, ignored)
+
+    @staticmethod
+    def count(path: str, limit: int) -> int:
+        """Number of entries in a directory, counted no further than ``limit`` + 1.
+
+        Only names are read (no stat, no FileEntry), so telling whether a
+        folder is over scan()'s ``max_entries`` is cheap.
+
+        Raises:
+            OSError: If the directory cannot be opened
+        """
+        count = 0
+        with os.scandir(path) as it:
+            for _ in it:
+                count += 1
+                if count > limit:
+                    break
+        return count
+
+    @staticmethod
+    def entry_from_direntry(de: os.DirEntry, show_hidden_dirs: bool = False, ignore=None,
+                            stat_file: bool = True):
+        """Build a FileEntry from an os.DirEntry, or None if it is skipped.
+
+        ``is_dir``/``is_file`` use the cached d_type where available, and
+        ``stat`` is only called for regular files that ``ignore`` (an
+        IgnoreMatcher) lets through; ignored entries return IGNORED.
+        """
+        try:
+            if de.is_dir():
+                if not show_hidden_dirs and de.name.startswith('.'):
+                    return None
+                if ignore is not None and ignore.ignored(de.path, de.name, True):
+                    return IGNORED
+                return FileEntry(de.name, de.path, True)
+            if not de.is_file():
+                return None
+        except OSError:
+            return None
+        if ignore is not None and ignore.ignored(de.path, de.name, False):
+            return IGNORED
+        if not stat_file:
+            return FileEntry(de.name, de.path, False, 0, MTIME_PENDING)
+
+        try:
+            st = de.stat()
+            return FileEntry(de.name, de.path, False, st.st_size, st.st_mtime_ns)
+        except OSError:
+            # Vanished or unreadable between listing and stat
+            return FileEntry(de.name, de.path, False)
@@ -0,0 +1,164 @@
+"""
+Directory Session - One watch per folder, shared by every panel showing it.
+
+Panels used to run a watchdog Observer (a thread plus an OS watch) each,
+so three panels on one folder watched it three times and, on every
+change, rescanned it three times. A DirectorySession is the single watch
+for a folder: panels subscribe to it, and on a change it invalidates the
+folder's cached listing once and notifies every subscriber. The panels'
+refreshes then go through ListingCache, which runs one scan for callers
+asking for the same listing at the same time, and each panel applies its
+own filter, search and sort to the shared result.
+
+All sessions share one Observer thread, started on first use; services
+that need every change below a folder (the name index) add recursive
+watches to it with watch_tree().
+"""
+
+import threading
+from typing import Callable, Dict, Optional
+
+from watchdog.observers import Observer
+
+from services.listing_cache import ListingCache, folder_key
+from services.watchdog_service import FolderChangeHandler, TreeChangeHandler
+
+
+class Subscription:
+    """A panel's interest in a folder; cancel() when done with it."""
+
+    __slots__ = ("path", "token")
+
+    def __init__(self, path: str, token: int):
+        self.path = path
+        self.token = token
+
+    def cancel(self) -> None:
+        DirectorySessions.unsubscribe(self)
+
+
+class DirectorySession:
+    """The subscribers and the watch of one folder."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.callbacks: Dict[int, Callable[[], None]] = {}
+        self.watch = None
+        self.events = 0
+
+    def notify(self) -> None:
+        """The folder changed: drop its cached listing once, tell everyone."""
+        self.events += 1
+        ListingCache.invalidate(self.path)
+        for callback in list(self.callbacks.values()):
+            callback()
+
+
+class DirectorySessions:
+    """Process-wide registry of DirectorySessions."""
+
+    _sessions: Dict[str, DirectorySession] = {}
+    _observer = None
+    _next_token = 0
+    _lock = threading.RLock()
+
+    @classmethod
+    def _create_observer(cls):
+        return Observer()
+
+    @classmethod
+    def subscribe(cls, path: str, callback: Callable[[], None]) -> Subscription:
+        """Call ``callback`` (from the watcher thread) when ``path`` changes.
+
+        The first subscriber to a folder starts watching it; if the watch
+        cannot be set up the subscription still works for shared state but
+        receives no events.
+        """
+        key = folder_key(path)
+        with cls._lock:
+            cls._next_token += 1
+            token = cls._next_token
+            session = cls._sessions.get(key)
+            if session is None:
+                session = cls._sessions[key] = DirectorySession(path)
+                session.watch = cls._schedule(session)
+            session.callbacks[token] = callback
+        return Subscription(path, token)
+
+    @classmethod
+    def unsubscribe(cls, subscription: Subscription) -> None:
+        """Drop a subscription; the last one out stops the watch."""
+        key = folder_key(subscription.path)
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None or session.callbacks.pop(subscription.token, None) is None:
+                return
+            if session.callbacks:
+                return
+            del cls._sessions[key]
+            if session.watch is not None and cls._observer is not None:
+                try:
+                    cls._observer.unschedule(session.watch)
+                except (KeyError, OSError):
+                    pass
+
+    @classmethod
+    def get(cls, path: str) -> Optional[DirectorySession]:
+        with cls._lock:
+            return cls._sessions.get(folder_key(path))
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return {
+                "sessions": len(cls._sessions),
+                "subscribers": sum(len(s.callbacks) for s in cls._sessions.values()),
+                "watched": sum(1 for s in cls._sessions.values() if s.watch is not None),
+            }
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the shared watcher thread (on application exit)."""
+        with cls._lock:
+            observer, cls._observer = cls._observer, None
+            cls._sessions.clear()
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+    @classmethod
+    def watch_tree(cls, path: str, callback: Callable[[str], None]):
+        """Call ``callback(changed_path)`` for every change below ``path``.
+
+        Returns:
+            The watch, for unwatch(), or None if it could not be set up
+        """
+        with cls._lock:
+            return cls._watch(TreeChangeHandler(callback), path, recursive=True)
+
+    @classmethod
+    def unwatch(cls, watch) -> None:
+        with cls._lock:
+            if cls._observer is None:
+                return
+            try:
+                cls._observer.unschedule(watch)
+            except (KeyError, OSError):
+                pass
+
+    @classmethod
+    def _schedule(cls, session: DirectorySession):
+        """Watch a session's folder on the shared observer (lock held)."""
+        return cls._watch(FolderChangeHandler(session.notify), session.path, recursive=False)
+
+    @classmethod
+    def _watch(cls, handler, path: str, recursive: bool):
+        """Schedule ``handler`` on the shared observer (lock held)."""
+        try:
+            if cls._observer is None:
+                cls._observer = cls._create_observer()
+                cls._observer.start()
+            return cls._observer.schedule(handler, path, recursive=recursive)
+        except OSError as e:
+            print(f"Cannot watch {path}: {e}")
+            return None
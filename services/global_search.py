@@ -0,0 +1,194 @@
+"""
+Global Search - One name search over the folders of every panel.
+
+The toolbar's global search used to copy its term into each panel's
+search box, so every panel rescanned its own folder (twice for two panels
+showing the same folder) and the matches stayed split across panels. A
+GlobalSearch runs one query over the union of the panels' folders
+instead. Each distinct folder is listed once on the shared listing pool
+(through the ListingCache); a recursive search walks each folder with a
+RecursiveWalker and leaves folders inside another searched folder to it.
+
+Matches are de-duplicated by path and ranked with rank(); the results
+window polls them from the Tk thread, so they stream in as folders are
+read. A search stops once it has MAX_RESULTS matches.
+"""
+
+import os
+import queue
+import threading
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from services.directory_scanner import FileEntry
+from services.ignore_rules import IgnoreRules
+from services.listing_cache import ListingCache
+from services.listing_filter import ListingQuery, filter_entries
+from services.listing_worker import ListingWorker
+from services.recursive_walker import RecursiveWalker
+from services.slow_fs import SlowPaths
+from services.tree_loader import is_within
+
+
+class GlobalHit(NamedTuple):
+    """A match, the searched folder it was found under, and its rank."""
+    entry: FileEntry
+    root: str
+    rank: tuple
+
+
+def search_roots(paths: Iterable[str], recursive: bool) -> List[str]:
+    """Distinct folders to search, in first-seen order.
+
+    A recursive search also drops folders inside another one.
+    """
+    roots = []
+    seen = set()
+    for path in paths:
+        if not path:
+            continue
+        path = os.path.normpath(path)
+        key = os.path.normcase(path)
+        if key not in seen:
+            seen.add(key)
+            roots.append(path)
+    if not recursive:
+        return roots
+    keys = [os.path.normcase(root) for root in roots]
+    return [root for root, key in zip(roots, keys)
+            if not any(other != key and is_within(key, other) for other in keys)]
+
+
+def rank(entry: FileEntry, term: str, root: str) -> tuple:
+    """Sort key for a match; lower is better.
+
+    Whole-name (or name-without-extension) matches come first, then names
+    starting with the term, then matches at the start of a word, then
+    anywhere; ties go to shallower paths, then shorter names.
+    """
+    name = entry.name.lower()
+    stem = os.path.splitext(name)[0]
+    at = name.find(term)
+    if name == term or stem == term:
+        tier = 0
+    elif at == 0:
+        tier = 1
+    elif at > 0 and not name[at - 1].isalnum():
+        tier = 2
+    else:
+        tier = 3
+    depth = os.path.relpath(entry.path, root).count(os.sep)
+    return (tier, depth, len(name), name)
+
+
+class GlobalSearch:
+    """Front end for one results window: a name search over several folders."""
+
+    MAX_RESULTS = 2000
+
+    def __init__(self):
+        self.generation = 0
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self.walkers: List[Tuple[str, RecursiveWalker]] = []
+        self.term = ""
+        self.pending = 0
+        self.seen = set()
+        self.count = 0
+        self.errors = 0
+        self.truncated = False
+
+    def start(self, roots: List[str], term: str, rules: Optional[IgnoreRules] = None,
+              recursive: bool = False) -> int:
+        """Search ``roots`` for names containing ``term``; older searches stop.
+
+        Args:
+            roots: Folders from search_roots()
+            term: Search term (any case)
+            rules: Ignore rules, bound to each root
+            recursive: Search every sub-folder too
+
+        Returns:
+            The generation ID of this search
+        """
+        self.cancel()
+        with self._lock:
+            generation = self.generation
+        self.term = term.lower()
+        self.seen = set()
+        self.count = 0
+        self.errors = 0
+        self.truncated = False
+        self.pending = len(roots)
+        for root in roots:
+            query = ListingQuery(search_term=self.term,
+                                 ignore=rules.bind(root) if rules is not None else None)
+            if recursive:
+                walker = RecursiveWalker()
+                walker.start(root, query)
+                self.walkers.append((root, walker))
+            else:
+                ListingWorker.executor().submit(self._list, generation, root, query)
+        return generation
+
+    def cancel(self) -> None:
+        """Stop the current search."""
+        with self._lock:
+            self.generation += 1
+        for _, walker in self.walkers:
+            walker.cancel()
+        self.walkers = []
+        self.pending = 0
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    @property
+    def done(self) -> bool:
+        return self.pending == 0
+
+    def poll(self) -> List[GlobalHit]:
+        """New, de-duplicated matches since the last poll.
+
+        Must be called from the Tk thread.
+        """
+        batches = []
+        while True:
+            try:
+                generation, root, entries, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if self.is_current(generation):
+                batches.append((root, entries))
+                self.pending -= 1
+                self.errors += error
+        for root, walker in list(self.walkers):
+            entries, finished = walker.poll()
+            batches.append((root, entries))
+            if finished:
+                self.walkers.remove((root, walker))
+                self.pending -= 1
+
+        hits = []
+        for root, entries in batches:
+            for entry in entries:
+                key = os.path.normcase(entry.path)
+                if key in self.seen:
+                    continue
+                if self.count >= self.MAX_RESULTS:
+                    self.truncated = True
+                    self.cancel()
+                    return hits
+                self.seen.add(key)
+                self.count += 1
+                hits.append(GlobalHit(entry, root, rank(entry, self.term, root)))
+        return hits
+
+    def _list(self, generation: int, root: str, query: ListingQuery) -> None:
+        if not self.is_current(generation):
+            return
+        try:
+            listing = ListingCache.scan(root, query.ignore, stat_files=not SlowPaths.is_slow(root))
+        except OSError:
+            self.results.put((generation, root, [], 1))
+            return
+        self.results.put((generation, root, filter_entries(listing, query), 0))
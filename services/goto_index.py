@@ -0,0 +1,381 @@
+"""
+Goto Index - In-memory fuzzy file-name index behind the Go to file palette.
+
+Ctrl+P opens a palette that matches what is typed against the name of
+every file under the workspace roots (the NameIndex's folders) on each
+keystroke. A FuzzyIndex is a snapshot of NameIndex.files() laid out so
+that a query over a million names takes milliseconds:
+
+- Names are lower-cased once and numbered shortest first, so a scan in
+  id order meets the best-ranked names of a tier first and stops as soon
+  as it has enough of them.
+- The names are joined one per line into a single string, searched with
+  str.find and a regular expression rather than name by name. Names are
+  also grouped by first character, for the prefix tier.
+- Each letter and digit has a bit per name saying whether the name
+  contains it. A query's bits are ANDed, and when few names contain
+  every character of the query only those names are searched.
+
+Matches are ranked in tiers: names starting with the query, names
+containing it at the start of a word, names containing it anywhere, and
+names containing its characters in order ("bdgt" finds "budget.xlsx"),
+most compact first. Within a tier shorter names come first. Each result
+keeps what its search collected (every name containing the term, every
+match, the subset of names searched) as far as the search got, so the
+next keystroke only looks at those names.
+
+GotoIndex holds the current snapshot and rebuilds it on its own thread
+when the NameIndex has changed, at most every MIN_REBUILD_INTERVAL_S.
+"""
+
+import os
+import re
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from services.name_index import NameIndex
+
+
+# Characters with a bit per name
+KEY_CHARS = string.ascii_lowercase + string.digits
+
+# Names handled per step of a build, so the Tk thread gets the GIL in between
+BUILD_CHUNK = 1 << 16
+
+# Only the names containing every letter and digit of the query are
+# searched when they are at most this fraction of all names (collecting
+# them costs about as much per name as scanning all names costs per 20)
+SPARSE_FRACTION = 1 / 16
+
+# Matches of the substring and in-order tiers collected per result slot,
+# and then ranked
+POOL_FACTOR = 2
+
+# Tiers of GotoMatch.tier
+TIER_PREFIX = 0
+TIER_WORD = 1
+TIER_SUBSTRING = 2
+TIER_FUZZY = 3
+
+_ONE = re.compile("1")
+_POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+class GotoMatch(NamedTuple):
+    """A file whose name matched, and how well (TIER_*)."""
+    name: str
+    folder: str
+    tier: int
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.folder, self.name)
+
+
+class Corpus(NamedTuple):
+    """The names (ids and _lines() text) containing every one of ``chars``."""
+    chars: FrozenSet[str]
+    ids: Sequence[int]
+    blob: str
+
+
+class GotoResult(NamedTuple):
+    """The best matches for ``term`` in ``index``.
+
+    What the search learned is kept for the next one: ``containing`` lists
+    the ids of every name containing the term and ``everything`` those of
+    every match, when the search got that far (else None; ``everything``
+    also for a term without letters or digits); ``corpus`` is the subset
+    of names searched, if it was not all of them.
+    """
+    index: "FuzzyIndex"
+    term: str
+    matches: List[GotoMatch]
+    containing: Optional[List[int]]
+    everything: Optional[List[int]]
+    corpus: Optional[Corpus]
+
+
+def _lines(names: Iterable[str]) -> str:
+    """Names one per line, with a line break before the first as well."""
+    return "\n" + "\n".join(names) + "\n"
+
+
+def _find_lines(blob: str, needle: str) -> Iterator[Tuple[int, int]]:
+    """(position, 0) of the first ``needle`` on each line that has one."""
+    pos = blob.find(needle)
+    while pos >= 0:
+        yield pos, 0
+        pos = blob.find(needle, blob.find("\n", pos + 1))
+
+
+def _search_lines(blob: str, pattern) -> Iterator[Tuple[int, int]]:
+    """(position, length) of the first ``pattern`` match on each line that has one."""
+    pos = 0
+    while True:
+        match = pattern.search(blob, pos)
+        if match is None:
+            return
+        yield match.start(), match.end() - match.start()
+        pos = blob.find("\n", match.end())
+
+
+def _numbered(blob: str, hits: Iterator[Tuple[int, int]]) -> Iterator[Tuple[int, int, int]]:
+    """Add the line number to increasing (position, length) hits in a _lines() blob."""
+    line, counted = -1, 0
+    for pos, length in hits:
+        line += blob.count("\n", counted, pos + 1)
+        counted = pos + 1
+        yield line, pos, length
+
+
+def _fuzzy_pattern(chars: str):
+    """Pattern for ``chars`` in order within one line, each at its first chance."""
+    first, rest = re.escape(chars[0]), chars[1:]
+    return re.compile(first + "".join("[^\\n{0}]*{0}".format(re.escape(c)) for c in rest))
+
+
+class FuzzyIndex:
+    """Snapshot of file names (with their folders) for fuzzy matching.
+
+    Ids number the names shortest first. Build on a background thread;
+    searches are safe from any thread, the snapshot never changes.
+    """
+
+    def __init__(self, files: Sequence[Tuple[str, str]]):
+        # Counting sort by length: one pass, no long sort holding the GIL
+        by_length: List[List[Tuple[str, str]]] = []
+        for item in files:
+            size = len(item[0])
+            while len(by_length) <= size:
+                by_length.append([])
+            by_length[size].append(item)
+        ordered = [item for bucket in by_length for item in bucket]
+        self.names = [name for name, _ in ordered]
+        self.folders = [folder for _, folder in ordered]
+        # One name per line of the blobs
+        self.lowered = [name.lower().replace("\n", " ") for name in self.names]
+        self.blob = _lines(self.lowered)
+
+        initials: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.lowered):
+            initials.setdefault(name[:1], []).append(i)
+        self._initials = {char: (_lines(self.lowered[i] for i in ids), ids)
+                          for char, ids in initials.items()}
+
+        self._vectors = {char: self._vector(char) for char in KEY_CHARS}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _vector(self, char: str) -> int:
+        """Bit i set when name i contains ``char``."""
+        lowered = self.lowered
+        flags = b"".join(bytes(map(str.__contains__, lowered[start:start + BUILD_CHUNK], repeat(char)))
+                         for start in range(0, len(lowered), BUILD_CHUNK))
+        # int() reads the most significant digit first
+        return int(flags[::-1].translate(_DIGITS) or b"0", 2)
+
+    def _candidates(self, chars: FrozenSet[str]) -> Optional[Corpus]:
+        """The names containing all of ``chars`` (letters and digits).
+
+        None when that is more than SPARSE_FRACTION of the names, or there
+        are no ``chars``; scanning every name is then no slower.
+        """
+        bits = None
+        for char in chars:
+            bits = self._vectors[char] if bits is None else bits & self._vectors[char]
+        if bits is None:
+            return None
+        if sum(bits.to_bytes((len(self.names) + 7) // 8, "little").translate(_POPCOUNT)) \
+                > len(self.names) * SPARSE_FRACTION:
+            return None
+        # Lowest bit first
+        return self._subset([match.start() for match in _ONE.finditer(format(bits, "b")[::-1])], chars)
+
+    def _subset(self, ids: List[int], chars: FrozenSet[str]) -> Corpus:
+        return Corpus(chars, ids, _lines(map(self.lowered.__getitem__, ids)))
+
+    def search(self, query: str, limit: int = 50, previous: Optional[GotoResult] = None) -> GotoResult:
+        """The ``limit`` best names matching ``query``.
+
+        Args:
+            query: Typed text (any case)
+            limit: Most matches returned
+            previous: Result of the last search. When ``query`` extends its
+                term, only the names it found are searched (as far as it
+                collected all of them); otherwise its corpus is reused if
+                ``query`` has all of that corpus's characters.
+
+        Returns:
+            GotoResult, best match first
+        """
+        term = query.strip().lower()
+        if not term:
+            return GotoResult(self, term, [], None, None, None)
+        chars = frozenset(c for c in term if c in self._vectors)
+        if previous is not None and previous.index is not self:
+            previous = None
+        extends = previous is not None and term.startswith(previous.term)
+        # ``corpus`` holds every name with all of ``chars`` (and is kept for
+        # the next search); ``searched`` may be narrower
+        if previous is not None and previous.corpus is not None and previous.corpus.chars <= chars:
+            corpus = previous.corpus
+        else:
+            corpus = self._candidates(chars)
+        searched = corpus
+        if extends and previous.everything is not None:
+            searched = self._subset(previous.everything, chars)
+        containing = self._subset(previous.containing, chars) \
+            if extends and previous.containing is not None else None
+
+        picked: List[Tuple[int, int]] = []   # (tier, id), best first
+        seen = set()
+
+        # Names starting with the term, shortest first
+        narrowest = containing if containing is not None else searched
+        if narrowest is not None:
+            blob, ids = narrowest.blob, narrowest.ids
+        else:
+            blob, ids = self._initials.get(term[0], ("\n", []))
+        for line, _, _ in _numbered(blob, _find_lines(blob, "\n" + term)):
+            if len(picked) >= limit:
+                return self._result(term, picked, None, None, corpus)
+            eid = ids[line]
+            seen.add(eid)
+            picked.append((TIER_PREFIX, eid))
+
+        if narrowest is None:
+            blob, ids = self.blob, range(len(self.names))
+        elif containing is None:
+            blob, ids = narrowest.blob, narrowest.ids
+        pool = limit * POOL_FACTOR
+        # Names containing the term, at a word start first
+        found = []
+        complete = True
+        for line, pos, _ in _numbered(blob, _find_lines(blob, term)):
+            eid = ids[line]
+            if eid in seen:
+                continue
+            if len(found) >= pool:
+                complete = False
+                break
+            found.append((TIER_SUBSTRING if blob[pos - 1].isalnum() else TIER_WORD, eid))
+        found.sort()
+        seen.update(eid for _, eid in found)
+        picked.extend(found)
+        found_containing = sorted(seen) if complete else None
+
+        # Names containing the letters and digits in order, most compact first
+        if searched is not None:
+            blob, ids = searched.blob, searched.ids
+        else:
+            blob, ids = self.blob, range(len(self.names))
+        letters = "".join(c for c in term if c.isalnum())
+        if len(picked) >= limit:
+            complete = False
+        elif len(letters) > 1 or (letters and letters != term):
+            found = []
+            for line, pos, length in _numbered(blob, _search_lines(blob, _fuzzy_pattern(letters))):
+                eid = ids[line]
+                if eid in seen:
+                    continue
+                if len(found) >= pool:
+                    complete = False
+                    break
+                found.append((blob[pos - 1].isalnum(), length, eid))
+            found.sort()
+            seen.update(eid for _, _, eid in found)
+            picked.extend((TIER_FUZZY, eid) for _, _, eid in found)
+
+        # Without letters or digits there was no in-order tier, so the next
+        # term's in-order matches need not be among these
+        return self._result(term, picked[:limit], found_containing,
+                            sorted(seen) if complete and letters else None, corpus)
+
+    def _result(self, term: str, picked: List[Tuple[int, int]], containing: Optional[List[int]],
+                everything: Optional[List[int]], corpus: Optional[Corpus]) -> GotoResult:
+        names, folders = self.names, self.folders
+        matches = [GotoMatch(names[eid], folders[eid], tier) for tier, eid in picked]
+        return GotoResult(self, term, matches, containing, everything, corpus)
+
+
+class GotoIndex:
+    """Process-wide FuzzyIndex over the NameIndex's files, kept current."""
+
+    # A changed NameIndex is picked up at most this often, and never sooner
+    # than REBUILD_COST_FACTOR times the last build took
+    MIN_REBUILD_INTERVAL_S = 30.0
+    REBUILD_COST_FACTOR = 10
+
+    _index: Optional[FuzzyIndex] = None
+    _version = -1
+    _building = False
+    _built_at = 0.0
+    _build_seconds = 0.0
+    _lock = threading.Lock()
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Single builder thread."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="goto-index")
+            return cls._executor
+
+    @classmethod
+    def current(cls) -> Optional[FuzzyIndex]:
+        """The newest snapshot, or None before the first build finished."""
+        with cls._lock:
+            return cls._index
+
+    @classmethod
+    def stale(cls) -> bool:
+        """Whether the NameIndex changed since the current snapshot."""
+        with cls._lock:
+            return cls._version != NameIndex.version
+
+    @classmethod
+    def warm(cls, force: bool = False) -> None:
+        """Rebuild in the background if the NameIndex changed.
+
+        Unless ``force``d, a rebuild waits out the intervals above.
+        """
+        with cls._lock:
+            if cls._building or cls._version == NameIndex.version:
+                return
+            wait = max(cls.MIN_REBUILD_INTERVAL_S, cls._build_seconds * cls.REBUILD_COST_FACTOR)
+            if not force and cls._index is not None and time.monotonic() - cls._built_at < wait:
+                return
+            cls._building = True
+        cls.executor().submit(cls._build)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop the snapshot (tests)."""
+        with cls._lock:
+            cls._index = None
+            cls._version = -1
+            cls._built_at = cls._build_seconds = 0.0
+
+    @classmethod
+    def _build(cls) -> None:
+        try:
+            started = time.monotonic()
+            version = NameIndex.version
+            index = FuzzyIndex(NameIndex.files())
+            with cls._lock:
+                cls._index, cls._version = index, version
+                cls._built_at = time.monotonic()
+                cls._build_seconds = cls._built_at - started
+        finally:
+            with cls._lock:
+                cls._building = False
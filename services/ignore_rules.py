@@ -0,0 +1,259 @@
+"""
+Ignore Rules - gitignore-style patterns compiled into a single matcher.
+
+Project folders hold node_modules, virtualenvs, build output and caches
+that swamp listings, recursive walks and search. Patterns come from the
+global "ignore_patterns" list in dashboard_config.json plus the active
+workspace's own list, and follow .gitignore syntax:
+
+- blank lines and lines starting with '#' are skipped
+- '!' re-includes what an earlier pattern excluded (last match wins)
+- a trailing '/' matches folders only
+- a pattern with no other '/' matches the entry name at any depth;
+  otherwise it is matched against the path relative to the panel's
+  folder, as if a .gitignore sat there
+- '*' and '?' never match '/', '**' matches across folders
+
+The rules are compiled once: plain names go into sets and everything
+else into one combined regex per kind, so checking an entry is a set
+lookup and at most a few regex matches. The scanner checks entries
+before stat'ing them, so ignored files are never stat'ed and ignored
+folders are never entered.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Used when the config has no "ignore_patterns" of its own
+DEFAULT_PATTERNS = (
+    "node_modules/",
+    ".venv/",
+    "venv/",
+    "__pycache__/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".tox/",
+)
+
+# Windows paths are case-insensitive, and so are its ignore rules
+CASE_INSENSITIVE = os.name == "nt"
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Regex source for a gitignore glob (without the anchoring '/')."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                after = i + 2
+                if at_start and after < n and pattern[after] == "/":
+                    out.append("(?:.*/)?")        # '**/' - any leading folders
+                    i = after + 1
+                    continue
+                if at_start and after == n:
+                    out.append(".*")              # trailing '/**' - everything inside
+                    i = after
+                    continue
+            out.append("[^/]*")
+            i += 1
+            while i < n and pattern[i] == "*":
+                i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+class IgnorePattern:
+    """One parsed pattern line."""
+
+    __slots__ = ("source", "negate", "dir_only", "anchored", "glob", "regex")
+
+    def __init__(self, source: str, negate: bool, dir_only: bool, anchored: bool, glob: str):
+        self.source = source
+        self.negate = negate
+        self.dir_only = dir_only
+        self.anchored = anchored
+        self.glob = glob
+        self.regex = _glob_to_regex(glob)
+
+    @property
+    def literal(self) -> bool:
+        """True if the pattern is a plain name (no wildcards or escapes)."""
+        return not self.anchored and not (_GLOB_CHARS & set(self.glob)) and "\\" not in self.glob
+
+    @classmethod
+    def parse(cls, line: str) -> Optional["IgnorePattern"]:
+        """Parse a pattern line; None for blanks and comments."""
+        text = line.rstrip("\n\r")
+        # Trailing spaces are dropped unless escaped
+        while text.endswith(" ") and not text.endswith("\\ "):
+            text = text[:-1]
+        if not text or text.startswith("#"):
+            return None
+        negate = text.startswith("!")
+        if negate:
+            text = text[1:]
+        elif text.startswith("\\#") or text.startswith("\\!"):
+            text = text[1:]
+        dir_only = text.endswith("/")
+        text = text.rstrip("/")
+        if not text:
+            return None
+        anchored = "/" in text
+        text = text.lstrip("/")
+        return cls(line, negate, dir_only, anchored, text)
+
+
+def _alternation(patterns: List[IgnorePattern]) -> Optional["re.Pattern"]:
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if CASE_INSENSITIVE else 0
+    return re.compile("|".join(f"(?:{p.regex})" for p in patterns) + r"\Z", flags)
+
+
+class IgnoreRules:
+    """A compiled set of ignore patterns."""
+
+    def __init__(self, lines: Iterable[str]):
+        self.lines: Tuple[str, ...] = tuple(lines)
+        self.patterns = [p for p in map(IgnorePattern.parse, self.lines) if p is not None]
+        self.anchored = any(p.anchored for p in self.patterns)
+        self.has_negations = any(p.negate for p in self.patterns)
+
+        fold = str.casefold if CASE_INSENSITIVE else (lambda s: s)
+        self._fold = fold
+        if self.has_negations:
+            # Order matters: evaluate newest first, first match decides
+            flags = re.IGNORECASE if CASE_INSENSITIVE else 0
+            self._ordered = [(re.compile(p.regex + r"\Z", flags), p) for p in reversed(self.patterns)]
+            return
+        self._ordered = None
+        # (name literals, name regex, path regex) for any entry / folders only
+        groups = {}
+        for dir_only in (False, True):
+            chosen = [p for p in self.patterns if p.dir_only == dir_only]
+            groups[dir_only] = (
+                frozenset(fold(p.glob) for p in chosen if p.literal),
+                _alternation([p for p in chosen if not p.literal and not p.anchored]),
+                _alternation([p for p in chosen if p.anchored]),
+            )
+        self._groups = groups
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def bind(self, root: str) -> Optional["IgnoreMatcher"]:
+        """Matcher for entries under ``root`` (None when there are no rules)."""
+        return IgnoreMatcher(self, root) if self.patterns else None
+
+    def match(self, name: str, rel: Optional[str], is_dir: bool) -> bool:
+        """True if an entry is ignored.
+
+        Args:
+            name: Entry name
+            rel: '/'-separated path relative to the root, or None outside it
+                (then only unanchored patterns apply)
+            is_dir: Whether the entry is a folder
+        """
+        if self._ordered is not None:
+            for regex, p in self._ordered:
+                if p.dir_only and not is_dir:
+                    continue
+                subject = rel if p.anchored else name
+                if subject is not None and regex.match(subject):
+                    return not p.negate
+            return False
+
+        kinds = (False, True) if is_dir else (False,)
+        folded = None
+        for dir_only in kinds:
+            literals, name_re, path_re = self._groups[dir_only]
+            if literals:
+                if folded is None:
+                    folded = self._fold(name)
+                if folded in literals:
+                    return True
+            if name_re is not None and name_re.match(name):
+                return True
+            if path_re is not None and rel is not None and path_re.match(rel):
+                return True
+        return False
+
+
+class IgnoreMatcher:
+    """IgnoreRules bound to the folder that anchored patterns are relative to.
+
+    Hashable, so listings scanned with it can be cached per rule set.
+    """
+
+    __slots__ = ("rules", "root", "key", "_prefix")
+
+    def __init__(self, rules: IgnoreRules, root: str):
+        self.rules = rules
+        self.root = root
+        self._prefix = root.rstrip(os.sep) + os.sep
+        # Roots only matter to anchored patterns
+        self.key = (rules.lines, root if rules.anchored else None)
+
+    def ignored(self, path: str, name: str, is_dir: bool) -> bool:
+        rel = None
+        if self.rules.anchored and path.startswith(self._prefix):
+            rel = path[len(self._prefix):]
+            if os.sep != "/":
+                rel = rel.replace(os.sep, "/")
+        return self.rules.match(name, rel, is_dir)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, IgnoreMatcher) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"IgnoreMatcher({len(self.rules.patterns)} patterns, root={self.root!r})"
+
+
+@lru_cache(maxsize=8)
+def compile_rules(lines: Tuple[str, ...]) -> IgnoreRules:
+    """Compiled rules for pattern lines, reused while they are unchanged."""
+    return IgnoreRules(lines)
+
+
+def config_patterns(config_data: Dict[str, Any]) -> Tuple[str, ...]:
+    """Global patterns followed by the active workspace's patterns."""
+    lines = list(config_data.get("ignore_patterns", DEFAULT_PATTERNS))
+    active = config_data.get("active_workspace")
+    workspace = config_data.get("workspaces", {}).get(active) if active else None
+    if workspace:
+        lines.extend(workspace.get("ignore_patterns", []))
+    return tuple(lines)
+
+
+def rules_from_config(config_data: Dict[str, Any]) -> IgnoreRules:
+    return compile_rules(config_patterns(config_data))
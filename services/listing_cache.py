@@ -0,0 +1,246 @@
+"""
+Listing Cache - Process-wide LRU cache of directory listings.
+
+Panels showing the same folder, bouncing between a few folders, or
+re-filtering/searching the current one all read from here instead of
+rescanning. A cached listing is only served while the directory's own
+stat (st_mtime_ns, st_ino, st_dev) is unchanged, which costs one stat
+call. Directory mtimes change when entries are added, removed or renamed
+but not when a file is rewritten in place, so callers that know the
+folder changed (watcher events, F5) call invalidate() first.
+
+Concurrent misses for the same listing share one scan: when several
+panels show a folder and it changes, they all refresh at once, and only
+the first actually reads the directory.
+
+Listings scanned with ignore rules are stored per rule set (the
+IgnoreMatcher is part of the cache key), so a panel revealing ignored
+entries does not see another panel's filtered listing.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from services.directory_scanner import DirectoryScanner, FileEntry, Listing
+from services.slow_fs import SlowPaths
+
+
+# Rough per-entry cost of a FileEntry plus its strings' object headers
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def folder_key(path: str) -> str:
+    """Normalised form of a folder path: equal for two spellings of one folder."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def dir_key(path: str) -> Tuple[int, int, int]:
+    """Cheap validator for a directory's listing.
+
+    Raises:
+        OSError: If the directory cannot be stat'ed
+    """
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_ino, st.st_dev)
+
+
+class _Flight:
+    """A scan in progress that other callers can wait for."""
+
+    __slots__ = ("key", "done", "entries", "error")
+
+    def __init__(self, key: Tuple[int, int, int]):
+        self.key = key
+        self.done = threading.Event()
+        self.entries = None
+        self.error = None
+
+
+def estimate_bytes(entries: List[FileEntry]) -> int:
+    """Approximate memory held by a listing."""
+    return sum(ENTRY_OVERHEAD_BYTES + len(e.path) + len(e.name) for e in entries)
+
+
+class ListingCache:
+    """Shared cache of path -> listing, bounded by count and memory."""
+
+    MAX_LISTINGS = 64
+    MAX_BYTES = 64 * 1024 * 1024
+
+    # (path, IgnoreMatcher or None) -> (dir_key, listing, bytes)
+    _listings: "OrderedDict[Tuple[str, object], Tuple[Tuple[int, int, int], Listing, int]]" = OrderedDict()
+    _total_bytes = 0
+    _lock = threading.Lock()
+    _flights: "Dict[Tuple[str, object], _Flight]" = {}
+
+    hits = 0
+    misses = 0
+    evictions = 0
+    shared = 0
+
+    @classmethod
+    def configure(cls, max_listings: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Change the cache bounds, evicting immediately if needed."""
+        with cls._lock:
+            if max_listings is not None:
+                cls.MAX_LISTINGS = max(1, int(max_listings))
+            if max_bytes is not None:
+                cls.MAX_BYTES = max(0, int(max_bytes))
+            cls._evict()
+
+    @classmethod
+    def scan(cls, path: str, ignore=None, stat_files: bool = True,
+             max_entries: Optional[int] = None) -> Optional[Listing]:
+        """Return the listing of ``path``, from cache when still valid.
+
+        The directory is stat'ed before scanning, so a change that lands
+        mid-scan makes the stored listing stale on the next lookup rather
+        than being cached as current.
+
+        Args:
+            path: Directory to list
+            ignore: Optional IgnoreMatcher applied while scanning
+            stat_files: False lists files by name only (slow filesystems);
+                full scans feed SlowPaths' latency measurements
+            max_entries: Optional cap; larger directories return None
+                (and are not cached) as soon as the cap is passed
+
+        Raises:
+            OSError: If the directory cannot be read
+        """
+        started = time.perf_counter()
+        key = dir_key(path)
+        slot = (path, ignore)
+        with cls._lock:
+            cached = cls._listings.get(slot)
+            if cached is not None and cached[0] == key:
+                cls._listings.move_to_end(slot)
+                cls.hits += 1
+                return cached[1]
+            flight = cls._flights.get(slot)
+            owner = flight is None or flight.key != key
+            if owner:
+                # A scan of an older state of the folder can't be shared
+                flight = cls._flights[slot] = _Flight(key)
+                cls.misses += 1
+            else:
+                cls.shared += 1
+
+        if not owner:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.entries is None:
+                # The owner gave up at its cap, which may not be ours
+                return cls.scan(path, ignore, stat_files, max_entries)
+            if max_entries is not None and len(flight.entries) > max_entries:
+                return None
+            return flight.entries
+
+        try:
+            entries = flight.entries = DirectoryScanner.scan(path, ignore=ignore, stat_files=stat_files,
+                                                             max_entries=max_entries)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with cls._lock:
+                if cls._flights.get(slot) is flight:
+                    del cls._flights[slot]
+            flight.done.set()
+        if entries is None:
+            return None
+        if stat_files:
+            # One directory stat plus a call (or so) per entry
+            SlowPaths.record(path, time.perf_counter() - started, len(entries) + 1)
+        cls.put(path, key, entries, ignore=ignore)
+        return entries
+
+    @classmethod
+    def get(cls, path: str, ignore=None) -> Optional[Listing]:
+        """Return a still-valid cached listing without scanning, or None.
+
+        Does not count towards hits/misses.
+        """
+        try:
+            key = dir_key(path)
+        except OSError:
+            return None
+        slot = (path, ignore)
+        with cls._lock:
+            cached = cls._listings.get(slot)
+            if cached is not None and cached[0] == key:
+                cls._listings.move_to_end(slot)
+                return cached[1]
+        return None
+
+    @classmethod
+    def put(cls, path: str, key: Tuple[int, int, int], entries: List[FileEntry],
+            only_if_room: bool = False, ignore=None) -> bool:
+        """Store a listing scanned while the directory had stat ``key``.
+
+        Args:
+            path: Directory path
+            key: dir_key(path) taken before the scan
+            entries: The listing
+            only_if_room: Don't evict anything to make room (used for
+                speculative listings such as prefetches)
+            ignore: The IgnoreMatcher the listing was scanned with
+
+        Returns:
+            True if the listing was stored
+        """
+        size = estimate_bytes(entries)
+        slot = (path, ignore)
+        with cls._lock:
+            if only_if_room and (len(cls._listings) >= cls.MAX_LISTINGS
+                                 or cls._total_bytes + size > cls.MAX_BYTES):
+                return False
+            old = cls._listings.pop(slot, None)
+            if old is not None:
+                cls._total_bytes -= old[2]
+            if size > cls.MAX_BYTES:
+                return False
+            cls._listings[slot] = (key, entries, size)
+            cls._total_bytes += size
+            cls._evict()
+            return True
+
+    @classmethod
+    def invalidate(cls, path: Optional[str] = None) -> None:
+        """Forget one folder's listings (any spelling, any rules), or all of them."""
+        with cls._lock:
+            if path is None:
+                cls._listings.clear()
+                cls._total_bytes = 0
+                return
+            # Listings are stored under the path as each panel spelled it
+            key = folder_key(path)
+            for slot in [s for s in cls._listings if folder_key(s[0]) == key]:
+                cls._total_bytes -= cls._listings.pop(slot)[2]
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Counters for tuning the cache bounds."""
+        with cls._lock:
+            return {
+                "hits": cls.hits,
+                "misses": cls.misses,
+                "evictions": cls.evictions,
+                "shared": cls.shared,
+                "listings": len(cls._listings),
+                "entries": sum(len(v[1]) for v in cls._listings.values()),
+                "bytes": cls._total_bytes,
+            }
+
+    @classmethod
+    def _evict(cls) -> None:
+        """Drop least recently used listings until within bounds (lock held)."""
+        while cls._listings and (len(cls._listings) > cls.MAX_LISTINGS
+                                 or cls._total_bytes > cls.MAX_BYTES):
+            _, (_, _, size) = cls._listings.popitem(last=False)
+            cls._total_bytes -= size
+            cls.evictions += 1
@@ -0,0 +1,233 @@
+"""
+Listing Columns - Compact columnar model of a panel's listing.
+
+Holding a record object per row (plus the per-file tuples the analytics
+bar used to get) costs a few hundred bytes per entry, which adds up at
+10^5-10^6 entries. ListingColumns keeps one ``array`` per field instead:
+sizes and mtimes as 64-bit integers, flags and colour IDs as bytes, and
+extensions as IDs into a shared table of interned strings. Names and
+paths are kept as references to the strings the scanner already made.
+
+It is a read-only Mapping of path -> RowRecord in display order, so it
+can be handed straight to TreeSync and VirtualList; records are built on
+access and not stored.
+"""
+
+import os
+import sys
+import threading
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from services.directory_scanner import FileEntry, format_date, format_size
+
+
+FLAG_DIR = 1
+FLAG_NOTE = 2
+
+
+class RowRecord(NamedTuple):
+    """Comparable description of one row.
+
+    Two records compare equal exactly when their rows draw the same, so a
+    record doubles as the row's TreeSync signature.
+    """
+
+    path: str
+    name: str
+    is_dir: bool
+    size: int
+    mtime_ns: int
+    color: Optional[str]
+    has_note: bool
+
+    @classmethod
+    def from_entry(cls, entry: FileEntry, color: Optional[str] = None,
+                   has_note: bool = False) -> "RowRecord":
+        if entry.is_dir:
+            return cls(entry.path, entry.name, True, 0, -1, None, False)
+        return cls(entry.path, entry.name, False, entry.size, entry.mtime_ns, color, has_note)
+
+    @property
+    def size_str(self) -> str:
+        if self.is_dir:
+            return ""
+        return format_size(self.size, self.mtime_ns)
+
+    @property
+    def mod_str(self) -> str:
+        if self.is_dir:
+            return ""
+        return format_date(self.mtime_ns)
+
+
+class StringTable:
+    """Append-only table of interned strings addressed by small IDs."""
+
+    def __init__(self):
+        self.strings: List[Optional[str]] = [None]   # ID 0 = no value
+        self.ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def id_for(self, value: Optional[str]) -> int:
+        if not value:
+            return 0
+        found = self.ids.get(value)
+        if found is None:
+            with self._lock:
+                found = self.ids.get(value)
+                if found is None:
+                    found = len(self.strings)
+                    self.strings.append(sys.intern(value))
+                    self.ids[value] = found
+        return found
+
+
+# Shared by every listing: a session sees a few hundred extensions at most
+EXTENSIONS = StringTable()
+COLORS = StringTable()
+
+
+class ListingColumns(Mapping):
+    """Column arrays for one listing, in display order."""
+
+    __slots__ = ("paths", "names", "sizes", "mtimes", "flags", "colors", "exts", "_index")
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self.names: List[str] = []
+        self.sizes = array("q")
+        self.mtimes = array("q")
+        self.flags = array("B")
+        self.colors = array("B")
+        self.exts = array("I")
+        self._index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[FileEntry],
+                     tag_for: Optional[Callable[[str], Tuple[Optional[str], bool]]] = None
+                     ) -> "ListingColumns":
+        """Build columns from scanned entries.
+
+        Args:
+            entries: The listing, in display order
+            tag_for: Returns (colour name or None, has note) for a file path
+        """
+        cols = cls()
+        cols.extend(entries, tag_for)
+        return cols
+
+    def extend(self, entries: Iterable[FileEntry],
+               tag_for: Optional[Callable[[str], Tuple[Optional[str], bool]]] = None) -> None:
+        """Append entries after the existing rows (see from_entries)."""
+        paths, names = self.paths, self.names
+        sizes, mtimes, flags, colors, exts = self.sizes, self.mtimes, self.flags, self.colors, self.exts
+        ext_id, color_id = EXTENSIONS.id_for, COLORS.id_for
+        first = len(paths)
+        for entry in entries:
+            paths.append(entry.path)
+            names.append(entry.name)
+            if entry.is_dir:
+                sizes.append(0)
+                mtimes.append(-1)
+                flags.append(FLAG_DIR)
+                colors.append(0)
+                exts.append(0)
+                continue
+            color, note = tag_for(entry.path) if tag_for else (None, False)
+            sizes.append(entry.size)
+            mtimes.append(entry.mtime_ns)
+            flags.append(FLAG_NOTE if note else 0)
+            colors.append(color_id(color))
+            exts.append(ext_id(os.path.splitext(entry.name)[1].lower()))
+        if self._index is not None:
+            index = self._index
+            for i in range(first, len(paths)):
+                index[paths[i]] = i
+
+    def take(self, order: Iterable[int]) -> "ListingColumns":
+        """A new listing with rows picked (and reordered) by index."""
+        order = list(order)
+        cols = ListingColumns()
+        for field in ("paths", "names", "sizes", "mtimes", "flags", "colors", "exts"):
+            src = getattr(self, field)
+            dst = getattr(cols, field)
+            dst.extend([src[i] for i in order])
+        return cols
+
+    def copy(self) -> "ListingColumns":
+        """A new listing with the same rows, to extend or update.
+
+        TreeSync keeps the listing it last applied as its record of what
+        the tree shows, so a listing that has been applied must not be
+        changed in place.
+        """
+        cols = ListingColumns()
+        for field in ("paths", "names", "sizes", "mtimes", "flags", "colors", "exts"):
+            getattr(cols, field).extend(getattr(self, field))
+        if self._index is not None:
+            cols._index = dict(self._index)
+        return cols
+
+    # ========== Mapping of path -> RowRecord ==========
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __contains__(self, path) -> bool:
+        return path in self.index
+
+    def __getitem__(self, path: str) -> RowRecord:
+        return self.record(self.index[path])
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """path -> row number, built on first keyed access."""
+        if self._index is None:
+            self._index = {path: i for i, path in enumerate(self.paths)}
+        return self._index
+
+    def record(self, i: int) -> RowRecord:
+        flags = self.flags[i]
+        return RowRecord(self.paths[i], self.names[i], bool(flags & FLAG_DIR),
+                         self.sizes[i], self.mtimes[i], COLORS.strings[self.colors[i]],
+                         bool(flags & FLAG_NOTE))
+
+    def is_dir(self, i: int) -> bool:
+        return bool(self.flags[i] & FLAG_DIR)
+
+    def set_stat(self, path: str, size: int, mtime_ns: int) -> bool:
+        """Fill in a file's size and date after the fact; False if not listed."""
+        i = self.index.get(path)
+        if i is None:
+            return False
+        self.sizes[i] = size
+        self.mtimes[i] = mtime_ns
+        return True
+
+    # ========== Aggregates ==========
+
+    def file_stats(self, indices: Optional[Iterable[int]] = None) -> Tuple[int, int, Dict[str, int]]:
+        """(file count, total bytes, extension -> count) over files.
+
+        Args:
+            indices: Rows to count (default: every row); folders are skipped
+        """
+        flags, sizes, exts = self.flags, self.sizes, self.exts
+        if indices is None:
+            indices = range(len(flags))
+        count = total = 0
+        by_ext: Dict[int, int] = {}
+        for i in indices:
+            if flags[i] & FLAG_DIR:
+                continue
+            count += 1
+            total += sizes[i]
+            ext = exts[i]
+            by_ext[ext] = by_ext.get(ext, 0) + 1
+        strings = EXTENSIONS.strings
+        return count, total, {(strings[ext] or ""): n for ext, n in by_ext.items()}
@@ -0,0 +1,67 @@
+"""
+Listing Diff - Computes the minimal row changes between two listings.
+
+A listing is an insertion-ordered dict of ``key -> signature`` in display
+order. Keys identify rows (the full path), signatures capture everything
+that affects how a row is drawn (size, mtime, tag colour, note). The diff
+says which rows to remove, insert (and where) and redraw, so the file list
+can be updated with O(changes) Treeview calls instead of rebuilding it.
+"""
+
+from typing import Dict, Hashable, List, NamedTuple, Tuple
+
+
+class ListingDiff(NamedTuple):
+    """Row mutations that turn the old listing into the new one."""
+    removed: List[Hashable]
+    added: List[Tuple[int, Hashable]]
+    changed: List[Hashable]
+    reordered: bool
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.removed or self.added or self.changed or self.reordered)
+
+    @property
+    def touched(self) -> int:
+        """Number of rows the diff mutates."""
+        return len(self.removed) + len(self.added) + len(self.changed)
+
+
+def diff_listing(old: Dict[Hashable, Hashable], new: Dict[Hashable, Hashable]) -> ListingDiff:
+    """Diff two ordered listings.
+
+    ``added`` holds ``(index, key)`` pairs in ascending index order: once the
+    removed rows are gone, inserting each key at its index in that order
+    reproduces ``new`` as long as ``reordered`` is False. ``reordered`` is
+    True when rows present in both listings changed relative order (for
+    example after a sort-key change); the caller must then reposition them.
+
+    Args:
+        old: Currently displayed ``key -> signature`` in display order
+        new: Wanted ``key -> signature`` in display order
+
+    Returns:
+        ListingDiff
+    """
+    removed = [key for key in old if key not in new]
+    added = []
+    changed = []
+    for index, (key, sig) in enumerate(new.items()):
+        old_sig = old.get(key, _MISSING)
+        if old_sig is _MISSING:
+            added.append((index, key))
+        elif old_sig != sig:
+            changed.append(key)
+
+    if len(old) - len(removed) > 1:
+        kept_old = (key for key in old if key in new)
+        kept_new = (key for key in new if key in old)
+        reordered = any(a != b for a, b in zip(kept_old, kept_new))
+    else:
+        reordered = False
+
+    return ListingDiff(removed, added, changed, reordered)
+
+
+_MISSING = object()
@@ -0,0 +1,114 @@
+"""
+Listing Filter - Applies a panel's type filter and search to scanned entries.
+
+Pure functions over FileEntry lists so the same filtering can run on a
+worker thread, against cached listings, or in tests. Content matches are
+answered by the ContentIndex where it has the file's current contents;
+other files are searched whole (services/text_search.py) and queued for
+indexing. Word and Excel documents are searched in their extracted text.
+"""
+
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from services.content_index import ContentIndex
+from services.directory_scanner import FileEntry
+from services.ignore_rules import IgnoreMatcher
+from services.office_text import OFFICE_EXTS
+from services.text_search import search_file
+
+
+# Extensions whose contents are searched when "Content" is checked
+TEXT_EXTS = frozenset(['.txt', '.md', '.py', '.js', '.html', '.css', '.json',
+                       '.log', '.xml', '.ini', '.cfg'])
+
+# Everything content search looks inside
+CONTENT_EXTS = TEXT_EXTS | OFFICE_EXTS
+
+
+class ListingQuery(NamedTuple):
+    """What a panel wants to see from a directory listing.
+
+    ``ignore`` is applied by the scanner rather than by filter_entries,
+    so ignored entries are never read in the first place.
+    """
+    exts: Tuple[str, ...] = ()
+    search_term: str = ""
+    content_search: bool = False
+    ignore: Optional[IgnoreMatcher] = None
+
+
+def file_contains(path: str, term: str) -> bool:
+    """Check whether a text file contains ``term``, ignoring case."""
+    try:
+        return bool(search_file(path, term))
+    except Exception:
+        return False
+
+
+def filter_entries(
+    entries: List[FileEntry],
+    query: ListingQuery,
+    is_cancelled: Optional[Callable[[], bool]] = None
+) -> Optional[List[FileEntry]]:
+    """Return the entries matching ``query``, preserving order.
+
+    Folders are only filtered by name; the extension filter applies to
+    files. Content matching reads files, so it checks ``is_cancelled``
+    between reads and returns None as soon as the caller gives up.
+
+    Args:
+        entries: Scanned entries
+        query: Type filter and search settings
+        is_cancelled: Optional callable polled during content search
+
+    Returns:
+        Matching entries, or None if cancelled
+    """
+    term = query.search_term.lower()
+    exts = query.exts
+    result = []
+
+    indexed = {}
+    if term and query.content_search:
+        indexed = ContentIndex.lookup(content_candidates(entries, query), term)
+
+    for entry in entries:
+        if entry.is_dir:
+            if term and term not in entry.name.lower():
+                continue
+            result.append(entry)
+            continue
+
+        ext = entry.ext
+        if exts and ext not in exts:
+            continue
+
+        if term and term not in entry.name.lower():
+            if not (query.content_search and ext in CONTENT_EXTS):
+                continue
+            if is_cancelled and is_cancelled():
+                return None
+            found = indexed.get(entry.path)
+            if found is None:
+                found = file_contains(entry.path, term)
+            if not found:
+                continue
+
+        result.append(entry)
+
+    return result
+
+
+def content_candidates(entries: List[FileEntry], query: ListingQuery) -> List[FileEntry]:
+    """Files a content search still has to look inside.
+
+    Text and Office files that pass the type filter but whose names do not match;
+    filter_entries() with ``content_search`` off gives the name matches.
+    """
+    term = query.search_term.lower()
+    if not (term and query.content_search):
+        return []
+    exts = query.exts
+    return [e for e in entries
+            if not e.is_dir and e.ext in CONTENT_EXTS and (not exts or e.ext in exts)
+            and term not in e.name.lower()]
@@ -0,0 +1,187 @@
+"""
+Listing Worker - Runs directory scans off the Tk thread.
+
+Each panel owns a ListingWorker. Every request bumps the worker's
+generation; results carry the generation they were requested with, and
+anything older than the latest request is dropped. Results are handed
+back through a queue that the panel polls with ``after`` so widgets are
+only ever touched from the Tk thread. Listings come from the shared
+ListingCache, so re-filtering or searching an unchanged folder does not
+rescan it. Folders on slow filesystems (services/slow_fs.py) are listed
+by name only; the panel fills in sizes and dates afterwards. Folders with
+more than ``max_entries`` entries are not listed at all: the result says
+``too_large`` and the panel switches to a paged listing
+(services/paged_listing.py). Whether a folder is that big is found by
+counting its names, and remembered, so it costs nothing like a scan and
+going back to the folder goes straight to its pages. Content searches
+are answered with the name matches and the files still to look inside,
+which the panel hands to a ContentSearch (services/content_search.py) so
+matches stream in, plus the content index's stats for the status line
+(they take a SQLite query, which does not belong on the Tk thread).
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from services.content_index import ContentIndex
+from services.directory_scanner import DirectoryScanner, FileEntry
+from services.listing_cache import ListingCache, folder_key
+from services.listing_filter import ListingQuery, content_candidates, filter_entries
+from services.slow_fs import SlowPaths
+
+
+class ListingResult:
+    """Outcome of one listing request.
+
+    ``entries`` are the rows matching the query; ``listing`` is the full
+    unfiltered directory listing they were picked from, and ``ignored``
+    the number of entries the ignore rules kept out of it. ``too_large``
+    means the folder was over the worker's ``max_entries`` and was not
+    listed. For a content search, ``entries`` are the name matches,
+    ``content_candidates`` the text files still to be searched and
+    ``index_stats`` the ContentIndex.stats() (None if the index is off).
+    """
+
+    __slots__ = ("generation", "path", "query", "entries", "listing", "error", "ignored", "too_large",
+                 "content_candidates", "index_stats")
+
+    def __init__(self, generation: int, path: str, query: ListingQuery,
+                 entries: Optional[List[FileEntry]] = None,
+                 listing: Optional[List[FileEntry]] = None,
+                 error: Optional[OSError] = None,
+                 ignored: int = 0,
+                 too_large: bool = False,
+                 content_candidates: Optional[List[FileEntry]] = None,
+                 index_stats: Optional[Dict[str, float]] = None):
+        self.generation = generation
+        self.path = path
+        self.query = query
+        self.entries = entries if entries is not None else []
+        self.listing = listing if listing is not None else self.entries
+        self.error = error
+        self.ignored = ignored
+        self.too_large = too_large
+        self.content_candidates = content_candidates or []
+        self.index_stats = index_stats
+
+
+class ListingWorker:
+    """Per-panel front end to a shared listing thread pool."""
+
+    MAX_WORKERS = 4
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    # folder_key -> entries a folder was seen to have at least (folders
+    # found too large to list); shared by every panel
+    _large: Dict[str, int] = {}
+    _large_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Shared pool for all panels, created on first use."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.MAX_WORKERS, thread_name_prefix="listing")
+            return cls._executor
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.generation = 0
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def submit(self, path: str, query: ListingQuery) -> int:
+        """Queue a listing of ``path``; older requests become stale.
+
+        Returns:
+            The generation ID of this request
+        """
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+        self.executor().submit(self._run, generation, path, query)
+        return generation
+
+    def cancel(self) -> None:
+        """Invalidate every in-flight request."""
+        with self._lock:
+            self.generation += 1
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    @classmethod
+    def remember_size(cls, path: str, entries: int) -> None:
+        """Record that ``path`` holds at least ``entries`` entries."""
+        with cls._large_lock:
+            cls._large[folder_key(path)] = entries
+
+    @classmethod
+    def forget_size(cls, path: str) -> None:
+        """The folder was seen to have shrunk: count it again next time."""
+        with cls._large_lock:
+            cls._large.pop(folder_key(path), None)
+
+    def _too_large(self, path: str, ignore) -> bool:
+        """Whether ``path`` is over ``max_entries``, without scanning it."""
+        if self.max_entries is None or ListingCache.get(path, ignore) is not None:
+            return False
+        with self._large_lock:
+            known = self._large.get(folder_key(path))
+        if known is not None and known > self.max_entries:
+            return True
+        count = DirectoryScanner.count(path, self.max_entries)
+        if count > self.max_entries:
+            self.remember_size(path, count)
+            return True
+        return False
+
+    def poll(self) -> Optional[ListingResult]:
+        """Return the newest current result, discarding stale ones.
+
+        Must be called from the Tk thread.
+        """
+        latest = None
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if self.is_current(result.generation):
+                latest = result
+        return latest
+
+    def _run(self, generation: int, path: str, query: ListingQuery) -> None:
+        if not self.is_current(generation):
+            return
+        try:
+            listing = None
+            if not self._too_large(path, query.ignore):
+                listing = ListingCache.scan(path, query.ignore, stat_files=not SlowPaths.is_slow(path),
+                                            max_entries=self.max_entries)
+        except OSError as e:
+            self.results.put(ListingResult(generation, path, query, error=e))
+            return
+        if listing is None:
+            if self.max_entries is not None:
+                # Grew past the cap since it was counted
+                self.remember_size(path, self.max_entries + 1)
+            self.results.put(ListingResult(generation, path, query, too_large=True))
+            return
+
+        # Name matches only; the panel streams content matches in afterwards
+        entries = filter_entries(listing, query._replace(content_search=False))
+        index_stats = None
+        if query.content_search and query.search_term and ContentIndex.available():
+            index_stats = ContentIndex.stats()
+        if not self.is_current(generation):
+            return
+        self.results.put(ListingResult(generation, path, query, entries, listing,
+                                       ignored=listing.ignored,
+                                       content_candidates=content_candidates(listing, query),
+                                       index_stats=index_stats))
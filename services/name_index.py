@@ -0,0 +1,654 @@
+"""
+Name Index - Persistent trigram index of the file names under the workspace roots.
+
+Panel search only ever looked at the folder on screen, so finding a file
+somewhere under a multi-million-file project root meant walking it. The
+NameIndex keeps every entry name under the configured roots (the folders
+of every panel and saved workspace, plus "index_roots") in memory with a
+posting list per lower-cased trigram. A substring query reads the
+shortest posting list of its trigrams and checks those names only, which
+answers in milliseconds; terms shorter than three characters fall back to
+checking every name.
+
+Each root is built on one background thread and saved under
+``<app data>/name_index`` (marshal of the name table and the posting
+arrays), so later runs start from the saved index. It is then kept
+current two ways:
+
+- On load, and on refresh_all (F5 across panels), every indexed folder is
+  stat'ed and the ones whose mtime changed are re-read.
+- While running, a recursive watch per root marks the folders that
+  changed; they are re-read in batches.
+
+Entries are only ever appended; removed names are blanked and the tables
+are compacted once more than half of them are blank. The ignore rules in
+effect are part of a saved index, so changing them rebuilds it. The Go to
+file palette's fuzzy index (services/goto_index.py) is built from files().
+"""
+
+import hashlib
+import marshal
+import os
+import queue
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config.manager import get_app_data_dir
+from services.directory_scanner import IGNORED, MTIME_PENDING, DirectoryScanner, FileEntry
+from services.directory_session import DirectorySessions
+from services.listing_worker import ListingWorker
+from services.tree_loader import is_within
+
+
+FORMAT_VERSION = 1
+
+# Scopes of the panel's search box
+SCOPE_FOLDER = "This folder"
+SCOPE_TREE = "This tree"
+SCOPE_WORKSPACES = "All workspaces"
+SEARCH_SCOPES = (SCOPE_FOLDER, SCOPE_TREE, SCOPE_WORKSPACES)
+
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct three-character substrings of ``text`` (already lower-cased)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def index_name(root: str) -> str:
+    """File name of the saved index for ``root``."""
+    return hashlib.sha1(os.path.normcase(root).encode("utf-8", "surrogatepass")).hexdigest() + ".idx"
+
+
+def workspace_roots(config: dict) -> List[str]:
+    """Folders to index: panel folders, saved workspaces' folders and "index_roots".
+
+    Folders inside another indexed folder are covered by it and dropped.
+    """
+    paths = [config.get(str(i), "") for i in range(1, int(config.get("num_panels", 6)) + 1)]
+    for ws in config.get("workspaces", {}).values():
+        paths.extend(ws.get("paths", {}).values())
+    paths.extend(config.get("index_roots", []))
+
+    roots = []
+    for path in sorted({os.path.normpath(p) for p in paths if p}, key=len):
+        if not any(is_within(path, root) for root in roots):
+            roots.append(path)
+    return roots
+
+
+class RootIndex:
+    """The names under one root, and their trigram posting lists.
+
+    Entries are identified by their position in ``names``; a removed
+    entry's name is None. Callers hold NameIndex's lock.
+    """
+
+    def __init__(self, root: str, rules_key=None):
+        self.root = root
+        self.rules_key = rules_key
+        self.dir_ids: Dict[str, int] = {}
+        self.dir_paths: List[Optional[str]] = []
+        self.dir_mtimes: List[int] = []
+        self.dir_entries: Dict[int, List[int]] = {}
+        self.names: List[Optional[str]] = []
+        self.entry_dir = array("I")
+        self.entry_is_dir = bytearray()
+        self.postings: Dict[str, array] = {}
+        self.removed = 0
+        self.ready = False
+        self.changed = False
+        self.watch = None
+
+    def __len__(self) -> int:
+        return len(self.names) - self.removed
+
+    # ========== Updates ==========
+
+    def _add_dir(self, path: str) -> int:
+        did = self.dir_ids.get(path)
+        if did is None:
+            did = self.dir_ids[path] = len(self.dir_paths)
+            self.dir_paths.append(path)
+            self.dir_mtimes.append(-1)
+        return did
+
+    def _add_entry(self, did: int, name: str, is_dir: bool) -> int:
+        eid = len(self.names)
+        self.names.append(name)
+        self.entry_dir.append(did)
+        self.entry_is_dir.append(is_dir)
+        postings = self.postings
+        for gram in trigrams(name.lower()):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = array("I", (eid,))
+            else:
+                ids.append(eid)
+        return eid
+
+    def _remove_entry(self, eid: int) -> None:
+        if self.names[eid] is not None:
+            self.names[eid] = None
+            self.removed += 1
+
+    def apply_dir(self, path: str, mtime_ns: int, found: Dict[str, bool]) -> List[str]:
+        """Record the entries (name -> is_dir) read from folder ``path``.
+
+        Returns:
+            Sub-folders not indexed yet, to be read next
+        """
+        did = self._add_dir(path)
+        self.dir_mtimes[did] = mtime_ns
+        current = {}
+        for eid in self.dir_entries.get(did, ()):
+            name = self.names[eid]
+            if name is None:
+                continue
+            if found.get(name) != bool(self.entry_is_dir[eid]):
+                self._remove_entry(eid)
+                if self.entry_is_dir[eid]:
+                    self.remove_tree(os.path.join(path, name))
+            else:
+                current[name] = eid
+
+        new_dirs = []
+        for name, is_dir in found.items():
+            if name in current:
+                continue
+            current[name] = self._add_entry(did, name, is_dir)
+            if is_dir:
+                new_dirs.append(os.path.join(path, name))
+        self.dir_entries[did] = list(current.values())
+        self.changed = True
+        return new_dirs
+
+    def remove_tree(self, path: str) -> None:
+        """Forget folder ``path`` and everything indexed below it."""
+        for sub in [p for p in self.dir_ids if is_within(p, path)]:
+            did = self.dir_ids.pop(sub)
+            for eid in self.dir_entries.pop(did, ()):
+                self._remove_entry(eid)
+            self.dir_paths[did] = None
+        self.changed = True
+
+    def compact(self) -> None:
+        """Drop removed entries, renumbering the rest."""
+        remap = array("i", [-1]) * len(self.names)
+        names = []
+        entry_dir = array("I")
+        entry_is_dir = bytearray()
+        for eid, name in enumerate(self.names):
+            if name is not None:
+                remap[eid] = len(names)
+                names.append(name)
+                entry_dir.append(self.entry_dir[eid])
+                entry_is_dir.append(self.entry_is_dir[eid])
+        postings = {}
+        for gram, ids in self.postings.items():
+            kept = array("I", [remap[eid] for eid in ids if remap[eid] >= 0])
+            if kept:
+                postings[gram] = kept
+        self.dir_entries = {did: [remap[eid] for eid in ids if remap[eid] >= 0]
+                            for did, ids in self.dir_entries.items()}
+        self.names, self.entry_dir, self.entry_is_dir = names, entry_dir, entry_is_dir
+        self.postings = postings
+        self.removed = 0
+        self.changed = True
+
+    # ========== Queries ==========
+
+    def search(self, term: str, grams: Set[str], under: Optional[str], limit: int,
+               out: List[FileEntry]) -> bool:
+        """Append entries whose name contains ``term`` (lower-cased) to ``out``.
+
+        Returns:
+            True if ``limit`` was reached
+        """
+        names = self.names
+        if grams:
+            lists = [self.postings.get(gram) for gram in grams]
+            if any(ids is None for ids in lists):
+                return False
+            candidates = min(lists, key=len)
+        else:
+            candidates = range(len(names))
+
+        entry_dir = self.entry_dir
+        dir_paths = self.dir_paths
+        in_scope: Dict[int, bool] = {}
+        for eid in candidates:
+            name = names[eid]
+            if name is None or term not in name.lower():
+                continue
+            did = entry_dir[eid]
+            folder = dir_paths[did]
+            if folder is None:
+                continue
+            if under is not None:
+                ok = in_scope.get(did)
+                if ok is None:
+                    ok = in_scope[did] = is_within(folder, under)
+                if not ok:
+                    continue
+            path = os.path.join(folder, name)
+            if self.entry_is_dir[eid]:
+                out.append(FileEntry(name, path, True))
+            else:
+                # Stats are left to the panel (StatFiller)
+                out.append(FileEntry(name, path, False, 0, MTIME_PENDING))
+            if len(out) >= limit:
+                return True
+        return False
+
+    # ========== Persistence ==========
+
+    def dumps(self) -> bytes:
+        return marshal.dumps({
+            "version": FORMAT_VERSION,
+            "root": self.root,
+            "rules": self.rules_key,
+            "itemsize": self.entry_dir.itemsize,
+            "dir_paths": self.dir_paths,
+            "dir_mtimes": self.dir_mtimes,
+            "names": self.names,
+            "entry_dir": self.entry_dir.tobytes(),
+            "entry_is_dir": bytes(self.entry_is_dir),
+            "postings": {gram: ids.tobytes() for gram, ids in self.postings.items()},
+        })
+
+    @classmethod
+    def loads(cls, data: bytes, root: str, rules_key) -> Optional["RootIndex"]:
+        """Rebuild a saved index; None if it is unreadable or out of date."""
+        try:
+            saved = marshal.loads(data)
+            if (saved["version"] != FORMAT_VERSION or saved["root"] != root
+                    or saved["rules"] != rules_key or saved["itemsize"] != array("I").itemsize):
+                return None
+            index = cls(root, rules_key)
+            index.dir_paths = saved["dir_paths"]
+            index.dir_mtimes = saved["dir_mtimes"]
+            index.names = saved["names"]
+            index.entry_dir.frombytes(saved["entry_dir"])
+            index.entry_is_dir = bytearray(saved["entry_is_dir"])
+            for gram, ids in saved["postings"].items():
+                index.postings[gram] = postings = array("I")
+                postings.frombytes(ids)
+        except (EOFError, ValueError, TypeError, KeyError):
+            return None
+        index.dir_ids = {path: did for did, path in enumerate(index.dir_paths) if path is not None}
+        for eid, name in enumerate(index.names):
+            if name is None:
+                index.removed += 1
+            else:
+                index.dir_entries.setdefault(index.entry_dir[eid], []).append(eid)
+        return index
+
+
+class NameIndex:
+    """Process-wide name index over the workspace roots."""
+
+    # Most results a query returns
+    MAX_RESULTS = 1000
+
+    # Changed folders reported by the watcher are re-read this long after
+    # the first report, together
+    FLUSH_DELAY_S = 1.0
+
+    # A changed index is saved at most this often (and on shutdown)
+    SAVE_INTERVAL_S = 60.0
+
+    # How long shutdown waits for the indexer to stop and save
+    SHUTDOWN_WAIT_S = 5.0
+
+    # Overridable for tests; defaults to <app data>/name_index
+    directory = None
+
+    # Bumped whenever the indexed names may have changed
+    version = 0
+
+    _roots: Dict[str, RootIndex] = {}
+    _rules = None
+    _dirty: Set[str] = set()
+    _flush_queued = False
+    _last_save = 0.0
+    _stopping = False
+    _lock = threading.RLock()
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def index_dir(cls) -> str:
+        if cls.directory is None:
+            cls.directory = os.path.join(get_app_data_dir(), "name_index")
+        os.makedirs(cls.directory, exist_ok=True)
+        return cls.directory
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Single indexer thread: builds, re-reads and saves run in order."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="name-index")
+            return cls._executor
+
+    @classmethod
+    def configure(cls, roots: Iterable[str], rules=None) -> None:
+        """Index ``roots`` with ``rules`` (IgnoreRules or None).
+
+        Roots no longer listed are dropped; new ones (and all of them when
+        the rules changed) are loaded or built in the background.
+        """
+        rules_key = rules.lines if rules is not None else None
+        roots = [os.path.normpath(r) for r in roots]
+        with cls._lock:
+            cls._stopping = False
+            rules_changed = rules_key != (cls._rules.lines if cls._rules is not None else None)
+            cls._rules = rules
+            for root in list(cls._roots):
+                if root not in roots or rules_changed:
+                    cls._drop(root)
+            todo = [root for root in roots if root not in cls._roots]
+            for root in todo:
+                cls._roots[root] = RootIndex(root, rules_key)
+            cls.version += 1
+        for root in todo:
+            cls.executor().submit(cls._load, root)
+
+    @classmethod
+    def roots(cls) -> List[str]:
+        with cls._lock:
+            return list(cls._roots)
+
+    @classmethod
+    def covers(cls, path: str) -> bool:
+        """Whether ``path`` lies under an indexed root."""
+        path = os.path.normpath(path)
+        with cls._lock:
+            return any(is_within(path, root) for root in cls._roots)
+
+    @classmethod
+    def ready(cls) -> bool:
+        """Whether every root has been built (or loaded and revalidated)."""
+        with cls._lock:
+            return all(index.ready for index in cls._roots.values())
+
+    @classmethod
+    def search(cls, term: str, under: Optional[str] = None,
+               limit: Optional[int] = None) -> Tuple[List[FileEntry], bool]:
+        """Entries whose name contains ``term``, optionally only below ``under``.
+
+        Returns:
+            (entries, whether the result was cut at ``limit``)
+        """
+        term = term.lower()
+        limit = limit or cls.MAX_RESULTS
+        grams = trigrams(term)
+        under = os.path.normpath(under) if under else None
+        found: List[FileEntry] = []
+        with cls._lock:
+            for root, index in cls._roots.items():
+                if under is not None and not (is_within(under, root) or is_within(root, under)):
+                    continue
+                if index.search(term, grams, under, limit, found):
+                    return found, True
+        return found, False
+
+    @classmethod
+    def files(cls) -> List[Tuple[str, str]]:
+        """(name, folder) of every indexed file, folders left out."""
+        with cls._lock:
+            # Copy the tables; the pairs are put together outside the lock
+            tables = [(index.names[:], index.entry_dir[:], bytes(index.entry_is_dir), index.dir_paths[:])
+                      for index in cls._roots.values()]
+        files = []
+        for names, entry_dir, entry_is_dir, dir_paths in tables:
+            for name, did, is_dir in zip(names, entry_dir, entry_is_dir):
+                if name is not None and not is_dir:
+                    folder = dir_paths[did]
+                    if folder is not None:
+                        files.append((name, folder))
+        return files
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return {
+                "roots": len(cls._roots),
+                "entries": sum(len(index) for index in cls._roots.values()),
+                "folders": sum(len(index.dir_ids) for index in cls._roots.values()),
+                "trigrams": sum(len(index.postings) for index in cls._roots.values()),
+            }
+
+    @classmethod
+    def revalidate(cls) -> None:
+        """Re-read every indexed folder whose mtime changed (background)."""
+        for root in cls.roots():
+            cls.executor().submit(cls._revalidate, root)
+
+    @classmethod
+    def mark_changed(cls, path: str) -> None:
+        """Watcher callback: something at ``path`` was created, changed or removed."""
+        with cls._lock:
+            cls._dirty.add(os.path.dirname(path))
+            cls._dirty.add(path)
+            if cls._flush_queued:
+                return
+            cls._flush_queued = True
+        cls.executor().submit(cls._flush)
+
+    @classmethod
+    def save(cls, force: bool = False) -> None:
+        """Write changed indexes now (blocking)."""
+        with cls._lock:
+            indexes = [index for index in cls._roots.values() if index.changed and index.ready]
+            cls._last_save = time.monotonic()
+        for index in indexes:
+            with cls._lock:
+                if index.removed > len(index):
+                    index.compact()
+                data = index.dumps()
+                index.changed = False
+            target = os.path.join(cls.index_dir(), index_name(index.root))
+            tmp = target + ".tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, target)
+            except OSError as e:
+                print(f"Error saving name index for {index.root}: {e}")
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop indexing and watching, and save what changed (on application exit).
+
+        A build or re-read in progress stops at its next folder; an index
+        it left incomplete is not saved, so the last complete one is
+        loaded (and revalidated) next time.
+        """
+        with cls._lock:
+            cls._stopping = True
+            for index in cls._roots.values():
+                if index.watch is not None:
+                    DirectorySessions.unwatch(index.watch)
+                    index.watch = None
+        # Saved on the indexer thread, behind whatever it is stopping
+        try:
+            cls.executor().submit(cls.save).result(timeout=cls.SHUTDOWN_WAIT_S)
+        except FutureTimeoutError:
+            print("Name index still busy at exit; not saved")
+
+    # ========== Indexer thread ==========
+
+    @classmethod
+    def _drop(cls, root: str) -> None:
+        """Stop indexing ``root`` (lock held)."""
+        index = cls._roots.pop(root)
+        if index.watch is not None:
+            DirectorySessions.unwatch(index.watch)
+
+    @classmethod
+    def _current(cls, root: str, index: RootIndex) -> bool:
+        """Whether ``index`` is still to be worked on (not dropped, not shutting down)."""
+        with cls._lock:
+            return not cls._stopping and cls._roots.get(root) is index
+
+    @classmethod
+    def _load(cls, root: str) -> None:
+        with cls._lock:
+            index = cls._roots.get(root)
+            rules = cls._rules
+        if index is None:
+            return
+        saved = None
+        try:
+            with open(os.path.join(cls.index_dir(), index_name(root)), "rb") as f:
+                saved = RootIndex.loads(f.read(), root, index.rules_key)
+        except OSError:
+            pass
+        with cls._lock:
+            if not cls._current(root, index):
+                return
+            if saved is not None:
+                cls._roots[root] = index = saved
+                cls.version += 1
+            # Watch before reading, so nothing changes unseen in between
+            index.watch = DirectorySessions.watch_tree(root, cls.mark_changed)
+        if saved is None:
+            if not cls._read(index, [root], rules):
+                return
+        elif not cls._revalidate(root):
+            return
+        index.ready = True
+        cls._maybe_save()
+
+    @classmethod
+    def _revalidate(cls, root: str) -> bool:
+        """Re-read the folders of ``root`` whose mtime changed.
+
+        Returns:
+            False if it was stopped before the end
+        """
+        with cls._lock:
+            index = cls._roots.get(root)
+            rules = cls._rules
+            known = list(index.dir_ids.items()) if index is not None else []
+        stale = []
+        for path, did in known:
+            if cls._stopping:
+                return False
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if mtime_ns != index.dir_mtimes[did]:
+                stale.append(path)
+        if stale and not cls._read(index, stale, rules):
+            return False
+        cls._maybe_save()
+        return True
+
+    @classmethod
+    def _flush(cls) -> None:
+        """Re-read the folders the watcher reported."""
+        time.sleep(cls.FLUSH_DELAY_S)
+        with cls._lock:
+            cls._flush_queued = False
+            if cls._stopping:
+                return
+            dirty, cls._dirty = cls._dirty, set()
+            rules = cls._rules
+            targets = []
+            for index in cls._roots.values():
+                paths = [p for p in dirty if p in index.dir_ids]
+                if paths:
+                    targets.append((index, paths))
+        for index, paths in targets:
+            if not cls._read(index, paths, rules):
+                return
+        cls._maybe_save()
+
+    @classmethod
+    def _read(cls, index: RootIndex, paths: List[str], rules) -> bool:
+        """Read ``paths`` into ``index``, and any sub-folders new to it.
+
+        Returns:
+            False if it was stopped before the end
+        """
+        ignore = rules.bind(index.root) if rules is not None else None
+        stack = list(paths)
+        while stack:
+            path = stack.pop()
+            if not cls._current(index.root, index):
+                with cls._lock:
+                    # Folders found but not read yet would be missed by a
+                    # later revalidation: keep the saved copy instead
+                    index.ready = False
+                return False
+            found = {}
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+                with os.scandir(path) as it:
+                    for de in it:
+                        entry = DirectoryScanner.entry_from_direntry(de, False, ignore, stat_file=False)
+                        if entry is not None and entry is not IGNORED:
+                            found[entry.name] = entry.is_dir
+            except OSError:
+                with cls._lock:
+                    if path != index.root:
+                        index.remove_tree(path)
+                        cls.version += 1
+                continue
+            with cls._lock:
+                stack.extend(index.apply_dir(path, mtime_ns, found))
+                cls.version += 1
+        return True
+
+    @classmethod
+    def _maybe_save(cls) -> None:
+        if time.monotonic() - cls._last_save >= cls.SAVE_INTERVAL_S:
+            cls.save()
+
+
+class IndexQuery:
+    """Per-panel front end running NameIndex queries off the Tk thread."""
+
+    def __init__(self):
+        self.generation = 0
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+
+    def submit(self, term: str, under: Optional[str] = None) -> int:
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+        # Queries are quick; they share the listing pool rather than
+        # waiting behind the indexer thread
+        ListingWorker.executor().submit(self._run, generation, term, under)
+        return generation
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.generation += 1
+
+    def poll(self):
+        """The newest current (entries, truncated, seconds) result, or None."""
+        latest = None
+        while True:
+            try:
+                generation, result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.generation:
+                latest = result
+        return latest
+
+    def _run(self, generation: int, term: str, under: Optional[str]) -> None:
+        if generation != self.generation:
+            return
+        started = time.perf_counter()
+        entries, truncated = NameIndex.search(term, under)
+        self.results.put((generation, (entries, truncated, time.perf_counter() - started)))
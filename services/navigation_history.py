@@ -0,0 +1,95 @@
+"""
+Navigation History - Per-panel back/forward stacks with listing snapshots.
+
+Each history entry remembers a folder together with a snapshot of its
+unfiltered listing, the scroll position and the selected paths, so going
+back can redraw the folder immediately and revalidate it afterwards.
+Snapshots are bounded: once the entries held by all snapshots in one
+history exceed MAX_SNAPSHOT_ENTRIES, the oldest snapshots are dropped
+(the entry itself stays, it just has to be rescanned).
+"""
+
+from typing import Any, List, Optional
+
+from services.directory_scanner import FileEntry
+
+
+class HistoryEntry:
+    """A visited folder and how it looked when the user left it."""
+
+    __slots__ = ("path", "entries", "scroll", "selection")
+
+    def __init__(self, path: str, entries: Optional[List[FileEntry]] = None,
+                 scroll: Any = None, selection: Optional[List[str]] = None):
+        self.path = path
+        self.entries = entries
+        self.scroll = scroll
+        self.selection = selection or []
+
+
+class NavigationHistory:
+    """Back and forward stacks of HistoryEntry objects."""
+
+    MAX_DEPTH = 50
+    MAX_SNAPSHOT_ENTRIES = 50000
+
+    def __init__(self):
+        self.back: List[HistoryEntry] = []
+        self.forward: List[HistoryEntry] = []
+
+    @property
+    def can_go_back(self) -> bool:
+        return bool(self.back)
+
+    @property
+    def can_go_forward(self) -> bool:
+        return bool(self.forward)
+
+    def visit(self, leaving: Optional[HistoryEntry]) -> None:
+        """Record the folder being left for a new one; clears forward."""
+        if leaving is not None:
+            self.back.append(leaving)
+            del self.back[:-self.MAX_DEPTH]
+        self.forward.clear()
+        self._trim_snapshots()
+
+    def go_back(self, leaving: Optional[HistoryEntry]) -> Optional[HistoryEntry]:
+        """Step back, pushing the current folder onto the forward stack."""
+        if not self.back:
+            return None
+        if leaving is not None:
+            self.forward.append(leaving)
+        entry = self.back.pop()
+        self._trim_snapshots()
+        return entry
+
+    def go_forward(self, leaving: Optional[HistoryEntry]) -> Optional[HistoryEntry]:
+        """Step forward, pushing the current folder onto the back stack."""
+        if not self.forward:
+            return None
+        if leaving is not None:
+            self.back.append(leaving)
+        entry = self.forward.pop()
+        self._trim_snapshots()
+        return entry
+
+    def _trim_snapshots(self) -> None:
+        """Drop snapshots, furthest from the current folder first."""
+        total = sum(len(e.entries) for e in self.back + self.forward if e.entries)
+        if total <= self.MAX_SNAPSHOT_ENTRIES:
+            return
+        # Interleave both stacks from their far ends: those are least likely
+        # to be revisited soon
+        order = []
+        back, forward = list(self.back), list(reversed(self.forward))
+        while back or forward:
+            if back:
+                order.append(back.pop(0))
+            if forward:
+                order.append(forward.pop())
+        for entry in order:
+            if total <= self.MAX_SNAPSHOT_ENTRIES:
+                break
+            if entry.entries:
+                total -= len(entry.entries)
+                entry.entries = None
@@ -0,0 +1,217 @@
+"""
+Office Text - Plain text of .docx and .xlsx documents for content search.
+
+Office documents are zip containers of XML parts. extract_text() streams
+the parts that hold text straight out of the zip with iterparse, clearing
+each element once it has been read, so a document is never loaded whole:
+paragraphs of the body, headers, footers and notes of a Word document
+become lines, and each row of every sheet of a workbook becomes one
+tab-separated line (shared strings are looked up by index).
+
+Extraction runs in a process pool, keeping XML parsing off the GUI
+process's interpreter lock, and OfficeText caches the result by
+(path, size, mtime_ns) so each version of a document is parsed once.
+"""
+
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Tuple
+from xml.etree import ElementTree
+
+
+OFFICE_EXTS = frozenset(['.docx', '.xlsx', '.xlsm'])
+
+# Characters extracted from one document
+MAX_CHARS = 8 * 1024 * 1024
+
+_WORD_PARTS = re.compile(r"word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$")
+_SHEET_PART = re.compile(r"xl/worksheets/sheet(\d+)\.xml$")
+
+
+def _local(tag: str) -> str:
+    """Tag name without its namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _word_lines(stream) -> Iterator[str]:
+    """Paragraphs of one WordprocessingML part."""
+    parts: List[str] = []
+    for _, elem in ElementTree.iterparse(stream, events=("end",)):
+        tag = _local(elem.tag)
+        if tag == "t":
+            parts.append(elem.text or "")
+        elif tag == "tab":
+            parts.append("\t")
+        elif tag in ("br", "cr"):
+            parts.append("\n")
+        elif tag == "p":
+            yield "".join(parts)
+            parts = []
+        else:
+            continue
+        elem.clear()
+
+
+def _shared_strings(stream) -> List[str]:
+    strings = []
+    for _, elem in ElementTree.iterparse(stream, events=("end",)):
+        if _local(elem.tag) == "si":
+            strings.append("".join(elem.itertext()))
+            elem.clear()
+    return strings
+
+
+def _sheet_lines(stream, shared: List[str]) -> Iterator[str]:
+    """Rows of one worksheet, cells separated by tabs."""
+    cells: List[str] = []
+    for _, elem in ElementTree.iterparse(stream, events=("end",)):
+        tag = _local(elem.tag)
+        if tag == "c":
+            kind = elem.get("t")
+            if kind == "inlineStr":
+                cells.append("".join(elem.itertext()))
+            else:
+                value = next((child.text for child in elem if _local(child.tag) == "v"), None) or ""
+                if kind == "s" and value.isdigit() and int(value) < len(shared):
+                    value = shared[int(value)]
+                cells.append(value)
+            elem.clear()
+        elif tag == "row":
+            yield "\t".join(cells)
+            cells = []
+            elem.clear()
+
+
+def _lines(archive: zipfile.ZipFile, ext: str) -> Iterator[str]:
+    names = archive.namelist()
+    if ext == ".docx":
+        for name in sorted(n for n in names if _WORD_PARTS.match(n)):
+            with archive.open(name) as stream:
+                yield from _word_lines(stream)
+        return
+    shared = []
+    if "xl/sharedStrings.xml" in names:
+        with archive.open("xl/sharedStrings.xml") as stream:
+            shared = _shared_strings(stream)
+    sheets = sorted((int(m.group(1)), n) for n in names for m in [_SHEET_PART.match(n)] if m)
+    for _, name in sheets:
+        with archive.open(name) as stream:
+            yield from _sheet_lines(stream, shared)
+
+
+def extract_text(path: str, max_chars: int = MAX_CHARS) -> str:
+    """Text of an Office document, one paragraph or sheet row per line.
+
+    Documents that are not valid Office files give "".
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    ext = os.path.splitext(path)[1].lower()
+    out: List[str] = []
+    size = 0
+    try:
+        with zipfile.ZipFile(path) as archive:
+            for line in _lines(archive, ext):
+                out.append(line)
+                size += len(line) + 1
+                if size >= max_chars:
+                    break
+    except (zipfile.BadZipFile, ElementTree.ParseError, KeyError, RuntimeError, EOFError):
+        # Corrupt, encrypted or not an Office file after all
+        return ""
+    return "\n".join(out)[:max_chars]
+
+
+class OfficeText:
+    """Process-wide cache of extracted document text."""
+
+    MAX_WORKERS = 2
+
+    # Characters kept in the cache, least recently used dropped first
+    CACHE_CHARS = 64 * 1024 * 1024
+
+    _cache: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+    _cache_chars = 0
+    _lock = threading.Lock()
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ProcessPoolExecutor:
+        """Shared extraction processes, started on first use."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=cls.MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            return cls._executor
+
+    @classmethod
+    def get(cls, path: str) -> str:
+        """Text of an Office document, extracted once per (size, mtime_ns).
+
+        Blocks until the text is extracted; call it off the Tk thread.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        st = os.stat(path)
+        key = (st.st_size, st.st_mtime_ns)
+        with cls._lock:
+            cached = cls._cache.get(path)
+            if cached is not None and cached[0] == key:
+                cls._cache.move_to_end(path)
+                return cached[1]
+        text = cls._extract(path)
+        cls._store(path, key, text)
+        return text
+
+    @classmethod
+    def cached(cls) -> Dict[str, int]:
+        """Documents and characters held in the cache."""
+        with cls._lock:
+            return {"documents": len(cls._cache), "chars": cls._cache_chars}
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._cache.clear()
+            cls._cache_chars = 0
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the extraction processes."""
+        with cls._executor_lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = None
+
+    @classmethod
+    def _extract(cls, path: str) -> str:
+        try:
+            future = cls.executor().submit(extract_text, path)
+            return future.result()
+        except BrokenProcessPool:
+            # A worker died (or processes cannot be started here): start
+            # a fresh pool next time and extract this one in-thread
+            cls.shutdown()
+            return extract_text(path)
+
+    @classmethod
+    def _store(cls, path: str, key: Tuple[int, int], text: str) -> None:
+        with cls._lock:
+            old = cls._cache.pop(path, None)
+            if old is not None:
+                cls._cache_chars -= len(old[1])
+            cls._cache[path] = (key, text)
+            cls._cache_chars += len(text)
+            while cls._cache_chars > cls.CACHE_CHARS and len(cls._cache) > 1:
+                _, (_, dropped) = cls._cache.popitem(last=False)
+                cls._cache_chars -= len(dropped)
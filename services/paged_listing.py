@@ -0,0 +1,272 @@
+"""
+Paged Listing - Reads directories too big to list in one go, a page at a time.
+
+Drop folders can hold hundreds of thousands of files when only the newest
+few thousand matter. A PagedLoader hands back PAGE_SIZE entries per
+request, so memory and the time to the first screen depend on the page
+size rather than on the folder:
+
+- In directory order, pages come straight off one os.scandir iterator
+  that stays open between pages (names only on slow filesystems).
+- Newest (or oldest) first, each page is one pass over the folder that
+  keeps only the top PAGE_SIZE entries by (mtime, name) in a bounded heap;
+  the next page repeats the pass for entries past the last one shown.
+  Every PROGRESS_EVERY entries the pass reports its provisional top
+  entries so the panel has something to show straight away.
+
+Pages run on the listing pool; one page per panel is read at a time.
+"""
+
+import heapq
+import os
+import queue
+import threading
+from typing import Any, List, Optional, Tuple
+
+from services.directory_scanner import CANCEL_CHECK_INTERVAL, IGNORED, DirectoryScanner, FileEntry
+from services.listing_filter import ListingQuery, filter_entries
+from services.listing_worker import ListingWorker
+from services.slow_fs import SlowPaths
+
+
+ORDER_NEWEST = "newest"
+ORDER_OLDEST = "oldest"
+
+
+def mtime_key(entry: FileEntry) -> Tuple[int, str]:
+    return (entry.mtime_ns, entry.name)
+
+
+class _Desc:
+    """Reverses the ordering of a key, so a min-heap keeps the smallest K."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other: "_Desc") -> bool:
+        return self.key > other.key
+
+
+class PageResult:
+    """One page, or a provisional view of the page being read."""
+
+    __slots__ = ("generation", "entries", "final", "done", "seen", "ignored")
+
+    def __init__(self, generation: int, entries: List[FileEntry], final: bool,
+                 done: bool, seen: int, ignored: int):
+        self.generation = generation
+        self.entries = entries
+        self.final = final
+        self.done = done
+        self.seen = seen
+        self.ignored = ignored
+
+
+class PagedState:
+    """Where a paged listing has got to."""
+
+    def __init__(self, generation: int, path: str, query: ListingQuery, order: Optional[str],
+                 show_hidden_dirs: bool):
+        self.generation = generation
+        self.path = path
+        self.query = query
+        self.order = order
+        self.show_hidden_dirs = show_hidden_dirs
+        self.iterator: Any = None          # open os.scandir (directory order)
+        self.boundary: Optional[Tuple[int, str]] = None   # last key shown (mtime order)
+        self.busy = False
+        self.done = False
+        self.pages = 0
+        self.seen = 0
+        self.ignored = 0
+
+    def close(self) -> None:
+        if self.iterator is not None:
+            self.iterator.close()
+            self.iterator = None
+
+
+class PagedLoader:
+    """Per-panel front end for paged listings."""
+
+    PAGE_SIZE = 2000
+    PROGRESS_EVERY = 20000
+
+    def __init__(self):
+        self.generation = 0
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self.state: Optional[PagedState] = None
+
+    def start(self, path: str, query: ListingQuery, order: Optional[str] = None,
+              show_hidden_dirs: bool = False) -> int:
+        """Begin a paged listing and read its first page.
+
+        Args:
+            order: None for directory order, ORDER_NEWEST or ORDER_OLDEST
+        """
+        with self._lock:
+            self.generation += 1
+            old, self.state = self.state, PagedState(self.generation, path, query, order, show_hidden_dirs)
+            state = self.state
+            state.busy = True
+        if old is not None:
+            self._close_when_idle(old)
+        ListingWorker.executor().submit(self._run, state)
+        return state.generation
+
+    def more(self) -> bool:
+        """Read the next page; False if there is none or one is being read."""
+        with self._lock:
+            state = self.state
+            if state is None or state.busy or state.done:
+                return False
+            state.busy = True
+        ListingWorker.executor().submit(self._run, state)
+        return True
+
+    @property
+    def has_more(self) -> bool:
+        state = self.state
+        return state is not None and not state.done
+
+    @property
+    def busy(self) -> bool:
+        state = self.state
+        return state is not None and state.busy
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.generation += 1
+            old, self.state = self.state, None
+        if old is not None:
+            self._close_when_idle(old)
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    def poll(self) -> List[PageResult]:
+        """Pages (and provisional pages) of the current listing since the last poll."""
+        found = []
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if self.is_current(result.generation):
+                found.append(result)
+        return found
+
+    def _close_when_idle(self, state: PagedState) -> None:
+        # A running page closes the iterator itself when it notices it is stale
+        with self._lock:
+            if not state.busy:
+                state.close()
+
+    # ========== Worker side ==========
+
+    def _run(self, state: PagedState) -> None:
+        try:
+            if state.order is None:
+                result = self._directory_page(state)
+            else:
+                result = self._mtime_page(state)
+        except OSError:
+            result = PageResult(state.generation, [], True, True, state.seen, state.ignored)
+            state.done = True
+        with self._lock:
+            stale = not self.is_current(state.generation)
+            if result is not None and not stale:
+                # Queued before busy clears, so a poller that sees the
+                # loader idle has the page
+                state.pages += 1
+                self.results.put(result)
+            state.busy = False
+            if stale or state.done:
+                state.close()
+
+    def _entries(self, state: PagedState, iterator, cancelled, stat_files: bool = True):
+        """Scanned entries from ``iterator``, counting ignored ones."""
+        for count, de in enumerate(iterator, 1):
+            if count % CANCEL_CHECK_INTERVAL == 0 and cancelled():
+                return
+            state.seen += 1
+            entry = DirectoryScanner.entry_from_direntry(de, state.show_hidden_dirs, state.query.ignore,
+                                                         stat_files)
+            if entry is None:
+                continue
+            if entry is IGNORED:
+                state.ignored += 1
+                continue
+            yield entry
+
+    def _directory_page(self, state: PagedState) -> Optional[PageResult]:
+        cancelled = lambda: not self.is_current(state.generation)
+        if state.iterator is None:
+            state.iterator = os.scandir(state.path)
+        page = []
+        batch = []
+        exhausted = True
+        stat_files = not SlowPaths.is_slow(state.path)
+        for entry in self._entries(state, state.iterator, cancelled, stat_files):
+            batch.append(entry)
+            if len(batch) >= min(CANCEL_CHECK_INTERVAL, self.PAGE_SIZE - len(page)):
+                page.extend(filter_entries(batch, state.query, cancelled) or [])
+                batch = []
+                if len(page) >= self.PAGE_SIZE:
+                    exhausted = False
+                    break
+        if cancelled():
+            return None
+        page.extend(filter_entries(batch, state.query, cancelled) or [])
+        state.done = exhausted
+        page.sort(key=lambda e: (not e.is_dir, e.name.lower()))
+        return PageResult(state.generation, page, True, state.done, state.seen, state.ignored)
+
+    def _mtime_page(self, state: PagedState) -> Optional[PageResult]:
+        cancelled = lambda: not self.is_current(state.generation)
+        newest = state.order == ORDER_NEWEST
+        wrap = (lambda key: key) if newest else _Desc
+        boundary = state.boundary
+        k = self.PAGE_SIZE
+        heap = []        # (wrapped key, path, entry); heap[0] is the weakest kept
+        # Every pass reads the whole folder, so its counts are the totals
+        state.seen = state.ignored = 0
+
+        def offer(entries):
+            for entry in entries:
+                key = mtime_key(entry)
+                if boundary is not None and (key >= boundary if newest else key <= boundary):
+                    continue
+                item = (wrap(key), entry.path, entry)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif heap[0] < item:
+                    heapq.heapreplace(heap, item)
+
+        def ordered():
+            return [entry for _, _, entry in sorted(heap, reverse=True)]
+
+        batch = []
+        next_progress = self.PROGRESS_EVERY
+        with os.scandir(state.path) as it:
+            for entry in self._entries(state, it, cancelled):
+                batch.append(entry)
+                if len(batch) >= CANCEL_CHECK_INTERVAL:
+                    offer(filter_entries(batch, state.query, cancelled) or [])
+                    batch = []
+                    if state.seen >= next_progress and state.pages == 0:
+                        next_progress += self.PROGRESS_EVERY
+                        self.results.put(PageResult(state.generation, ordered(), False, False,
+                                                    state.seen, state.ignored))
+        if cancelled():
+            return None
+        offer(filter_entries(batch, state.query, cancelled) or [])
+
+        page = ordered()
+        state.done = len(page) < k
+        if page:
+            state.boundary = mtime_key(page[-1])
+        return PageResult(state.generation, page, True, state.done, state.seen, state.ignored)
@@ -0,0 +1,90 @@
+"""
+Prefetcher - Warms the listing cache with folders the user is likely to open.
+
+When a folder row is highlighted the next action is usually to open it,
+and Backspace (go up) is nearly as common, so a panel asks its Prefetcher
+to scan those folders ahead of time into the shared ListingCache.
+Prefetches run on their own small pool so they never hold up real
+listings, are cancelled as soon as the panel asks for something else,
+skip folders larger than MAX_ENTRIES, and are only cached while the cache
+has room (they never evict listings the user actually opened).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from services.directory_scanner import DirectoryScanner
+from services.ignore_rules import IgnoreMatcher, IgnoreRules
+from services.listing_cache import ListingCache, dir_key
+from services.slow_fs import SlowPaths
+
+
+class Prefetcher:
+    """Per-panel front end to the shared prefetch pool."""
+
+    MAX_WORKERS = 2
+    MAX_ENTRIES = 20000
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    # Counters for tuning
+    completed = 0
+    skipped = 0
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Shared pool for all panels, created on first use."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.MAX_WORKERS, thread_name_prefix="prefetch")
+            return cls._executor
+
+    def __init__(self):
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def prefetch(self, paths: Iterable[str], rules: Optional[IgnoreRules] = None) -> None:
+        """Replace any pending prefetches with ``paths`` (most likely first).
+
+        ``rules`` are the ignore rules the panel would list them with.
+        """
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+        for path in paths:
+            if path:
+                ignore = rules.bind(path) if rules is not None else None
+                self.executor().submit(self._run, generation, path, ignore)
+
+    def cancel(self) -> None:
+        """Abandon pending and running prefetches."""
+        with self._lock:
+            self.generation += 1
+
+    def _is_stale(self, generation: int) -> bool:
+        return generation != self.generation
+
+    def _run(self, generation: int, path: str, ignore: Optional[IgnoreMatcher] = None) -> None:
+        if self._is_stale(generation) or ListingCache.get(path, ignore) is not None:
+            return
+        try:
+            key = dir_key(path)
+            entries = DirectoryScanner.scan(
+                path,
+                is_cancelled=lambda: self._is_stale(generation),
+                max_entries=self.MAX_ENTRIES,
+                ignore=ignore,
+                stat_files=not SlowPaths.is_slow(path)
+            )
+        except OSError:
+            return
+        if entries is None or self._is_stale(generation):
+            Prefetcher.skipped += 1
+            return
+        if ListingCache.put(path, key, entries, only_if_room=True, ignore=ignore):
+            Prefetcher.completed += 1
+        else:
+            Prefetcher.skipped += 1
@@ -0,0 +1,203 @@
+"""
+Recursive Walker - Lists every file under a folder using a thread pool.
+
+Used by a panel's "Recursive" (flatten) view. Each directory is one task
+on a shared pool: the task scans it with os.scandir, hands the matching
+files back as a batch and queues a task per sub-folder, so wide trees
+are read in parallel (which matters most on network shares, where each
+directory costs a round-trip). The panel polls the result queue from the
+Tk thread, so rows stream in as directories are read.
+
+Every request bumps the walker's generation and stale tasks stop at the
+next check. Directories are identified by (st_dev, st_ino) after
+following symlinks; one that has already been visited is not entered
+again, which breaks symlink (and junction) loops. Folders matching the
+query's ignore rules are never entered.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from services.directory_scanner import CANCEL_CHECK_INTERVAL, IGNORED, DirectoryScanner, FileEntry
+from services.listing_filter import ListingQuery, filter_entries
+
+
+class WalkBatch:
+    """Files found in one directory (or the end-of-walk marker)."""
+
+    __slots__ = ("generation", "entries", "done")
+
+    def __init__(self, generation: int, entries: List[FileEntry], done: bool = False):
+        self.generation = generation
+        self.entries = entries
+        self.done = done
+
+
+class WalkState:
+    """Book-keeping for one walk, shared by its tasks."""
+
+    def __init__(self, generation: int, root: str, query: ListingQuery, show_hidden_dirs: bool):
+        self.generation = generation
+        self.root = root
+        self.query = query
+        self.show_hidden_dirs = show_hidden_dirs
+        self.lock = threading.Lock()
+        self.pending = 1
+        self.visited = set()
+        self.started = time.perf_counter()
+        self.finished = None
+
+        self.entries_seen = 0
+        self.dirs_scanned = 0
+        self.loops_skipped = 0
+        self.ignored = 0
+        self.errors = 0
+
+    def throughput(self) -> float:
+        """Entries read per second (up to the end of the walk once finished)."""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return self.entries_seen / elapsed if elapsed > 0 else 0.0
+
+
+class RecursiveWalker:
+    """Per-panel front end to the shared walker pool."""
+
+    MAX_WORKERS = 8
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Shared pool for all panels, created on first use."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.MAX_WORKERS, thread_name_prefix="walk")
+            return cls._executor
+
+    def __init__(self):
+        self.generation = 0
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self.state: Optional[WalkState] = None
+
+    def start(self, root: str, query: ListingQuery, show_hidden_dirs: bool = False) -> int:
+        """Walk ``root``; older walks become stale.
+
+        Returns:
+            The generation ID of this walk
+        """
+        with self._lock:
+            self.generation += 1
+            state = self.state = WalkState(self.generation, root, query, show_hidden_dirs)
+        self.executor().submit(self._walk_dir, state, root)
+        return state.generation
+
+    def cancel(self) -> None:
+        """Stop the current walk."""
+        with self._lock:
+            self.generation += 1
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self.generation
+
+    def poll(self) -> Tuple[List[FileEntry], bool]:
+        """Collect files found since the last poll for the current walk.
+
+        Must be called from the Tk thread.
+
+        Returns:
+            (new files, whether the walk has finished)
+        """
+        found = []
+        done = False
+        while True:
+            try:
+                batch = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if not self.is_current(batch.generation):
+                continue
+            found.extend(batch.entries)
+            done = done or batch.done
+        return found, done
+
+    def _enter(self, state: WalkState, path: str) -> bool:
+        """Record a directory as visited; False if it was already walked."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            with state.lock:
+                state.errors += 1
+            return False
+        key = (st.st_dev, st.st_ino)
+        with state.lock:
+            if key in state.visited:
+                state.loops_skipped += 1
+                return False
+            state.visited.add(key)
+            return True
+
+    def _walk_dir(self, state: WalkState, path: str) -> None:
+        try:
+            if self.is_current(state.generation) and self._enter(state, path):
+                self._scan(state, path)
+        finally:
+            with state.lock:
+                state.pending -= 1
+                finished = state.pending == 0
+                if finished:
+                    state.finished = time.perf_counter()
+            if finished and self.is_current(state.generation):
+                self.results.put(WalkBatch(state.generation, [], done=True))
+
+    def _scan(self, state: WalkState, path: str) -> None:
+        cancelled = lambda: not self.is_current(state.generation)
+        files = []
+        subdirs = []
+        ignored = 0
+        try:
+            with os.scandir(path) as it:
+                for count, de in enumerate(it, 1):
+                    if count % CANCEL_CHECK_INTERVAL == 0 and cancelled():
+                        return
+                    entry = DirectoryScanner.entry_from_direntry(
+                        de, state.show_hidden_dirs, state.query.ignore)
+                    if entry is None:
+                        continue
+                    if entry is IGNORED:
+                        ignored += 1
+                    elif entry.is_dir:
+                        subdirs.append(entry.path)
+                    else:
+                        files.append(entry)
+        except OSError:
+            with state.lock:
+                state.errors += 1
+            return
+
+        with state.lock:
+            if cancelled():
+                return
+            state.pending += len(subdirs)
+            state.dirs_scanned += 1
+            state.entries_seen += len(files) + len(subdirs)
+            state.ignored += ignored
+        for sub in subdirs:
+            self.executor().submit(self._walk_dir, state, sub)
+
+        files.sort(key=lambda e: e.name.lower())
+        matches = filter_entries(files, state.query, cancelled)
+        if matches and not cancelled():
+            self.results.put(WalkBatch(state.generation, matches))
+
+
+def relative_folder(root: str, path: str) -> str:
+    """Folder of ``path`` relative to ``root`` ('' for files directly in it)."""
+    folder = os.path.relpath(os.path.dirname(path), root)
+    return "" if folder == os.curdir else folder
@@ -0,0 +1,182 @@
+"""
+Slow FS - Names-first listings for folders on slow (network) filesystems.
+
+On SMB/NFS mounts a single stat can take milliseconds to seconds, so a
+listing that stats every file holds the panel up for the whole folder.
+SlowPaths keeps a moving average of the per-call latency measured for
+each folder (by the scanner and by StatFiller) and reports a folder as
+slow when it, or its nearest measured ancestor, is over SLOW_CALL_SECONDS;
+folders can also be marked slow in the config ("slow_paths"). Slow folders
+are listed without stat'ing files, and StatFiller fills sizes and dates
+in afterwards from a small shared pool. A stat that has not returned
+after STAT_TIMEOUT_SECONDS is reported as timed out so the row can say
+"unavailable" (a hung call cannot be interrupted, but nothing waits on it).
+Once hung calls hold every worker nothing queued behind them starts, so
+when no stat of a fill has come back for STAT_TIMEOUT_SECONDS the ones
+not started yet time out too.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services.directory_scanner import MTIME_UNAVAILABLE, FileEntry
+
+
+class SlowPaths:
+    """Process-wide latency record of the folders that have been listed."""
+
+    # Average seconds per filesystem call above which a folder is slow
+    SLOW_CALL_SECONDS = 0.005
+
+    # Weight of the newest measurement in the moving average
+    SMOOTHING = 0.5
+
+    _latency: Dict[str, float] = {}
+    _forced = frozenset()
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, forced: Optional[Iterable[str]] = None) -> None:
+        """Folders (and everything below them) always treated as slow."""
+        with cls._lock:
+            cls._forced = frozenset(os.path.normpath(p) for p in forced or ())
+
+    @classmethod
+    def record(cls, path: str, seconds: float, calls: int = 1) -> None:
+        """Fold a measurement of ``calls`` filesystem calls under ``path`` in."""
+        path = os.path.normpath(path)
+        sample = seconds / max(1, calls)
+        with cls._lock:
+            old = cls._latency.get(path)
+            cls._latency[path] = sample if old is None else old + cls.SMOOTHING * (sample - old)
+
+    @classmethod
+    def is_slow(cls, path: str) -> bool:
+        """Whether ``path`` or its nearest measured ancestor is slow."""
+        path = os.path.normpath(path)
+        with cls._lock:
+            while True:
+                if path in cls._forced:
+                    return True
+                latency = cls._latency.get(path)
+                if latency is not None:
+                    return latency > cls.SLOW_CALL_SECONDS
+                parent = os.path.dirname(path)
+                if parent == path:
+                    return False
+                path = parent
+
+    @classmethod
+    def forget(cls) -> None:
+        with cls._lock:
+            cls._latency.clear()
+
+
+class StatFiller:
+    """Per-panel front end to the shared pool that stats files off-listing."""
+
+    MAX_WORKERS = 8
+    STAT_TIMEOUT_SECONDS = 3.0
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Shared pool for all panels, created on first use."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.MAX_WORKERS, thread_name_prefix="stat")
+            return cls._executor
+
+    def __init__(self):
+        self.generation = 0
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self._outstanding: Dict[int, FileEntry] = {}   # id(entry) -> entry
+        self._started: Dict[int, float] = {}           # id(entry) -> start time
+        self._progress = 0.0                            # fill or last answer
+
+    def fill(self, entries: Iterable[FileEntry]) -> int:
+        """Stat ``entries`` (most wanted first); earlier requests are dropped.
+
+        Returns:
+            How many stats were queued
+        """
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+            self._outstanding = {id(e): e for e in entries}
+            self._started = {}
+            self._progress = time.perf_counter()
+            todo = list(self._outstanding.values())
+        for entry in todo:
+            self.executor().submit(self._run, generation, entry)
+        return len(todo)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._outstanding = {}
+            self._started = {}
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._outstanding)
+
+    def poll(self, now: Optional[float] = None) -> Tuple[List[Tuple[FileEntry, int, int]], List[FileEntry]]:
+        """Stats finished since the last poll, and stats that timed out.
+
+        Must be called from the Tk thread. Timed-out entries are no longer
+        waited for; a late answer is still returned by a later poll.
+
+        Returns:
+            ([(entry, size, mtime_ns)], [entry])
+        """
+        done = []
+        while True:
+            try:
+                generation, entry, size, mtime_ns = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.generation:
+                done.append((entry, size, mtime_ns))
+
+        now = time.perf_counter() if now is None else now
+        timed_out = []
+        with self._lock:
+            if done:
+                self._progress = now
+            for entry, _, _ in done:
+                self._outstanding.pop(id(entry), None)
+                self._started.pop(id(entry), None)
+            for key, started in list(self._started.items()):
+                if now - started >= self.STAT_TIMEOUT_SECONDS:
+                    timed_out.append(self._outstanding.pop(key))
+                    del self._started[key]
+            if self._outstanding and now - self._progress >= self.STAT_TIMEOUT_SECONDS:
+                # Nothing answered for a while: the pool is stuck on hung
+                # calls, and the entries still queued would never start
+                timed_out.extend(self._outstanding.values())
+                self._outstanding = {}
+                self._started = {}
+        return done, timed_out
+
+    def _run(self, generation: int, entry: FileEntry) -> None:
+        key = id(entry)
+        with self._lock:
+            if generation != self.generation or key not in self._outstanding:
+                return
+            started = self._started[key] = time.perf_counter()
+        try:
+            st = os.stat(entry.path)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            size, mtime_ns = 0, MTIME_UNAVAILABLE
+        SlowPaths.record(os.path.dirname(entry.path), time.perf_counter() - started)
+        self.results.put((generation, entry, size, mtime_ns))
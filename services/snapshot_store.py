@@ -0,0 +1,136 @@
+"""
+Snapshot Store - Last-known folder listings persisted between runs.
+
+At startup each panel draws the listing it showed last time from a small
+file under ``get_app_data_dir()`` instead of waiting for its (possibly
+network) folder to be scanned, then revalidates it in the background.
+Snapshots are gzip-compressed JSON rows of (name, is_dir, size, mtime_ns)
+written atomically on a single background thread. Folders longer than
+MAX_ENTRIES are not persisted, and only the MAX_FILES most recently
+saved snapshots are kept.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from config.manager import get_app_data_dir
+from services.directory_scanner import FileEntry
+
+
+FORMAT_VERSION = 1
+
+
+def snapshot_name(path: str) -> str:
+    """File name of the snapshot for ``path``."""
+    return hashlib.sha1(os.path.normcase(path).encode("utf-8", "surrogatepass")).hexdigest() + ".json.gz"
+
+
+class SnapshotStore:
+    """Static methods for loading and saving listing snapshots."""
+
+    MAX_ENTRIES = 50000
+    MAX_FILES = 200
+
+    # Overridable for tests; defaults to <app data>/listing_snapshots
+    directory = None
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def snapshot_dir(cls) -> str:
+        if cls.directory is None:
+            cls.directory = os.path.join(get_app_data_dir(), "listing_snapshots")
+        os.makedirs(cls.directory, exist_ok=True)
+        return cls.directory
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Single writer thread, so saves of one folder land in order."""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot")
+            return cls._executor
+
+    @classmethod
+    def load(cls, path: str) -> Optional[List[FileEntry]]:
+        """Return the last saved listing of ``path``, or None.
+
+        Only reads the local app data directory, never ``path`` itself,
+        so it is safe to call on the Tk thread.
+        """
+        try:
+            with gzip.open(os.path.join(cls.snapshot_dir(), snapshot_name(path)), "rt",
+                           encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, EOFError, ValueError):
+            return None
+        if data.get("version") != FORMAT_VERSION or data.get("path") != path:
+            return None
+        try:
+            return [FileEntry(name, os.path.join(path, name), bool(is_dir), size, mtime_ns)
+                    for name, is_dir, size, mtime_ns in data["rows"]]
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def save(cls, path: str, entries: List[FileEntry]) -> bool:
+        """Write the snapshot of ``path`` now (blocking).
+
+        Returns:
+            True if a snapshot was written
+        """
+        if len(entries) > cls.MAX_ENTRIES:
+            cls.discard(path)
+            return False
+        data = {
+            "version": FORMAT_VERSION,
+            "path": path,
+            "rows": [[e.name, int(e.is_dir), e.size, e.mtime_ns] for e in entries],
+        }
+        target = os.path.join(cls.snapshot_dir(), snapshot_name(path))
+        tmp = target + ".tmp"
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=1) as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, target)
+        except OSError as e:
+            print(f"Error saving listing snapshot for {path}: {e}")
+            return False
+        cls._prune()
+        return True
+
+    @classmethod
+    def save_async(cls, path: str, entries: List[FileEntry]) -> None:
+        """Queue save() on the writer thread."""
+        cls.executor().submit(cls.save, path, entries)
+
+    @classmethod
+    def discard(cls, path: str) -> None:
+        """Delete the snapshot of ``path`` if there is one."""
+        try:
+            os.remove(os.path.join(cls.snapshot_dir(), snapshot_name(path)))
+        except OSError:
+            pass
+
+    @classmethod
+    def _prune(cls) -> None:
+        """Delete the oldest snapshots beyond MAX_FILES."""
+        folder = cls.snapshot_dir()
+        try:
+            files = [e for e in os.scandir(folder) if e.name.endswith(".json.gz")]
+        except OSError:
+            return
+        if len(files) <= cls.MAX_FILES:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime_ns)
+        for entry in files[:len(files) - cls.MAX_FILES]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,202 @@
+"""
+Text Search - Whole-file, case-insensitive search of text files.
+
+Content search used to read the first 10,000 characters of each file in
+text mode and lower-case them, so matches further into a large log were
+never found. search_file() memory-maps the file instead (up to a size
+ceiling, MAX_FILE_BYTES by default) and searches the raw bytes: the term
+is encoded the way the file is (UTF-8, or UTF-16 when the file starts
+with a BOM or looks like it), the file is lower-cased CHUNK_BYTES at a
+time with an ASCII table and scanned with bytes.find, and candidates are
+confirmed with a case-insensitive byte pattern. Terms with non-ASCII
+letters are searched with the byte pattern alone. Each match carries its
+line number and a snippet of the line. Office documents are searched in
+their extracted text (services/office_text.py).
+"""
+
+import codecs
+import mmap
+import os
+import re
+import string
+from functools import lru_cache
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from services.office_text import OFFICE_EXTS, OfficeText
+
+
+# Bytes of each file that are searched
+MAX_FILE_BYTES = 4 * 1024 * 1024 * 1024
+
+# Bytes lower-cased and scanned at a time (even, so UTF-16 stays aligned)
+CHUNK_BYTES = 256 * 1024
+
+# Longest snippet returned with a match
+SNIPPET_CHARS = 120
+
+_ASCII_LOWER = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+class TextMatch(NamedTuple):
+    """One occurrence of the term in a file."""
+    offset: int    # Byte offset in the file
+    line: int      # 1-based line number
+    snippet: str   # The line around the match
+
+
+class _Needle:
+    """A term encoded for one file encoding."""
+
+    def __init__(self, term: str, encoding: str):
+        self.width = 2 if encoding.startswith("utf-16") else 1
+        self.pattern = re.compile(b"".join(_char_pattern(c, encoding) for c in term))
+        # ASCII terms are found in lower-cased blocks with bytes.find; in
+        # UTF-8 that is exact, in UTF-16 the hits still need confirming
+        self.lowered = term.lower().encode(encoding) if term.isascii() else None
+        self.exact = self.width == 1
+
+
+def _char_pattern(char: str, encoding: str) -> bytes:
+    """Byte pattern matching ``char`` in any case."""
+    forms = sorted({form.encode(encoding, errors="ignore")
+                    for form in (char, char.lower(), char.upper())} - {b""})
+    if all(len(form) == 1 for form in forms):
+        return b"[" + b"".join(re.escape(form) for form in forms) + b"]"
+    return b"(?:" + b"|".join(re.escape(form) for form in forms) + b")"
+
+
+@lru_cache(maxsize=32)
+def _needle(term: str, encoding: str) -> _Needle:
+    return _Needle(term, encoding)
+
+
+def detect_encoding(head: bytes) -> Tuple[str, int]:
+    """Codec and BOM length of a file, from its first bytes."""
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8", 3
+    if head.startswith(codecs.BOM_UTF16_LE):
+        return "utf-16-le", 2
+    if head.startswith(codecs.BOM_UTF16_BE):
+        return "utf-16-be", 2
+    # UTF-16 without a BOM: mostly-ASCII text has a zero in every other byte
+    even, odd = head[0::2], head[1::2]
+    if len(odd) >= 8:
+        if odd.count(0) > len(odd) * 0.4 and even.count(0) < len(even) * 0.05:
+            return "utf-16-le", 0
+        if even.count(0) > len(even) * 0.4 and odd.count(0) < len(odd) * 0.05:
+            return "utf-16-be", 0
+    return "utf-8", 0
+
+
+def search_file(path: str, term: str, max_matches: int = 1,
+                limit: Optional[int] = None) -> List[TextMatch]:
+    """Find ``term`` in a text file, ignoring case.
+
+    Args:
+        path: File to search
+        term: Text to look for
+        max_matches: Stop after this many matches
+        limit: Bytes of the file searched (default MAX_FILE_BYTES)
+
+    Returns:
+        The first ``max_matches`` matches, in file order
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    if not term:
+        return []
+    if os.path.splitext(path)[1].lower() in OFFICE_EXTS:
+        return search_buffer(OfficeText.get(path).encode("utf-8"), term, max_matches)
+    with open(path, "rb") as f:
+        length = min(os.fstat(f.fileno()).st_size, limit or MAX_FILE_BYTES)
+        if length <= 0:
+            return []
+        try:
+            buf = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Not mappable (some network and virtual files)
+            buf = f.read(length)
+        try:
+            return search_buffer(buf, term, max_matches)
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+
+def search_buffer(buf: Buffer, term: str, max_matches: int = 1) -> List[TextMatch]:
+    """search_file() over bytes already in memory (or mapped)."""
+    encoding, start = detect_encoding(buf[:512])
+    needle = _needle(term, encoding)
+    end = len(buf)
+    matches = []
+    line, counted = 1, start
+    for offset in _find(buf, start, end, needle):
+        line += _count_lines(buf, counted, offset, encoding)
+        counted = offset
+        matches.append(TextMatch(offset, line, _snippet(buf, start, end, offset, encoding)))
+        if len(matches) >= max_matches:
+            break
+    return matches
+
+
+def _find(buf: Buffer, start: int, end: int, needle: _Needle) -> Iterator[int]:
+    """Offsets of non-overlapping matches in ``buf[start:end]``."""
+    if needle.lowered is None:
+        pos = start
+        while True:
+            match = needle.pattern.search(buf, pos, end)
+            if match is None:
+                return
+            if (match.start() - start) % needle.width == 0:
+                yield match.start()
+                pos = match.end()
+            else:
+                pos = match.start() + 1
+
+    lowered = needle.lowered
+    resume = start
+    for pos in range(start, end, CHUNK_BYTES):
+        # Overlap the next chunk so matches across the boundary are seen
+        block = buf[pos:min(end, pos + CHUNK_BYTES + len(lowered) - 1)].translate(_ASCII_LOWER)
+        i = block.find(lowered, max(0, resume - pos))
+        while 0 <= i < CHUNK_BYTES:
+            offset = pos + i
+            if (offset - start) % needle.width == 0 and (
+                    needle.exact or needle.pattern.match(buf, offset, end)):
+                yield offset
+                resume = offset + len(lowered)
+                i = block.find(lowered, i + len(lowered))
+            else:
+                i = block.find(lowered, i + 1)
+
+
+def _count_lines(buf: Buffer, start: int, stop: int, encoding: str) -> int:
+    """Line breaks in ``buf[start:stop]``, a chunk at a time."""
+    count = 0
+    for pos in range(start, stop, CHUNK_BYTES):
+        block = buf[pos:min(pos + CHUNK_BYTES, stop)]
+        if encoding == "utf-8":
+            count += block.count(b"\n")
+        else:
+            count += block.decode(encoding, errors="ignore").count("\n")
+    return count
+
+
+def _snippet(buf: Buffer, start: int, end: int, offset: int, encoding: str) -> str:
+    """The line around ``offset``, shortened to SNIPPET_CHARS."""
+    # Even, so UTF-16 windows start on a character
+    window = SNIPPET_CHARS * 4
+    head = buf[max(start, offset - window):offset].decode(encoding, errors="ignore")
+    tail = buf[offset:min(end, offset + window)].decode(encoding, errors="ignore")
+    head = head.rsplit("\n", 1)[-1].lstrip()
+    tail = tail.split("\n", 1)[0].rstrip()
+    keep = SNIPPET_CHARS // 3
+    if len(head) > keep:
+        head = "…" + head[-keep:]
+    text = head + tail
+    if len(text) > SNIPPET_CHARS:
+        text = text[:SNIPPET_CHARS] + "…"
+    return text
@@ -0,0 +1,137 @@
+"""
+Tree Loader - Background listings for the nodes of the expandable tree.
+
+In tree mode a folder row's children are only listed when the row is
+expanded. NodeLoader runs those listings on the listing pool, one
+generation counter per folder so reloading one node never drops another
+node's pending result. NodeBudget decides which collapsed subtrees to
+unload once the rows they hold exceed a budget, least recently
+collapsed first.
+"""
+
+import os
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from services.listing_cache import ListingCache
+from services.listing_filter import ListingQuery, filter_entries
+from services.listing_worker import ListingResult, ListingWorker
+
+
+class NodeLoader:
+    """Per-panel loader for expanded folder nodes."""
+
+    def __init__(self):
+        self.results = queue.Queue()
+        self._generations: Dict[str, int] = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, query: ListingQuery) -> int:
+        """Queue a listing of ``path``; an older request for it becomes stale."""
+        with self._lock:
+            self._counter += 1
+            generation = self._generations[path] = self._counter
+        ListingWorker.executor().submit(self._run, generation, path, query)
+        return generation
+
+    def cancel(self, path: Optional[str] = None) -> None:
+        """Forget the pending request for ``path``, or all of them."""
+        with self._lock:
+            if path is None:
+                self._generations.clear()
+            else:
+                self._generations.pop(path, None)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._generations)
+
+    def is_current(self, path: str, generation: int) -> bool:
+        return self._generations.get(path) == generation
+
+    def poll(self) -> List[ListingResult]:
+        """Current results that arrived since the last poll.
+
+        Must be called from the Tk thread.
+        """
+        found = []
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                if self._generations.get(result.path) != result.generation:
+                    continue
+                del self._generations[result.path]
+            found.append(result)
+        return found
+
+    def _run(self, generation: int, path: str, query: ListingQuery) -> None:
+        if not self.is_current(path, generation):
+            return
+        try:
+            listing = ListingCache.scan(path, query.ignore)
+        except OSError as e:
+            self.results.put(ListingResult(generation, path, query, error=e))
+            return
+        entries = filter_entries(listing, query, lambda: not self.is_current(path, generation))
+        if entries is not None:
+            self.results.put(ListingResult(generation, path, query, entries, listing,
+                                           ignored=listing.ignored))
+
+
+def is_within(path: str, folder: str) -> bool:
+    """True if ``path`` is ``folder`` or below it."""
+    return path == folder or path.startswith(folder.rstrip(os.sep) + os.sep)
+
+
+class NodeBudget:
+    """Tracks loaded nodes and picks collapsed subtrees to unload."""
+
+    MAX_COLLAPSED_ROWS = 20000
+
+    def __init__(self, max_collapsed_rows: Optional[int] = None):
+        self.max_collapsed_rows = max_collapsed_rows or self.MAX_COLLAPSED_ROWS
+        self.rows: Dict[str, int] = {}            # loaded node -> child rows
+        self.collapsed: "OrderedDict[str, None]" = OrderedDict()   # oldest first
+
+    def loaded(self, path: str, rows: int) -> None:
+        self.rows[path] = rows
+
+    def expanded(self, path: str) -> None:
+        self.collapsed.pop(path, None)
+
+    def closed(self, path: str) -> None:
+        self.collapsed[path] = None
+        self.collapsed.move_to_end(path)
+
+    def forget(self, path: str) -> None:
+        """Drop ``path`` and everything below it (its rows were deleted)."""
+        for table in (self.rows, self.collapsed):
+            for key in [k for k in table if is_within(k, path)]:
+                del table[key]
+
+    def subtree_rows(self, path: str) -> int:
+        return sum(n for p, n in self.rows.items() if is_within(p, path))
+
+    def to_unload(self) -> List[str]:
+        """Collapsed nodes to unload, oldest first, to get within budget.
+
+        Only the outermost collapsed nodes count: a collapsed node inside
+        another collapsed node is already hidden with it.
+        """
+        outer = [p for p in self.collapsed
+                 if not any(q != p and is_within(p, q) for q in self.collapsed)]
+        sizes = {p: self.subtree_rows(p) for p in outer}
+        hidden = sum(sizes.values())
+        victims = []
+        for path in outer:
+            if hidden <= self.max_collapsed_rows:
+                break
+            victims.append(path)
+            hidden -= sizes[path]
+        return victims
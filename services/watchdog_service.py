@@ -1,7 +1,46 @@
+import threading
 import time
 from watchdog.events import FileSystemEventHandler
 
 class FolderChangeHandler(FileSystemEventHandler):
-    def __init__(self, callback): self.callback = callback; self.last_refresh = 0
+    """Calls back at most once per INTERVAL_S, and always after the last event.
+
+    The first event after a quiet spell calls back at once; events within
+    INTERVAL_S of that call are folded into one more call at the end of
+    the interval, so a change that lands right after a refresh (a file
+    rewritten in place leaves the folder's mtime alone) is not lost.
+    """
+    INTERVAL_S = 1.0
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.last_refresh = 0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def on_any_event(self, event):
+        with self._lock:
+            if self._timer is not None:
+                return  # the trailing call will see this event too
+            wait = self.last_refresh + self.INTERVAL_S - time.time()
+            if wait > 0:
+                self._timer = threading.Timer(wait, self._trailing)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+            self.last_refresh = time.time()
+        self.callback()
+
+    def _trailing(self):
+        with self._lock:
+            self._timer = None
+            self.last_refresh = time.time()
+        self.callback()
+
+class TreeChangeHandler(FileSystemEventHandler):
+    """Passes the path of every event (both paths of a move) to the callback."""
+    def __init__(self, callback): self.callback = callback
     def on_any_event(self, event):
-        if time.time() - self.last_refresh > 1.0: self.callback(); self.last_refresh = time.time()
+        self.callback(event.src_path)
+        dest = getattr(event, "dest_path", "")
+        if dest: self.callback(dest)
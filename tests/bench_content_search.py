@@ -0,0 +1,78 @@
+"""
+Benchmark: read-and-lower vs mmap byte search over a large log file.
+
+Writes a log of the given size with one match near the end, then finds
+it both ways: the old approach opens the file in text mode, reads it and
+searches the lower-cased text (run over the whole file here rather than
+the first 10,000 characters, so both find the match); the new one is
+text_search.search_file(). Each is run once to warm the page cache and
+then timed. A non-ASCII term and a UTF-16 copy of the file are timed
+too, since those take the byte-pattern path.
+
+Usage:
+    python tests/bench_content_search.py [megabytes]   (default: 256)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.text_search import search_file
+
+
+LINE = "2024-05-01 12:00:00 INFO worker-3 processed request id=12345 in 3 ms status=OK\n"
+
+
+def write_log(path, size, encoding="utf-8", tail="ERROR Größenüberschreitung NeedleInTheHaystack\n"):
+    block = LINE * (1024 * 1024 // len(LINE))
+    with open(path, "w", encoding=encoding) as f:
+        written = 0
+        while written < size:
+            f.write(block)
+            written += len(block)
+        f.write(tail)
+
+
+def read_and_lower(path, term):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return term in f.read().lower()
+
+
+def timed(fn):
+    fn()
+    start = time.perf_counter()
+    found = fn()
+    return found, time.perf_counter() - start
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    test_dir = tempfile.mkdtemp()
+    try:
+        utf8 = os.path.join(test_dir, "big.log")
+        utf16 = os.path.join(test_dir, "big16.log")
+        write_log(utf8, megabytes * 1024 * 1024)
+        write_log(utf16, megabytes * 1024 * 1024 // 2, encoding="utf-16")
+        print(f"{megabytes} MB log, match at the end")
+
+        cases = [
+            ("read + lower", utf8, lambda: read_and_lower(utf8, "needleinthehaystack")),
+            ("mmap, ASCII term", utf8, lambda: bool(search_file(utf8, "needleinthehaystack"))),
+            ("mmap, non-ASCII term", utf8, lambda: bool(search_file(utf8, "größenüberschreitung"))),
+            ("mmap, UTF-16", utf16, lambda: bool(search_file(utf16, "needleinthehaystack"))),
+        ]
+        print(f"{'approach':<22} {'found':>6} {'time (ms)':>10} {'GB/s':>7}")
+        for label, path, fn in cases:
+            found, seconds = timed(fn)
+            rate = os.path.getsize(path) / seconds / 1e9
+            print(f"{label:<22} {str(found):>6} {seconds * 1000:>10.1f} {rate:>7.2f}")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: Go to file queries over a large synthetic name index.
+
+Builds a FuzzyIndex from the given number of made-up file names (office
+words, made-up words, numbers and extensions) and times the top 50
+matches for a set of queries, each typed from scratch and run cold, then
+each query typed one character at a time (every keystroke reusing the
+previous result, as the palette does). For comparison the old way of
+matching, a case-insensitive regular expression tried against every name,
+is timed once per query. The target is 30 ms per query at a million
+names.
+
+Usage:
+    python tests/bench_goto_index.py [names]   (default: 1000000)
+"""
+
+import gc
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.goto_index import FuzzyIndex
+
+
+WORDS = ["report", "budget", "invoice", "draft", "final", "summary", "meeting", "notes", "plan",
+         "data", "export", "backup", "image", "scan", "contract", "proposal", "minutes", "q1", "q2",
+         "q3", "q4", "2022", "2023", "2024", "v2", "copy", "Customer", "Sales", "HR"]
+SYLLABLES = ["ka", "lo", "mi", "ter", "zan", "pol", "ri", "vex", "dun", "sa", "bri", "ox", "gle"]
+EXTS = [".txt", ".docx", ".xlsx", ".pdf", ".png", ".log", ".md", ".py", ".csv", ".pptx"]
+
+QUERIES = ["r", "rep", "report", "rpt", "bdgtfnl", "invoice_2023", "meetingnotes", "cust sales",
+           "kalo", "xq", "q1q2q3", "zzzz", "12345.pdf", "budget final"]
+
+
+def make_files(count, seed=1):
+    rng = random.Random(seed)
+    files = []
+    for i in range(count):
+        parts = [rng.choice(WORDS) if rng.random() < 0.7
+                 else "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+                 for _ in range(rng.randint(1, 4))]
+        name = rng.choice("_ -").join(parts) + f"_{rng.randint(0, 99999)}" + rng.choice(EXTS)
+        files.append((name, f"/data/project{i % 997}/sub{i % 13}"))
+    return files
+
+
+def regex_scan(names, query, limit=50):
+    pattern = re.compile(".*?".join(re.escape(c) for c in query if not c.isspace()), re.IGNORECASE)
+    return sorted((n for n in names if pattern.search(n)), key=len)[:limit]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    files = make_files(count)
+    start = time.perf_counter()
+    index = FuzzyIndex(files)
+    print(f"{count:,} names, index built in {time.perf_counter() - start:.1f} s")
+    gc.collect()
+
+    print(f"{'query':<16} {'found':>6} {'index (ms)':>11} {'per keystroke, max (ms)':>24} {'regex scan (ms)':>16}")
+    worst = 0.0
+    for query in QUERIES:
+        start = time.perf_counter()
+        result = index.search(query)
+        cold = (time.perf_counter() - start) * 1000
+
+        previous, typed = None, []
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            previous = index.search(query[:end], previous=previous)
+            typed.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        regex_scan(index.names, query)
+        scan = (time.perf_counter() - start) * 1000
+        worst = max(worst, cold)
+        print(f"{query:<16} {len(result.matches):>6} {cold:>11.1f} {max(typed):>24.1f} {scan:>16.0f}")
+    print(f"slowest cold query: {worst:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
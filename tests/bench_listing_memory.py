@@ -0,0 +1,83 @@
+"""
+Benchmark: memory held by a panel's listing model, per entry.
+
+Compares the previous layout (a dict of path -> RowRecord plus the
+(name, size_str, date_str, size) tuples handed to the analytics bar)
+with ListingColumns (typed arrays, interned extensions, the lazily built
+path index included). The scanned FileEntry objects and their name/path
+strings are shared with the listing cache in both layouts, so they are
+created before measuring and not counted.
+
+Usage:
+    python tests/bench_listing_memory.py [entries]   (default: 200000)
+"""
+
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import FileEntry
+from services.listing_columns import ListingColumns, RowRecord
+
+EXTS = [".pdf", ".xlsx", ".docx", ".txt", ".jpg", ".csv", ".py", ".zip"]
+
+
+def make_entries(count):
+    rng = random.Random(5)
+    entries = []
+    for i in range(count):
+        if i % 50 == 0:
+            name = f"Folder {i}"
+            entries.append(FileEntry(name, f"/data/{name}", True))
+        else:
+            name = f"Document {i} rev{rng.randint(1, 9)}{rng.choice(EXTS)}"
+            entries.append(FileEntry(name, f"/data/{name}", False, rng.randint(0, 10 ** 8),
+                                     1_700_000_000_000_000_000 + rng.randint(0, 10 ** 16)))
+    return entries
+
+
+def previous_layout(entries):
+    records = {}
+    files_data = []
+    for entry in entries:
+        records[entry.path] = RowRecord.from_entry(entry)
+        if not entry.is_dir:
+            files_data.append((entry.name, entry.size_str, entry.mod_str, entry.size))
+    return records, files_data
+
+
+def columnar_layout(entries):
+    listing = ListingColumns.from_entries(entries)
+    listing.index  # built on first render
+    return listing
+
+
+def measure(build, entries):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    model = build(entries)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del model
+    return held
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    entries = make_entries(count)
+    print(f"{count} entries (FileEntry objects shared, not counted)")
+    print(f"{'layout':<26} {'total (MB)':>11} {'bytes/entry':>12}")
+    for label, build in (("records + files_data", previous_layout),
+                         ("ListingColumns", columnar_layout)):
+        held = measure(build, entries)
+        print(f"{label:<26} {held / 1048576:>11.1f} {held / count:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
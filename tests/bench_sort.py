@@ -0,0 +1,102 @@
+"""
+Benchmark: display-string sort with per-row moves vs typed ListingSorter.
+
+Builds a 100k-row listing in a tree, then sorts it by size both ways:
+the old approach reads each row's text back, parses "x.xx MB" and calls
+tree.move per row; the new one sorts ListingColumns by bytes with cached
+natural name keys and applies the order through TreeSync (one
+set_children call). The typed sort is timed cold (name keys computed)
+and warm (after a refresh, keys cached). Uses a real ttk.Treeview when a
+display is available, otherwise the recording tree (the old approach's
+per-row moves are then counted but not timed).
+
+Usage:
+    python tests/bench_sort.py [rows]   (default: 100000)
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_tree_diff import make_tree
+from services.directory_scanner import FileEntry
+from services.listing_sort import ListingSorter, SortState
+from services.listing_columns import ListingColumns
+from ui.row_model import item_options
+from ui.tree_sync import TreeSync
+
+
+def make_records(count):
+    rng = random.Random(3)
+    entries = []
+    for i in range(count):
+        name = f"Report {rng.randint(1, 5000)} part{i}.txt"
+        entries.append(FileEntry(name, f"/data/{name}", False, rng.randint(0, 10 ** 9),
+                                 1_700_000_000_000_000_000 + rng.randint(0, 10 ** 15)))
+    return ListingColumns.from_entries(entries)
+
+
+def read_cell(tree, iid, col):
+    """tree.set(iid, col), also for the recording tree."""
+    if hasattr(tree, "set"):
+        return tree.set(iid, col)
+    return tree.items[iid]["values"][("size", "date").index(col)]
+
+
+def legacy_sort(tree, col, reverse):
+    """The old FolderCard._sort_tree."""
+    items = [(read_cell(tree, k, col) if col != "#0" else tree.item(k, "text"), k)
+             for k in tree.get_children('')]
+    if col == "size":
+        items.sort(key=lambda x: float(x[0].split()[0]) if x[0] else 0, reverse=reverse)
+    else:
+        items.sort(key=lambda x: x[0].lower(), reverse=reverse)
+    if not hasattr(tree, "set"):
+        # The recording tree's list-backed move() is O(n); count the
+        # per-row moves instead of timing them
+        tree.calls += len(items)
+        return
+    for i, (_, k) in enumerate(items):
+        tree.move(k, '', i)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = make_records(count)
+    render = lambda key: item_options(rows[key])
+    tree, kind = make_tree()
+    print(f"{count} rows, sort by size, using {kind}")
+
+    results = []
+    sync = TreeSync(tree)
+    sync.apply(rows, render)
+    tree.calls = 0
+    start = time.perf_counter()
+    legacy_sort(tree, "size", False)
+    results.append(("display text", None, time.perf_counter() - start, tree.calls))
+    sync.adopt_tree_order()
+
+    sync.apply(rows, render)
+    sorter = ListingSorter(SortState("size", True))
+    for label in ("typed, cold", "typed, warm"):
+        tree.calls = 0
+        start = time.perf_counter()
+        ordered = sorter.sorted_rows(rows)
+        sorted_at = time.perf_counter()
+        sync.apply(ordered, lambda key: item_options(ordered[key]))
+        results.append((label, sorted_at - start, time.perf_counter() - start, tree.calls))
+        # A refresh arrives in scan order again
+        sync.apply(rows, render)
+
+    print(f"{'approach':<14} {'sort (ms)':>10} {'total (ms)':>11} {'tree calls':>11}")
+    for label, sort_s, total_s, calls in results:
+        sort_ms = f"{sort_s * 1000:.1f}" if sort_s is not None else "-"
+        print(f"{label:<14} {sort_ms:>10} {total_s * 1000:>11.1f} {calls:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: delete-all/insert-all refresh vs TreeSync diff refresh.
+
+Fills a Treeview with a 50k-row listing, changes one file and refreshes
+both ways, reporting wall time and the number of Treeview calls (each one
+a Tcl round-trip). Uses a real ttk.Treeview when a display is available,
+otherwise the recording tree from test_listing_diff (calls only).
+
+Usage:
+    python tests/bench_tree_diff.py [rows]   (default: 50000)
+"""
+
+import os
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ui.tree_sync import TreeSync
+
+
+class CountingTree:
+    """Forwards the item API to a real Treeview, counting calls."""
+
+    def __init__(self, tree):
+        self._tree = tree
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._tree, name)
+        if name in ("insert", "delete", "item", "move", "set_children", "get_children"):
+            def counted(*args, **kwargs):
+                self.calls += 1
+                return attr(*args, **kwargs)
+            return counted
+        return attr
+
+
+def make_tree():
+    try:
+        root = tk.Tk()
+        root.withdraw()
+        tree = ttk.Treeview(root, columns=("size", "date"))
+        return CountingTree(tree), "ttk.Treeview"
+    except tk.TclError:
+        from test_listing_diff import RecordingTree
+        return RecordingTree(), "recording tree (no display)"
+
+
+def make_listing(count, changed=None):
+    rows = {}
+    for i in range(count):
+        key = f"/data/file_{i:06d}.txt"
+        rows[key] = (False, i, 1_700_000_000_000_000_000 + i, None, False)
+    if changed:
+        rows[changed] = (False, -1, 0, "red", False)
+    return rows
+
+
+def render(key, rows):
+    sig = rows[key]
+    return {"text": os.path.basename(key), "values": [f"{sig[1] / 1048576:.2f} MB", str(sig[2])]}
+
+
+def full_rebuild(tree, rows):
+    children = tree.get_children()
+    for item in children:
+        tree.delete(item)
+    for key in rows:
+        tree.insert("", "end", **render(key, rows))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    base = make_listing(count)
+    changed_key = f"/data/file_{count // 2:06d}.txt"
+    edited = make_listing(count, changed_key)
+
+    tree, kind = make_tree()
+    print(f"{count} rows, one file changed, using {kind}")
+
+    full_rebuild(tree, base)
+    tree.calls = 0
+    start = time.perf_counter()
+    full_rebuild(tree, edited)
+    full_t = time.perf_counter() - start
+    full_calls = tree.calls
+
+    full_rebuild(tree, {})
+    sync = TreeSync(tree)
+    sync.apply(base, lambda k: render(k, base))
+    tree.calls = 0
+    start = time.perf_counter()
+    diff = sync.apply(edited, lambda k: render(k, edited))
+    diff_t = time.perf_counter() - start
+
+    print(f"{'approach':<14} {'time (ms)':>10} {'tree calls':>11} {'rows touched':>13}")
+    print(f"{'delete/insert':<14} {full_t * 1000:>10.1f} {full_calls:>11} {count * 2:>13}")
+    print(f"{'diff':<14} {diff_t * 1000:>10.1f} {tree.calls:>11} {diff.touched:>13}")
+
+
+if __name__ == '__main__':
+    main()
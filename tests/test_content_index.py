@@ -0,0 +1,130 @@
+"""
+Unit tests for the ContentIndex.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.content_index import ContentIndex, read_text
+from services.directory_scanner import DirectoryScanner
+from services.listing_filter import ListingQuery, filter_entries
+
+
+def settle():
+    """Wait for the indexer thread to finish what is queued."""
+    ContentIndex.executor().submit(lambda: None).result(timeout=10)
+
+
+class TestContentIndex(unittest.TestCase):
+    """Tests for ContentIndex lookups and incremental indexing."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.files = os.path.join(self.test_dir, "files")
+        os.makedirs(self.files)
+        self.write("report.txt", "intro\n" + "x" * 20000 + "\nquarterly NUMBERS")
+        self.write("notes.md", "nothing here")
+        for patcher in (patch.object(ContentIndex, "path", os.path.join(self.test_dir, "index.sqlite3")),
+                        patch.object(ContentIndex, "_local", threading.local()),
+                        patch.object(ContentIndex, "_available", None),
+                        patch.object(ContentIndex, "enabled", True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        if not ContentIndex.available():
+            self.skipTest("SQLite without the FTS5 trigram tokenizer")
+
+    def tearDown(self):
+        settle()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write(self, name, text):
+        with open(os.path.join(self.files, name), 'w') as f:
+            f.write(text)
+
+    def entries(self):
+        return DirectoryScanner.scan(self.files)
+
+    def test_unindexed_files_are_queued(self):
+        self.assertEqual(ContentIndex.lookup(self.entries(), "numbers"), {})
+        settle()
+        self.assertEqual(ContentIndex.stats()["files"], 2)
+
+    def test_answers_past_the_read_limit(self):
+        ContentIndex.lookup(self.entries(), "numbers")
+        settle()
+        answers = ContentIndex.lookup(self.entries(), "numbers")
+        self.assertEqual(answers, {os.path.join(self.files, "report.txt"): True,
+                                   os.path.join(self.files, "notes.md"): False})
+
+    def test_changed_file_is_not_trusted(self):
+        ContentIndex.lookup(self.entries(), "numbers")
+        settle()
+        self.write("notes.md", "now with numbers and more text")
+        answers = ContentIndex.lookup(self.entries(), "numbers")
+        self.assertNotIn(os.path.join(self.files, "notes.md"), answers)
+        settle()
+        answers = ContentIndex.lookup(self.entries(), "numbers")
+        self.assertTrue(answers[os.path.join(self.files, "notes.md")])
+
+    def test_utf16_without_bom(self):
+        """Test BOM-less UTF-16 files are indexed as content search reads them."""
+        for name, encoding in (("le.txt", "utf-16-le"), ("be.txt", "utf-16-be")):
+            with open(os.path.join(self.files, name), 'wb') as f:
+                f.write("Quarterly numbers for the north region".encode(encoding))
+        ContentIndex.lookup(self.entries(), "numbers")
+        settle()
+        answers = ContentIndex.lookup(self.entries(), "north")
+        self.assertTrue(answers[os.path.join(self.files, "le.txt")])
+        self.assertTrue(answers[os.path.join(self.files, "be.txt")])
+
+    def test_filter_uses_index(self):
+        query = ListingQuery(search_term="numbers", content_search=True)
+        filter_entries(self.entries(), query)
+        settle()
+        with patch("services.listing_filter.file_contains") as file_contains:
+            names = [e.name for e in filter_entries(self.entries(), query)]
+            file_contains.assert_not_called()
+        self.assertEqual(names, ["report.txt"])
+
+    def test_misses_past_the_indexed_part_are_not_trusted(self):
+        self.write("big.log", "y" * 5000 + "numbers")
+        with patch.object(ContentIndex, "MAX_FILE_BYTES", 1000):
+            ContentIndex.lookup(self.entries(), "numbers")
+            settle()
+            answers = ContentIndex.lookup(self.entries(), "numbers")
+        self.assertNotIn(os.path.join(self.files, "big.log"), answers)
+        self.assertIn(os.path.join(self.files, "notes.md"), answers)
+
+    def test_short_terms_fall_back_to_reading(self):
+        ContentIndex.lookup(self.entries(), "nu")
+        settle()
+        self.assertEqual(ContentIndex.lookup(self.entries(), "nu"), {})
+
+    def test_stats_report_throughput(self):
+        ContentIndex.lookup(self.entries(), "numbers")
+        settle()
+        stats = ContentIndex.stats()
+        self.assertGreater(stats["bytes"], 0)
+        self.assertGreaterEqual(stats["bytes_per_second"], 0)
+        self.assertEqual(stats["pending"], 0)
+
+
+class TestReadText(unittest.TestCase):
+    """Tests for read_text."""
+
+    def test_utf16_with_bom(self):
+        with tempfile.NamedTemporaryFile("wb", delete=False) as f:
+            f.write("Grüße".encode("utf-16"))
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(read_text(f.name, 1000), "Grüße")
+
+
+if __name__ == '__main__':
+    unittest.main()
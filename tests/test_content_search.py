@@ -0,0 +1,126 @@
+"""
+Unit tests for the streaming ContentSearch.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+import zipfile
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.content_search as content_search
+from services.content_index import ContentIndex
+from services.content_search import ContentSearch
+from services.directory_scanner import DirectoryScanner
+from services.listing_cache import ListingCache
+from services.listing_filter import ListingQuery, content_candidates
+from services.listing_worker import ListingWorker
+
+
+def run_to_end(search, timeout=10.0):
+    """Poll until the search is done; return (matches, progress)."""
+    found = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        matches, progress = search.poll()
+        found.extend(matches)
+        if progress is not None and progress.done:
+            # Matches queued just before the last file was counted
+            found.extend(search.poll()[0])
+            return found, progress
+        time.sleep(0.01)
+    raise AssertionError("content search did not finish")
+
+
+class TestContentSearch(unittest.TestCase):
+    """Tests for ContentSearch."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for i in range(40):
+            text = "needle" if i % 10 == 0 else "hay " * 100
+            with open(os.path.join(self.test_dir, f"f{i:02d}.txt"), 'w') as f:
+                f.write(text)
+        with open(os.path.join(self.test_dir, "needle.md"), 'w') as f:
+            f.write("by name")
+        self.entries = DirectoryScanner.scan(self.test_dir)
+        self.query = ListingQuery(search_term="needle", content_search=True)
+        patcher = patch.object(ContentIndex, "enabled", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_candidates_exclude_name_matches(self):
+        names = {e.name for e in content_candidates(self.entries, self.query)}
+        self.assertEqual(len(names), 40)
+        self.assertNotIn("needle.md", names)
+        self.assertEqual(content_candidates(self.entries, ListingQuery(search_term="needle")), [])
+
+    def test_streams_all_matches(self):
+        search = ContentSearch()
+        search.start(content_candidates(self.entries, self.query), "needle")
+        matches, progress = run_to_end(search)
+        self.assertEqual(sorted(e.name for e in matches), ["f00.txt", "f10.txt", "f20.txt", "f30.txt"])
+        self.assertEqual((progress.checked, progress.skipped), (40, 0))
+        self.assertGreater(progress.bytes_read, 0)
+
+    def test_budget_skips_remaining_files(self):
+        search = ContentSearch(budget=1000)
+        with patch.object(ContentSearch, "CHUNK_SIZE", 40):
+            search.start(content_candidates(self.entries, self.query), "needle")
+            _, progress = run_to_end(search)
+        self.assertGreater(progress.skipped, 0)
+        self.assertEqual(progress.checked + progress.skipped, 40)
+
+    def test_failing_file_is_still_checked(self):
+        """Test an error other than OSError from one file does not stall the search."""
+        real = content_search.search_file
+
+        def search_file(path, *args, **kwargs):
+            if path.endswith("f10.txt"):
+                raise zipfile.BadZipFile("not a document")
+            return real(path, *args, **kwargs)
+
+        search = ContentSearch()
+        with patch.object(content_search, "search_file", search_file):
+            search.start(content_candidates(self.entries, self.query), "needle")
+            matches, progress = run_to_end(search)
+        self.assertEqual(sorted(e.name for e in matches), ["f00.txt", "f20.txt", "f30.txt"])
+        self.assertEqual(progress.checked, 40)
+
+    def test_hits_carry_line_and_snippet(self):
+        search = ContentSearch()
+        search.start(content_candidates(self.entries, self.query), "needle")
+        run_to_end(search)
+        hit = search.hits[os.path.join(self.test_dir, "f10.txt")]
+        self.assertEqual((hit.line, hit.snippet), (1, "needle"))
+
+    def test_cancel_drops_results(self):
+        search = ContentSearch()
+        search.start(content_candidates(self.entries, self.query), "needle")
+        search.cancel()
+        time.sleep(0.2)
+        self.assertEqual(search.poll(), ([], None))
+
+    def test_worker_returns_name_matches_and_candidates(self):
+        ListingCache.invalidate()
+        worker = ListingWorker()
+        worker.submit(self.test_dir, self.query)
+        deadline = time.monotonic() + 5
+        result = None
+        while result is None and time.monotonic() < deadline:
+            result = worker.poll()
+            time.sleep(0.01)
+        self.assertEqual([e.name for e in result.entries], ["needle.md"])
+        self.assertEqual(len(result.content_candidates), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Unit tests for DirectoryScanner service.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import MagicMock
+
+from services.directory_scanner import IGNORED, DirectoryScanner, FileEntry
+from services.ignore_rules import IgnoreRules
+
+
+class TestDirectoryScanner(unittest.TestCase):
+    """Tests for DirectoryScanner service."""
+
+    def setUp(self):
+        """Create temp directory with a mix of files and folders."""
+        self.test_dir = tempfile.mkdtemp()
+
+        for name, content in [("b.txt", "bb"), ("A.md", "a"), ("c.PDF", "")]:
+            with open(os.path.join(self.test_dir, name), 'w') as f:
+                f.write(content)
+        os.makedirs(os.path.join(self.test_dir, "Zeta"))
+        os.makedirs(os.path.join(self.test_dir, "alpha"))
+        os.makedirs(os.path.join(self.test_dir, ".hidden"))
+
+    def tearDown(self):
+        """Clean up temp directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_folders_first_case_insensitive(self):
+        """Test folders are listed before files, each sorted ignoring case."""
+        names = [e.name for e in DirectoryScanner.scan(self.test_dir)]
+        self.assertEqual(names, ["alpha", "Zeta", "A.md", "b.txt", "c.PDF"])
+
+    def test_hidden_folders_skipped(self):
+        """Test dot-folders are hidden unless requested."""
+        names = [e.name for e in DirectoryScanner.scan(self.test_dir)]
+        self.assertNotIn(".hidden", names)
+
+        names = [e.name for e in DirectoryScanner.scan(self.test_dir, show_hidden_dirs=True)]
+        self.assertIn(".hidden", names)
+
+    def test_ignored_entries_counted(self):
+        """Test ignore rules drop matching entries and count them."""
+        ignore = IgnoreRules(["alpha/", "*.md"]).bind(self.test_dir)
+        listing = DirectoryScanner.scan(self.test_dir, ignore=ignore)
+        self.assertEqual([e.name for e in listing], ["Zeta", "b.txt", "c.PDF"])
+        self.assertEqual(listing.ignored, 2)
+        self.assertEqual(DirectoryScanner.scan(self.test_dir).ignored, 0)
+
+    def test_ignored_file_not_stated(self):
+        """Test an ignored file is rejected before its stat call."""
+        de = MagicMock()
+        de.name = "x.tmp"
+        de.path = os.path.join(self.test_dir, "x.tmp")
+        de.is_dir.return_value = False
+        de.is_file.return_value = True
+        ignore = IgnoreRules(["*.tmp"]).bind(self.test_dir)
+        self.assertIs(DirectoryScanner.entry_from_direntry(de, ignore=ignore), IGNORED)
+        de.stat.assert_not_called()
+
+    def test_file_stat_captured(self):
+        """Test size, date and extension come from the single stat."""
+        entries = {e.name: e for e in DirectoryScanner.scan(self.test_dir)}
+        b = entries["b.txt"]
+        st = os.stat(os.path.join(self.test_dir, "b.txt"))
+
+        self.assertFalse(b.is_dir)
+        self.assertEqual(b.size, 2)
+        self.assertEqual(b.mtime_ns, st.st_mtime_ns)
+        self.assertEqual(b.size_str, "0.00 MB")
+        self.assertEqual(entries["c.PDF"].ext, ".pdf")
+
+    def test_folder_entry_display(self):
+        """Test folders show blank size and date columns."""
+        alpha = DirectoryScanner.scan(self.test_dir)[0]
+        self.assertTrue(alpha.is_dir)
+        self.assertEqual(alpha.size_str, "")
+        self.assertEqual(alpha.mod_str, "")
+
+    def test_unknown_mtime(self):
+        """Test entries that could not be stat'ed show 'Unknown'."""
+        entry = FileEntry("x.txt", "/x.txt", False)
+        self.assertEqual(entry.mod_str, "Unknown")
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_broken_symlink_skipped(self):
+        """Test entries that are neither files nor folders are skipped."""
+        try:
+            os.symlink(os.path.join(self.test_dir, "missing"),
+                       os.path.join(self.test_dir, "dangling"))
+        except OSError:
+            self.skipTest("cannot create symlinks")
+        names = [e.name for e in DirectoryScanner.scan(self.test_dir)]
+        self.assertNotIn("dangling", names)
+
+    def test_missing_directory_raises(self):
+        """Test scanning a nonexistent directory raises OSError."""
+        with self.assertRaises(OSError):
+            DirectoryScanner.scan(os.path.join(self.test_dir, "nope"))
+
+
+if __name__ == '__main__':
+    unittest.main()
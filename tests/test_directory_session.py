@@ -0,0 +1,184 @@
+"""
+Unit tests for DirectorySessions and shared ListingCache scans.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import DirectoryScanner
+from services.directory_session import DirectorySessions
+from services.listing_cache import ListingCache
+from services.watchdog_service import FolderChangeHandler
+
+
+class FakeObserver:
+    """Records watches instead of starting a watcher thread."""
+
+    def __init__(self):
+        self.watches = []
+        self.started = False
+
+    def start(self):
+        self.started = True
+
+    def schedule(self, handler, path, recursive=False):
+        watch = (handler, path)
+        self.watches.append(watch)
+        return watch
+
+    def unschedule(self, watch):
+        self.watches.remove(watch)
+
+    def stop(self):
+        pass
+
+    def join(self):
+        pass
+
+
+class TestDirectorySessions(unittest.TestCase):
+    """Tests for DirectorySessions."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.observer = FakeObserver()
+        patcher = patch.object(DirectorySessions, "_create_observer", return_value=self.observer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(DirectorySessions.shutdown)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_one_watch_per_folder(self):
+        a = DirectorySessions.subscribe(self.test_dir, lambda: None)
+        b = DirectorySessions.subscribe(self.test_dir, lambda: None)
+        self.assertEqual(len(self.observer.watches), 1)
+        self.assertEqual(DirectorySessions.stats(), {"sessions": 1, "subscribers": 2, "watched": 1})
+
+        a.cancel()
+        self.assertEqual(len(self.observer.watches), 1)
+        b.cancel()
+        self.assertEqual(self.observer.watches, [])
+        self.assertIsNone(DirectorySessions.get(self.test_dir))
+
+    def test_change_invalidates_once_and_fans_out(self):
+        calls = []
+        DirectorySessions.subscribe(self.test_dir, lambda: calls.append("a"))
+        DirectorySessions.subscribe(self.test_dir, lambda: calls.append("b"))
+        ListingCache.scan(self.test_dir)
+
+        with patch.object(ListingCache, "invalidate") as invalidate:
+            DirectorySessions.get(self.test_dir).notify()
+            invalidate.assert_called_once_with(self.test_dir)
+        self.assertEqual(sorted(calls), ["a", "b"])
+
+    def test_change_invalidates_every_spelling(self):
+        """Test a panel that spelled the folder differently does not keep a stale listing."""
+        DirectorySessions.subscribe(self.test_dir, lambda: None)
+        other = os.path.join(self.test_dir, "sub", os.pardir)
+        os.makedirs(os.path.join(self.test_dir, "sub"))
+        DirectorySessions.subscribe(other, lambda: None)
+        self.assertEqual(DirectorySessions.stats()["sessions"], 1)
+        ListingCache.scan(other)
+        DirectorySessions.get(other).notify()
+        self.assertIsNone(ListingCache.get(other))
+
+    def test_cancel_twice_is_harmless(self):
+        sub = DirectorySessions.subscribe(self.test_dir, lambda: None)
+        sub.cancel()
+        sub.cancel()
+        self.assertEqual(DirectorySessions.stats()["sessions"], 0)
+
+
+class TestFolderChangeHandler(unittest.TestCase):
+    """Tests for the watcher's event throttle."""
+
+    def test_burst_ends_with_a_call(self):
+        """Test events soon after a call are folded into one later call, not dropped."""
+        calls = []
+        handler = FolderChangeHandler(lambda: calls.append(time.monotonic()))
+        with patch.object(FolderChangeHandler, "INTERVAL_S", 0.2):
+            for _ in range(5):
+                handler.on_any_event(None)
+            self.assertEqual(len(calls), 1)
+            time.sleep(0.4)
+            self.assertEqual(len(calls), 2)
+            self.assertGreaterEqual(calls[1] - calls[0], 0.15)
+            time.sleep(0.25)
+            handler.on_any_event(None)
+            self.assertEqual(len(calls), 3)
+
+
+class TestSharedScans(unittest.TestCase):
+    """Tests for ListingCache sharing concurrent scans."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.test_dir, "a.txt"), 'w') as f:
+            f.write("a")
+        ListingCache.invalidate()
+
+    def tearDown(self):
+        ListingCache.invalidate()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_concurrent_misses_scan_once(self):
+        real_scan = DirectoryScanner.scan
+        calls = []
+
+        def slow_scan(*args, **kwargs):
+            calls.append(args[0])
+            time.sleep(0.2)
+            return real_scan(*args, **kwargs)
+
+        results = []
+        with patch("services.listing_cache.DirectoryScanner.scan", side_effect=slow_scan):
+            threads = [threading.Thread(target=lambda: results.append(ListingCache.scan(self.test_dir)))
+                       for _ in range(3)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_shared_scan_error_reaches_waiters(self):
+        calls = []
+
+        def failing_scan(*args, **kwargs):
+            calls.append(args[0])
+            time.sleep(0.2)
+            raise PermissionError("denied")
+
+        errors = []
+
+        def scan():
+            try:
+                ListingCache.scan(self.test_dir)
+            except OSError as e:
+                errors.append(e)
+
+        with patch("services.listing_cache.DirectoryScanner.scan", side_effect=failing_scan):
+            threads = [threading.Thread(target=scan) for _ in range(2)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(errors), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
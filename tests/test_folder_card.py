@@ -0,0 +1,159 @@
+"""
+Unit tests for FolderCard's incremental listing updates.
+
+The poll methods are run on a stand-in for the card (no Tk root is
+needed) whose tree is the RecordingTree used by the TreeSync tests.
+"""
+
+import unittest
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.content_search import ContentProgress
+from services.directory_scanner import MTIME_PENDING, FileEntry
+from services.listing_columns import ListingColumns
+from services.listing_sort import ListingSorter
+from ui.folder_card import FolderCard
+from ui.row_model import item_options
+from ui.tree_sync import TreeSync
+from tests.test_listing_diff import RecordingTree
+
+
+ROOT = os.path.join(os.sep, "data")
+
+
+def entries(start, stop):
+    return [FileEntry(f"file{i}.txt", os.path.join(ROOT, f"file{i}.txt"), False, i, 10 ** 18)
+            for i in range(start, stop)]
+
+
+class Card:
+    """Just enough of a FolderCard for its poll methods."""
+
+    POLL_INTERVAL_MS = FolderCard.POLL_INTERVAL_MS
+    WALK_POLL_INTERVAL_MS = FolderCard.WALK_POLL_INTERVAL_MS
+    _poll_walk = FolderCard._poll_walk
+    _poll_content = FolderCard._poll_content
+    _carried_matches = FolderCard._carried_matches
+    _build_listing = FolderCard._build_listing
+    _poll_stats = FolderCard._poll_stats
+    STAT_POLL_INTERVAL_MS = FolderCard.STAT_POLL_INTERVAL_MS
+    _notes = FolderCard._notes
+
+    def __init__(self):
+        self.tree = RecordingTree()
+        self.tree_sync = TreeSync(self.tree)
+        self.virtual_list = MagicMock(active=False)
+        self.virtual_threshold = 1000
+        self.analytics_bar = MagicMock()
+        self.sorter = ListingSorter()
+        self.walker = MagicMock()
+        self.walker.state.ignored = 0
+        self.walker.state.throughput.return_value = 0.0
+        self.content_search = MagicMock()
+        self.stat_filler = MagicMock(pending=0)
+        self._listing = ListingColumns()
+        self._stream = None
+        self._content_matches = []
+        self._content_entries = []
+        self._content_fresh = True
+        self._content_term = ""
+        self._walk_after_id = self._content_after_id = self._stat_after_id = None
+        self._listing_note = self._content_note = self._hit_note = ""
+
+    def _render_for(self, listing):
+        return lambda path: item_options(listing[path], None)
+
+    def _set_loading(self, loading):
+        pass
+
+    def after(self, ms, callback):
+        return "after#1"
+
+
+class TestPollWalk(unittest.TestCase):
+    """Tests for FolderCard._poll_walk."""
+
+    def test_every_batch_reaches_the_tree(self):
+        """Test batches after the first are inserted, not lost to an in-place extend."""
+        card = Card()
+        card.walker.poll.side_effect = [(entries(0, 5), False), (entries(5, 15), False),
+                                        ([], True)]
+        for _ in range(3):
+            card._poll_walk()
+            self.assertEqual(len(card.tree.children), len(card._listing))
+        self.assertEqual(len(card.tree.children), 15)
+
+
+class TestPollContent(unittest.TestCase):
+    """Tests for FolderCard._poll_content."""
+
+    def test_streamed_matches_reach_the_tree(self):
+        """Test content matches after the first poll are inserted too."""
+        card = Card()
+        card._listing = ListingColumns.from_entries(entries(0, 3))
+        card.tree_sync.apply(card._listing, card._render_for(card._listing))
+        progress = ContentProgress(6, 1 << 20)
+        card.content_search.poll.side_effect = [(entries(3, 4), progress), (entries(4, 6), progress)]
+        for _ in range(2):
+            card._poll_content()
+            self.assertEqual(len(card.tree.children), len(card._listing))
+        self.assertEqual(len(card.tree.children), 6)
+
+    def test_previous_matches_stay_until_the_new_search_reports(self):
+        """Test a restarted search replaces the old matches instead of blanking them."""
+        card = Card()
+        names, old_matches = entries(0, 3), entries(3, 6)
+        card._content_entries = names
+        card._content_matches = old_matches
+        card._content_fresh = False
+        card._listing = ListingColumns.from_entries(names + old_matches)
+        card.tree_sync.apply(card._listing, card._render_for(card._listing))
+        shown = list(card.tree.children)
+        progress = ContentProgress(3, 1 << 20)
+        card.content_search.poll.side_effect = [([], progress), (entries(4, 5), progress)]
+
+        card._poll_content()
+        self.assertEqual(card.tree.children, shown)
+        card._poll_content()
+        self.assertEqual(sorted(card.tree.texts()), ["file0.txt", "file1.txt", "file2.txt", "file4.txt"])
+        self.assertEqual(card.tree.children[:3], shown[:3])
+        self.assertEqual([e.name for e in card._content_matches], ["file4.txt"])
+
+    def test_carried_matches_come_from_the_new_candidates(self):
+        """Test only previous matches that are still candidates are kept, with fresh stats."""
+        card = Card()
+        card._content_matches = entries(3, 6)
+        card._content_term = "x"
+        fresh = [FileEntry("file4.txt", os.path.join(ROOT, "file4.txt"), False, 99, 10 ** 18),
+                 FileEntry("file7.txt", os.path.join(ROOT, "file7.txt"), False, 7, 10 ** 18)]
+        result = MagicMock(content_candidates=fresh)
+        result.query.search_term = "x"
+        self.assertEqual(card._carried_matches(result), fresh[:1])
+        result.query.search_term = "y"
+        self.assertEqual(card._carried_matches(result), [])
+
+
+class TestPollStats(unittest.TestCase):
+    """Tests for FolderCard._poll_stats."""
+
+    def test_filled_stats_are_drawn(self):
+        """Test sizes that arrive after the rows are shown get drawn."""
+        card = Card()
+        pending = [FileEntry(f"file{i}.txt", os.path.join(ROOT, f"file{i}.txt"), False, 0, MTIME_PENDING)
+                   for i in range(3)]
+        card._listing = ListingColumns.from_entries(pending)
+        card.tree_sync.apply(card._listing, card._render_for(card._listing))
+        card.stat_filler.poll.return_value = ([(pending[1], 2048, 10 ** 18)], [])
+        card._poll_stats()
+        sizes = [card.tree.items[iid]["values"][0] for iid in card.tree.children]
+        self.assertEqual(sizes[0], sizes[2])
+        self.assertNotEqual(sizes[1], sizes[0])
+        self.assertEqual(sizes[1], card._listing[pending[1].path].size_str)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Unit tests for the workspace-wide GlobalSearch.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import FileEntry
+from services.global_search import GlobalSearch, rank, search_roots
+from services.listing_cache import ListingCache
+
+
+def run_to_end(search, timeout=10.0):
+    hits = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        hits.extend(search.poll())
+        if search.done:
+            return hits
+        time.sleep(0.01)
+    raise AssertionError("global search did not finish")
+
+
+class TestSearchRoots(unittest.TestCase):
+    """Tests for search_roots."""
+
+    def test_duplicates_dropped(self):
+        paths = ["/data/a", "", "/data/b/", "/data/a", "/data/a/sub"]
+        self.assertEqual(search_roots(paths, False),
+                         [os.path.normpath(p) for p in ("/data/a", "/data/b", "/data/a/sub")])
+
+    def test_recursive_drops_nested(self):
+        paths = ["/data/a/sub", "/data/b", "/data/a", "/data/ab"]
+        self.assertEqual(search_roots(paths, True),
+                         [os.path.normpath(p) for p in ("/data/b", "/data/a", "/data/ab")])
+
+
+class TestRank(unittest.TestCase):
+    """Tests for rank."""
+
+    def test_order(self):
+        root = os.path.normpath("/data")
+        names = ["old_report_2020.txt", "report.txt", "reports.md", "myreport.txt",
+                 os.path.join("deep", "report.txt")]
+        entries = [FileEntry(os.path.basename(n), os.path.join(root, n), False, 0, 0) for n in names]
+        ordered = sorted(entries, key=lambda e: rank(e, "report", root))
+        self.assertEqual([os.path.relpath(e.path, root) for e in ordered],
+                         ["report.txt", os.path.join("deep", "report.txt"), "reports.md",
+                          "old_report_2020.txt", "myreport.txt"])
+
+
+class TestGlobalSearch(unittest.TestCase):
+    """Tests for GlobalSearch."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.a = os.path.join(self.test_dir, "a")
+        self.b = os.path.join(self.test_dir, "b")
+        for folder, names in ((self.a, ["plan.txt", "budget plan.xlsx", "notes.md"]),
+                              (self.b, ["plan.docx"]),
+                              (os.path.join(self.a, "sub"), ["old plan.txt"])):
+            os.makedirs(folder)
+            for name in names:
+                open(os.path.join(folder, name), "w").close()
+        ListingCache.invalidate()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_one_scan_per_distinct_folder(self):
+        search = GlobalSearch()
+        roots = search_roots([self.a, self.b, self.a], recursive=False)
+        with patch.object(ListingCache, "scan", wraps=ListingCache.scan) as scan:
+            search.start(roots, "PLAN")
+            hits = run_to_end(search)
+            self.assertEqual(scan.call_count, 2)
+        self.assertEqual(sorted(h.entry.name for h in hits), ["budget plan.xlsx", "plan.docx", "plan.txt"])
+
+    def test_recursive_covers_nested_panels_once(self):
+        search = GlobalSearch()
+        search.start(search_roots([os.path.join(self.a, "sub"), self.a], recursive=True), "plan",
+                     recursive=True)
+        hits = run_to_end(search)
+        paths = [h.entry.path for h in hits]
+        self.assertEqual(len(paths), len(set(paths)))
+        self.assertIn(os.path.join(self.a, "sub", "old plan.txt"), paths)
+
+    def test_result_cap(self):
+        search = GlobalSearch()
+        with patch.object(GlobalSearch, "MAX_RESULTS", 2):
+            search.start([self.a, self.b], "plan")
+            hits = run_to_end(search)
+        self.assertEqual(len(hits), 2)
+        self.assertTrue(search.truncated)
+
+    def test_unreadable_folder_counted(self):
+        search = GlobalSearch()
+        search.start([self.a, os.path.join(self.test_dir, "missing")], "plan")
+        run_to_end(search)
+        self.assertEqual(search.errors, 1)
+
+    def test_new_search_drops_old_results(self):
+        search = GlobalSearch()
+        search.start([self.a], "plan")
+        search.start([self.b], "plan")
+        hits = run_to_end(search)
+        self.assertEqual([h.entry.name for h in hits], ["plan.docx"])
+
+
+if __name__ == '__main__':
+    unittest.main()
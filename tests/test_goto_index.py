@@ -0,0 +1,183 @@
+"""
+Unit tests for the Go to file fuzzy index.
+"""
+
+import unittest
+import os
+import random
+import re
+import shutil
+import tempfile
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.goto_index as goto_index
+from services.directory_session import DirectorySessions
+from services.goto_index import (FuzzyIndex, GotoIndex, TIER_FUZZY, TIER_PREFIX, TIER_SUBSTRING,
+                                 TIER_WORD)
+from services.name_index import NameIndex
+
+
+FOLDER = os.path.join(os.sep, "data")
+
+WORDS = ["report", "budget", "final", "draft", "notes", "q1", "q2", "2023", "scan", "plan"]
+
+
+def corpus(count, seed=1):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(1, 3))]
+        names.add(rng.choice("_ -").join(words) + rng.choice([".txt", ".xlsx", ".PDF"]))
+    return [(name, FOLDER) for name in sorted(names)]
+
+
+def in_order(chars, name):
+    """Reference check: ``chars`` appear in ``name`` in order."""
+    pos = 0
+    for char in chars:
+        pos = name.find(char, pos) + 1
+        if not pos:
+            return False
+    return True
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    """Tests for FuzzyIndex.search."""
+
+    def index(self, *names):
+        return FuzzyIndex([(name, FOLDER) for name in names])
+
+    def names(self, result):
+        return [m.name for m in result.matches]
+
+    def test_tiers(self):
+        index = self.index("myreport.txt", "Report.txt", "q3 report.docx", "reports.md",
+                           "r_e_p_o_r_t.txt", "budget.xlsx")
+        result = index.search("REPORT")
+        self.assertEqual(self.names(result), ["Report.txt", "reports.md", "q3 report.docx",
+                                              "myreport.txt", "r_e_p_o_r_t.txt"])
+        self.assertEqual([m.tier for m in result.matches],
+                         [TIER_PREFIX, TIER_PREFIX, TIER_WORD, TIER_SUBSTRING, TIER_FUZZY])
+        self.assertEqual(result.matches[0].path, os.path.join(FOLDER, "Report.txt"))
+
+    def test_fuzzy_ignores_separators_and_prefers_compact(self):
+        index = self.index("budget_final.xlsx", "b_u_d_g_e_t_f_i_n_a_l.txt", "notes.txt")
+        self.assertEqual(self.names(index.search("bdgt fnl")),
+                         ["budget_final.xlsx", "b_u_d_g_e_t_f_i_n_a_l.txt"])
+        self.assertEqual(self.names(index.search("budget-final")),
+                         ["budget_final.xlsx", "b_u_d_g_e_t_f_i_n_a_l.txt"])
+
+    def test_limit_and_empty_query(self):
+        index = FuzzyIndex(corpus(300))
+        self.assertEqual(len(index.search("r", limit=7).matches), 7)
+        self.assertEqual(index.search("  ").matches, [])
+        self.assertEqual(index.search("zzz").matches, [])
+
+    def test_names_with_line_breaks(self):
+        index = self.index("bad\nname.txt", "name.txt")
+        self.assertEqual(sorted(self.names(index.search("name"))), ["bad\nname.txt", "name.txt"])
+
+    def test_matches_reference(self):
+        files = corpus(400)
+        index = FuzzyIndex(files)
+        for query in ("rpt", "bud fin", "q12023", "tx", "notes.pdf", "nts"):
+            letters = "".join(c for c in query.lower() if c.isalnum())
+            expected = {name for name, _ in files if in_order(letters, name.lower())}
+            result = index.search(query, limit=1000)
+            self.assertEqual(set(self.names(result)), expected, query)
+            tiers = [m.tier for m in result.matches]
+            self.assertEqual(tiers, sorted(tiers), query)
+
+    def test_candidate_subset_gives_same_results(self):
+        index = FuzzyIndex(corpus(400))
+        for query in ("rpt", "q2 plan", "final", "2023s"):
+            with patch.object(goto_index, "SPARSE_FRACTION", 0):
+                scanned = index.search(query)
+            with patch.object(goto_index, "SPARSE_FRACTION", 1):
+                subset = index.search(query)
+            self.assertIsNotNone(subset.corpus)
+            self.assertEqual(scanned.matches, subset.matches, query)
+
+    def test_typing_reuses_previous_result(self):
+        index = FuzzyIndex(corpus(400))
+        for typed in ("budget final", "q1 scan", "draftnotes", "2023.pdf"):
+            previous = None
+            for end in range(1, len(typed) + 1):
+                previous = index.search(typed[:end], previous=previous)
+                self.assertEqual(previous.matches, index.search(typed[:end]).matches, typed[:end])
+            # Deleting characters, or typing the same letters in another order, starts over
+            for other in (typed[:2], typed[::-1]):
+                self.assertEqual(index.search(other, previous=previous).matches,
+                                 index.search(other).matches, other)
+
+    def test_typing_after_punctuation(self):
+        """Test a term without letters does not narrow the next term's in-order matches."""
+        index = self.index("a.p", "pdf", "b.txt")
+        previous = index.search(".")
+        self.assertEqual(self.names(index.search(".p")), ["a.p", "pdf"])
+        self.assertEqual(self.names(index.search(".p", previous=previous)), ["a.p", "pdf"])
+
+    def test_result_of_other_index_is_ignored(self):
+        old = self.index("alpha.txt").search("be")
+        self.assertEqual(old.everything, [])
+        new = self.index("beta.txt")
+        self.assertEqual(self.names(new.search("bet", previous=old)), ["beta.txt"])
+
+    def test_fuzzy_pattern_escapes(self):
+        pattern = goto_index._fuzzy_pattern("a]-^")
+        self.assertTrue(pattern.search("xa1]2-3^"))
+        self.assertIsInstance(pattern, re.Pattern)
+
+
+class TestGotoIndex(unittest.TestCase):
+    """Tests for the GotoIndex snapshot over the NameIndex."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for rel in ("a/budget_final.xlsx", "a/sub/notes.txt", "b/plan.docx"):
+            path = os.path.join(self.test_dir, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+        for patcher in (patch.object(NameIndex, "directory", os.path.join(self.test_dir, "store")),
+                        patch.object(DirectorySessions, "watch_tree", return_value=None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        GotoIndex.clear()
+
+    def tearDown(self):
+        NameIndex.configure([])
+        NameIndex.executor().submit(lambda: None).result(timeout=10)
+        GotoIndex.clear()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def build(self, force=False):
+        NameIndex.executor().submit(lambda: None).result(timeout=10)
+        GotoIndex.warm(force)
+        GotoIndex.executor().submit(lambda: None).result(timeout=10)
+
+    def test_files_only(self):
+        NameIndex.configure([self.test_dir])
+        self.build()
+        index = GotoIndex.current()
+        self.assertEqual(sorted(index.names), ["budget_final.xlsx", "notes.txt", "plan.docx"])
+        self.assertEqual(index.search("bf").matches[0].path,
+                         os.path.join(self.test_dir, "a", "budget_final.xlsx"))
+        self.assertFalse(GotoIndex.stale())
+
+    def test_rebuild_waits_for_interval(self):
+        NameIndex.configure([self.test_dir])
+        self.build()
+        first = GotoIndex.current()
+        NameIndex.configure([os.path.join(self.test_dir, "b")])
+        self.build()
+        self.assertIs(GotoIndex.current(), first)
+        self.assertTrue(GotoIndex.stale())
+        self.build(force=True)
+        self.assertEqual(GotoIndex.current().names, ["plan.docx"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for the gitignore-style ignore rules.
+"""
+
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ignore_rules import IgnoreRules, compile_rules, config_patterns, DEFAULT_PATTERNS
+
+
+def matches(lines, name, rel=None, is_dir=False):
+    return IgnoreRules(lines).match(name, rel if rel is not None else name, is_dir)
+
+
+class TestIgnoreRules(unittest.TestCase):
+    """Tests for IgnoreRules."""
+
+    def test_plain_name_matches_at_any_depth(self):
+        self.assertTrue(matches(["node_modules"], "node_modules", "a/b/node_modules", True))
+        self.assertTrue(matches(["node_modules"], "node_modules", "node_modules", False))
+        self.assertFalse(matches(["node_modules"], "node_modules2"))
+
+    def test_trailing_slash_matches_folders_only(self):
+        self.assertTrue(matches(["build/"], "build", is_dir=True))
+        self.assertFalse(matches(["build/"], "build", is_dir=False))
+
+    def test_wildcards(self):
+        self.assertTrue(matches(["*.pyc"], "mod.pyc"))
+        self.assertFalse(matches(["*.pyc"], "mod.py"))
+        self.assertTrue(matches(["?.log"], "a.log"))
+        self.assertFalse(matches(["?.log"], "ab.log"))
+        self.assertTrue(matches(["[ab].txt"], "b.txt"))
+        self.assertFalse(matches(["[!ab].txt"], "b.txt"))
+
+    def test_slash_anchors_to_root(self):
+        self.assertTrue(matches(["/out"], "out", "out", True))
+        self.assertFalse(matches(["/out"], "out", "src/out", True))
+        self.assertTrue(matches(["docs/*.tmp"], "a.tmp", "docs/a.tmp"))
+        self.assertFalse(matches(["docs/*.tmp"], "a.tmp", "x/docs/a.tmp"))
+        # '*' does not cross folders
+        self.assertFalse(matches(["docs/*.tmp"], "a.tmp", "docs/x/a.tmp"))
+
+    def test_double_star(self):
+        self.assertTrue(matches(["**/cache"], "cache", "a/b/cache", True))
+        self.assertTrue(matches(["**/cache"], "cache", "cache", True))
+        self.assertTrue(matches(["a/**/b"], "b", "a/x/y/b"))
+        self.assertTrue(matches(["a/**/b"], "b", "a/b"))
+        self.assertTrue(matches(["logs/**"], "x.txt", "logs/d/x.txt"))
+
+    def test_negation_last_match_wins(self):
+        lines = ["*.log", "!keep.log"]
+        self.assertTrue(matches(lines, "debug.log"))
+        self.assertFalse(matches(lines, "keep.log"))
+        self.assertTrue(matches(lines + ["keep.log"], "keep.log"))
+
+    def test_comments_blanks_and_escapes(self):
+        rules = IgnoreRules(["# comment", "", "   ", "\\#hash", "\\!bang"])
+        self.assertEqual(len(rules.patterns), 2)
+        self.assertTrue(rules.match("#hash", "#hash", False))
+        self.assertTrue(rules.match("!bang", "!bang", False))
+        self.assertFalse(IgnoreRules(["# comment"]))
+
+    def test_anchored_rule_outside_root_does_not_apply(self):
+        rules = IgnoreRules(["/out"])
+        self.assertFalse(rules.match("out", None, True))
+
+    def test_matcher_relative_to_root(self):
+        root = os.path.join(os.sep, "proj")
+        matcher = IgnoreRules(["/out/", "*.tmp"]).bind(root)
+        self.assertTrue(matcher.ignored(os.path.join(root, "out"), "out", True))
+        self.assertFalse(matcher.ignored(os.path.join(root, "src", "out"), "out", True))
+        self.assertTrue(matcher.ignored(os.path.join(os.sep, "elsewhere", "a.tmp"), "a.tmp", False))
+
+    def test_matcher_key_ignores_root_without_anchored_rules(self):
+        rules = IgnoreRules(["*.tmp"])
+        self.assertEqual(rules.bind("/a"), rules.bind("/b"))
+        anchored = IgnoreRules(["/out"])
+        self.assertNotEqual(anchored.bind("/a"), anchored.bind("/b"))
+
+    def test_empty_rules_bind_to_none(self):
+        self.assertIsNone(IgnoreRules([]).bind("/a"))
+
+    def test_compile_is_cached(self):
+        self.assertIs(compile_rules(("a/",)), compile_rules(("a/",)))
+
+    def test_config_patterns(self):
+        self.assertEqual(config_patterns({}), DEFAULT_PATTERNS)
+        config = {
+            "ignore_patterns": ["*.tmp"],
+            "active_workspace": "web",
+            "workspaces": {"web": {"ignore_patterns": ["dist/"]}, "other": {"ignore_patterns": ["x"]}},
+        }
+        self.assertEqual(config_patterns(config), ("*.tmp", "dist/"))
+
+
+if __name__ == '__main__':
+    unittest.main()
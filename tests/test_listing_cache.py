@@ -0,0 +1,99 @@
+"""
+Unit tests for ListingCache.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ignore_rules import IgnoreRules
+from services.listing_cache import ListingCache
+
+
+class TestListingCache(unittest.TestCase):
+    """Tests for ListingCache."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.test_dir, "a.txt"), 'w') as f:
+            f.write("a")
+        ListingCache.invalidate()
+        ListingCache.configure(max_listings=64, max_bytes=64 * 1024 * 1024)
+        ListingCache.hits = ListingCache.misses = ListingCache.evictions = 0
+
+    def tearDown(self):
+        ListingCache.invalidate()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_second_scan_is_a_hit(self):
+        """Test an unchanged directory is served without rescanning."""
+        first = ListingCache.scan(self.test_dir)
+        with patch("services.listing_cache.DirectoryScanner.scan") as scan:
+            second = ListingCache.scan(self.test_dir)
+            scan.assert_not_called()
+
+        self.assertIs(first, second)
+        stats = ListingCache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_directory_change_revalidates(self):
+        """Test adding a file (new dir mtime) forces a rescan."""
+        ListingCache.scan(self.test_dir)
+        path = os.path.join(self.test_dir, "b.txt")
+        with open(path, 'w') as f:
+            f.write("b")
+        # Make sure the mtime moves even on coarse-grained filesystems
+        st = os.stat(self.test_dir)
+        os.utime(self.test_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        names = [e.name for e in ListingCache.scan(self.test_dir)]
+        self.assertEqual(names, ["a.txt", "b.txt"])
+        self.assertEqual(ListingCache.stats()["misses"], 2)
+
+    def test_invalidate(self):
+        """Test invalidate forces the next scan to read the disk."""
+        ListingCache.scan(self.test_dir)
+        ListingCache.invalidate(self.test_dir)
+        self.assertIsNone(ListingCache.get(self.test_dir))
+        ListingCache.scan(self.test_dir)
+        self.assertEqual(ListingCache.stats()["misses"], 2)
+
+    def test_listings_cached_per_ignore_rules(self):
+        """Test filtered and unfiltered listings are cached separately."""
+        ignore = IgnoreRules(["*.txt"]).bind(self.test_dir)
+        self.assertEqual(len(ListingCache.scan(self.test_dir, ignore)), 0)
+        self.assertEqual(len(ListingCache.scan(self.test_dir)), 1)
+        self.assertEqual(ListingCache.scan(self.test_dir, ignore).ignored, 1)
+        self.assertEqual(ListingCache.stats()["listings"], 2)
+
+        ListingCache.invalidate(self.test_dir)
+        self.assertEqual(ListingCache.stats()["listings"], 0)
+
+    def test_lru_eviction_by_count(self):
+        """Test the least recently used listing is evicted first."""
+        dirs = [tempfile.mkdtemp(dir=self.test_dir) for _ in range(3)]
+        ListingCache.configure(max_listings=2)
+        ListingCache.scan(dirs[0])
+        ListingCache.scan(dirs[1])
+        ListingCache.scan(dirs[0])      # dirs[1] is now least recent
+        ListingCache.scan(dirs[2])
+
+        self.assertIsNotNone(ListingCache.get(dirs[0]))
+        self.assertIsNone(ListingCache.get(dirs[1]))
+        self.assertEqual(ListingCache.stats()["evictions"], 1)
+
+    def test_memory_budget(self):
+        """Test listings larger than the byte budget are not kept."""
+        ListingCache.configure(max_bytes=10)
+        ListingCache.scan(self.test_dir)
+        self.assertEqual(ListingCache.stats()["listings"], 0)
+        self.assertEqual(ListingCache.stats()["bytes"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Unit tests for ListingColumns.
+"""
+
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import FileEntry
+from services.listing_columns import ListingColumns, RowRecord
+
+
+class TestListingColumns(unittest.TestCase):
+    """Tests for ListingColumns."""
+
+    def setUp(self):
+        self.entries = [
+            FileEntry("sub", "/d/sub", True),
+            FileEntry("a.TXT", "/d/a.TXT", False, 10, 111),
+            FileEntry("b.pdf", "/d/b.pdf", False, 20, -1),
+            FileEntry("c.txt", "/d/c.txt", False, 30, 333),
+        ]
+        tags = {"/d/b.pdf": ("red", True)}
+        self.cols = ListingColumns.from_entries(self.entries, lambda p: tags.get(p, (None, False)))
+
+    def test_records_match_entries(self):
+        """Test records rebuilt from columns match the scanned entries."""
+        self.assertEqual(list(self.cols), [e.path for e in self.entries])
+        self.assertEqual(self.cols["/d/sub"], RowRecord.from_entry(self.entries[0]))
+        self.assertEqual(self.cols["/d/a.TXT"], RowRecord.from_entry(self.entries[1]))
+        self.assertEqual(self.cols["/d/b.pdf"], RowRecord.from_entry(self.entries[2], "red", True))
+        self.assertIsNone(self.cols.get("/d/missing"))
+        self.assertNotIn(None, self.cols)
+
+    def test_file_stats(self):
+        """Test file totals skip folders and group extensions case-insensitively."""
+        count, total, by_ext = self.cols.file_stats()
+        self.assertEqual((count, total), (3, 60))
+        self.assertEqual(by_ext, {".txt": 2, ".pdf": 1})
+        self.assertEqual(self.cols.file_stats([0, 2]), (1, 20, {".pdf": 1}))
+
+    def test_take_reorders(self):
+        """Test take() picks rows by index into a new listing."""
+        picked = self.cols.take([3, 0])
+        self.assertEqual(list(picked), ["/d/c.txt", "/d/sub"])
+        self.assertEqual(picked["/d/c.txt"].size, 30)
+        self.assertEqual(len(self.cols), 4)
+
+    def test_copy_is_independent(self):
+        """Test extending or updating a copy leaves the original as it was."""
+        self.assertIn("/d/a.TXT", self.cols)
+        copy = self.cols.copy()
+        copy.extend([FileEntry("d.txt", "/d/d.txt", False, 40, 444)])
+        copy.set_stat("/d/a.TXT", 11, 112)
+        self.assertEqual(copy["/d/d.txt"].size, 40)
+        self.assertEqual(copy["/d/a.TXT"].size, 11)
+        self.assertEqual(len(self.cols), 4)
+        self.assertNotIn("/d/d.txt", self.cols)
+        self.assertEqual(self.cols["/d/a.TXT"].size, 10)
+
+    def test_compact_storage(self):
+        """Test numeric fields are stored in typed arrays, not per-row objects."""
+        self.assertEqual(self.cols.sizes.typecode, "q")
+        self.assertEqual(self.cols.mtimes.typecode, "q")
+        self.assertEqual(self.cols.flags.itemsize, 1)
+        self.assertIs(self.cols.names[1], self.entries[1].name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Unit tests for listing diffs and TreeSync.
+"""
+
+import unittest
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.listing_diff import diff_listing
+from ui.tree_sync import TreeSync
+
+
+class RecordingTree:
+    """Minimal stand-in for the ttk.Treeview item API used by TreeSync."""
+
+    def __init__(self):
+        self.children = []
+        self.items = {}
+        self.calls = 0
+        self._next = 0
+
+    def insert(self, parent, index, **kw):
+        self.calls += 1
+        self._next += 1
+        iid = f"I{self._next:03X}"
+        self.items[iid] = kw
+        self.children.insert(index if index != "end" else len(self.children), iid)
+        return iid
+
+    def delete(self, *iids):
+        self.calls += 1
+        for iid in iids:
+            self.children.remove(iid)
+            del self.items[iid]
+
+    def item(self, iid, **kw):
+        self.calls += 1
+        self.items[iid].update(kw)
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def set_children(self, parent, *iids):
+        self.calls += 1
+        keep = set(iids)
+        for iid in self.children:
+            if iid not in keep:
+                del self.items[iid]
+        self.children = list(iids)
+
+    def get_children(self, parent=""):
+        return tuple(self.children)
+
+    def texts(self):
+        return [self.items[iid]["text"] for iid in self.children]
+
+
+def listing(*pairs):
+    return dict(pairs)
+
+
+class TestDiffListing(unittest.TestCase):
+    """Tests for diff_listing."""
+
+    def test_identical_is_empty(self):
+        """Test identical listings produce no mutations."""
+        old = listing(("a", 1), ("b", 2))
+        self.assertTrue(diff_listing(old, dict(old)).is_empty)
+
+    def test_added_removed_changed(self):
+        """Test each kind of change is reported once."""
+        old = listing(("a", 1), ("b", 2), ("c", 3))
+        new = listing(("a", 1), ("c", 4), ("d", 5))
+        diff = diff_listing(old, new)
+
+        self.assertEqual(diff.removed, ["b"])
+        self.assertEqual(diff.added, [(2, "d")])
+        self.assertEqual(diff.changed, ["c"])
+        self.assertFalse(diff.reordered)
+        self.assertEqual(diff.touched, 3)
+
+    def test_reorder_detected(self):
+        """Test a change in relative order of kept rows is flagged."""
+        diff = diff_listing(listing(("a", 1), ("b", 1)), listing(("b", 1), ("a", 1)))
+        self.assertTrue(diff.reordered)
+
+
+class TestTreeSync(unittest.TestCase):
+    """Tests for TreeSync against a recording tree."""
+
+    def render(self, key):
+        return {"text": key, "values": [self.sigs[key]]}
+
+    def sync_to(self, sync, keys, sigs=None):
+        self.sigs = sigs or {k: 0 for k in keys}
+        return sync.apply({k: self.sigs[k] for k in keys}, self.render)
+
+    def test_single_change_touches_one_row(self):
+        """Test a one-file change costs a constant number of tree calls."""
+        tree = RecordingTree()
+        sync = TreeSync(tree)
+        keys = [f"f{i:05d}" for i in range(5000)]
+        self.sync_to(sync, keys)
+        tree.calls = 0
+
+        keys.insert(2500, "f02500x")
+        self.sync_to(sync, keys)
+
+        self.assertEqual(tree.calls, 1)
+        self.assertEqual(tree.texts(), keys)
+
+    def test_iids_survive_refresh(self):
+        """Test unchanged rows keep their item IDs (and so their selection)."""
+        tree = RecordingTree()
+        sync = TreeSync(tree)
+        self.sync_to(sync, ["a", "b", "c"])
+        iid_b = sync.iids["b"]
+
+        self.sync_to(sync, ["a", "b", "c"], {"a": 0, "b": 0, "c": 1})
+
+        self.assertEqual(sync.iids["b"], iid_b)
+        self.assertEqual(sync.key_for(iid_b), "b")
+        self.assertEqual(tree.items[sync.iids["c"]]["values"], [1])
+
+    def test_random_listings_converge(self):
+        """Test arbitrary add/remove/reorder sequences reproduce the listing."""
+        rng = random.Random(7)
+        tree = RecordingTree()
+        sync = TreeSync(tree)
+        universe = [f"k{i}" for i in range(60)]
+        for _ in range(50):
+            keys = rng.sample(universe, rng.randint(0, 40))
+            if rng.random() < 0.7:
+                keys.sort()
+            self.sync_to(sync, keys, {k: rng.randint(0, 2) for k in keys})
+            self.assertEqual(tree.texts(), keys)
+            self.assertEqual(len(tree.items), len(keys))
+
+    def test_cancelled_stream_stays_consistent(self):
+        """Test closing apply_steps midway leaves rows matching the tree."""
+        rng = random.Random(11)
+        tree = RecordingTree()
+        sync = TreeSync(tree)
+        universe = [f"k{i}" for i in range(80)]
+        for _ in range(40):
+            keys = sorted(rng.sample(universe, rng.randint(0, 60)))
+            if rng.random() < 0.3:
+                rng.shuffle(keys)
+            self.sigs = {k: rng.randint(0, 2) for k in keys}
+            steps = sync.apply_steps({k: self.sigs[k] for k in keys}, self.render)
+            for _ in range(rng.randint(0, 30)):
+                if next(steps, None) is None:
+                    break
+            steps.close()
+
+            self.assertEqual([tree.items[sync.iids[k]]["text"] for k in sync.rows], tree.texts())
+            for key, sig in sync.rows.items():
+                self.assertEqual(tree.items[sync.iids[key]]["values"], [sig])
+
+        self.sync_to(sync, universe[:10])
+        self.assertEqual(tree.texts(), universe[:10])
+
+    def test_adopt_tree_order(self):
+        """Test rows moved directly (e.g. by sorting) are re-adopted."""
+        tree = RecordingTree()
+        sync = TreeSync(tree)
+        self.sync_to(sync, ["a", "b", "c"])
+        tree.move(sync.iids["c"], "", 0)
+        sync.adopt_tree_order()
+
+        self.assertEqual(list(sync.rows), ["c", "a", "b"])
+        self.sync_to(sync, ["a", "b", "c"])
+        self.assertEqual(tree.texts(), ["a", "b", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Unit tests for the typed listing sort.
+"""
+
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import FileEntry
+from services.listing_sort import ListingSorter, SortState, natural_key
+from services.listing_columns import ListingColumns
+from ui.tree_sync import TreeSync
+from tests.test_listing_diff import RecordingTree
+
+
+def records(*specs):
+    """(name, is_dir, size, mtime_ns) -> ListingColumns in given order."""
+    return ListingColumns.from_entries(
+        FileEntry(name, "/d/" + name, is_dir, size, mtime_ns)
+        for name, is_dir, size, mtime_ns in specs)
+
+
+def names(rows, order):
+    return [rows.names[i] for i in order]
+
+
+class TestNaturalKey(unittest.TestCase):
+    """Tests for natural_key."""
+
+    def test_digit_runs_by_value(self):
+        """Test numbers inside names sort numerically and case-insensitively."""
+        items = ["file10.txt", "File2.txt", "file1.txt", "file02b.txt", "a", "10"]
+        self.assertEqual(sorted(items, key=natural_key),
+                         ["10", "a", "file1.txt", "File2.txt", "file02b.txt", "file10.txt"])
+
+
+class TestListingSorter(unittest.TestCase):
+    """Tests for ListingSorter."""
+
+    def setUp(self):
+        self.rows = records(
+            ("zeta", True, 0, -1),
+            ("alpha", True, 0, -1),
+            ("b10.txt", False, 5, 300),
+            ("b9.txt", False, 2_000_000, 100),
+            ("a.txt", False, 900, 200),
+        )
+
+    def test_unsorted_keeps_order(self):
+        """Test no active sort leaves the scan order alone."""
+        sorter = ListingSorter()
+        self.assertIs(sorter.sorted_rows(self.rows), self.rows)
+
+    def test_by_name(self):
+        """Test name sort is natural with folders first in both directions."""
+        sorter = ListingSorter(SortState("#0"))
+        self.assertEqual(names(self.rows, sorter.order(self.rows)),
+                         ["alpha", "zeta", "a.txt", "b9.txt", "b10.txt"])
+        sorter.set_state(SortState("#0", True))
+        self.assertEqual(names(self.rows, sorter.order(self.rows)),
+                         ["zeta", "alpha", "b10.txt", "b9.txt", "a.txt"])
+
+    def test_by_size_uses_bytes(self):
+        """Test size sort compares bytes, not the '0.00 MB' display text."""
+        sorter = ListingSorter(SortState("size"))
+        self.assertEqual(names(self.rows, sorter.order(self.rows)),
+                         ["alpha", "zeta", "b10.txt", "a.txt", "b9.txt"])
+
+    def test_by_date_uses_ns(self):
+        """Test date sort compares timestamps, newest first when reversed."""
+        sorter = ListingSorter(SortState("date", True))
+        self.assertEqual(names(self.rows, sorter.order(self.rows)),
+                         ["alpha", "zeta", "b10.txt", "a.txt", "b9.txt"])
+
+    def test_reorder_is_one_tree_call(self):
+        """Test applying a new sort order moves rows with a single call."""
+        tree = RecordingTree()
+        sync = TreeSync(tree)
+        sync.apply(self.rows, lambda k: {"text": self.rows[k].name})
+        tree.calls = 0
+
+        ordered = ListingSorter(SortState("size", True)).sorted_rows(self.rows)
+        sync.apply(ordered, lambda k: {"text": ordered[k].name})
+
+        self.assertEqual(tree.calls, 1)
+        self.assertEqual(tree.texts(), ordered.names)
+
+
+if __name__ == '__main__':
+    unittest.main()
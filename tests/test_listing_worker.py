@@ -0,0 +1,144 @@
+"""
+Unit tests for the background ListingWorker and listing filters.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.content_index import ContentIndex
+from services.directory_scanner import DirectoryScanner
+from services.listing_filter import ListingQuery, filter_entries
+from services.listing_worker import ListingWorker
+
+
+def wait_for_result(worker, timeout=5.0):
+    """Poll like the Tk loop does until a current result arrives."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = worker.poll()
+        if result is not None:
+            return result
+        time.sleep(0.01)
+    raise AssertionError("listing worker did not reply")
+
+
+class TestListingFilter(unittest.TestCase):
+    """Tests for filter_entries."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.test_dir, "report.txt"), 'w') as f:
+            f.write("quarterly NUMBERS")
+        with open(os.path.join(self.test_dir, "notes.md"), 'w') as f:
+            f.write("nothing here")
+        with open(os.path.join(self.test_dir, "sheet.xlsx"), 'w') as f:
+            f.write("numbers")
+        os.makedirs(os.path.join(self.test_dir, "numbers_dir"))
+        self.entries = DirectoryScanner.scan(self.test_dir)
+        # Files are read directly here; see test_content_index.py
+        patcher = patch.object(ContentIndex, "enabled", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def names(self, query, **kwargs):
+        return [e.name for e in filter_entries(self.entries, query, **kwargs)]
+
+    def test_extension_filter_keeps_folders(self):
+        """Test the type filter applies to files only."""
+        self.assertEqual(self.names(ListingQuery(exts=('.md',))), ["numbers_dir", "notes.md"])
+
+    def test_name_search(self):
+        """Test name search filters folders and files by name."""
+        self.assertEqual(self.names(ListingQuery(search_term="notes")), ["notes.md"])
+
+    def test_content_search_text_files_only(self):
+        """Test content search reads text types but not other files."""
+        query = ListingQuery(search_term="numbers", content_search=True)
+        self.assertEqual(self.names(query), ["numbers_dir", "report.txt"])
+
+    def test_content_search_cancelled(self):
+        """Test content search stops when the caller cancels."""
+        query = ListingQuery(search_term="numbers", content_search=True)
+        self.assertIsNone(filter_entries(self.entries, query, lambda: True))
+
+
+class TestListingWorker(unittest.TestCase):
+    """Tests for ListingWorker generations."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.other_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.test_dir, "a.txt"), 'w') as f:
+            f.write("a")
+        with open(os.path.join(self.other_dir, "b.txt"), 'w') as f:
+            f.write("b")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(self.other_dir, ignore_errors=True)
+
+    def test_result_delivered(self):
+        """Test a request produces a result carrying its generation."""
+        worker = ListingWorker()
+        gen = worker.submit(self.test_dir, ListingQuery())
+        result = wait_for_result(worker)
+
+        self.assertEqual(result.generation, gen)
+        self.assertEqual([e.name for e in result.entries], ["a.txt"])
+        self.assertIsNone(result.error)
+
+    def test_stale_results_dropped(self):
+        """Test only the newest request's result is handed back."""
+        worker = ListingWorker()
+        worker.submit(self.test_dir, ListingQuery())
+        latest = worker.submit(self.other_dir, ListingQuery())
+        result = wait_for_result(worker)
+
+        self.assertEqual(result.generation, latest)
+        self.assertEqual(result.path, self.other_dir)
+
+        time.sleep(0.1)
+        self.assertIsNone(worker.poll())
+
+    def test_cancel_discards_in_flight(self):
+        """Test cancel makes pending results stale."""
+        worker = ListingWorker()
+        worker.submit(self.test_dir, ListingQuery())
+        worker.cancel()
+        time.sleep(0.2)
+        self.assertIsNone(worker.poll())
+
+    def test_error_reported(self):
+        """Test an unreadable directory is reported, not raised."""
+        worker = ListingWorker()
+        worker.submit(os.path.join(self.test_dir, "missing"), ListingQuery())
+        result = wait_for_result(worker)
+
+        self.assertIsInstance(result.error, FileNotFoundError)
+        self.assertEqual(result.entries, [])
+
+    def test_content_search_carries_index_stats(self):
+        """Test the content index's stats are fetched with the listing, off the Tk thread."""
+        stats = {"files": 3, "bytes": 4096, "pending": 0, "bytes_per_second": 0.0}
+        worker = ListingWorker()
+        with patch.object(ContentIndex, "available", return_value=True), \
+                patch.object(ContentIndex, "stats", return_value=stats) as fetch:
+            worker.submit(self.test_dir, ListingQuery())
+            self.assertIsNone(wait_for_result(worker).index_stats)
+            fetch.assert_not_called()
+            worker.submit(self.test_dir, ListingQuery(search_term="z", content_search=True))
+            self.assertEqual(wait_for_result(worker).index_stats, stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
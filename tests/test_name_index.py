@@ -0,0 +1,200 @@
+"""
+Unit tests for the persistent file name index.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_session import DirectorySessions
+from services.ignore_rules import compile_rules
+from services.name_index import IndexQuery, NameIndex, RootIndex, trigrams, workspace_roots
+
+
+def settle():
+    """Wait for the indexer thread to finish what is queued."""
+    NameIndex.executor().submit(lambda: None).result(timeout=10)
+
+
+def touch(path, content="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+class TestHelpers(unittest.TestCase):
+    """Tests for trigrams and workspace_roots."""
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("abcd"), {"abc", "bcd"})
+        self.assertEqual(trigrams("ab"), set())
+
+    def test_nested_roots_are_dropped(self):
+        top = os.path.join(os.sep, "proj")
+        config = {
+            "num_panels": 2,
+            "1": os.path.join(top, "src"),
+            "2": "",
+            "workspaces": {"w": {"paths": {"1": top}}},
+            "index_roots": [os.path.join(os.sep, "other")],
+        }
+        self.assertEqual(workspace_roots(config), [top, os.path.join(os.sep, "other")])
+
+
+class TestRootIndex(unittest.TestCase):
+    """Tests for RootIndex."""
+
+    def setUp(self):
+        self.root = os.path.join(os.sep, "proj")
+        self.index = RootIndex(self.root)
+        self.sub = os.path.join(self.root, "sub")
+        new = self.index.apply_dir(self.root, 1, {"Report_2024.xlsx": False, "sub": True})
+        self.assertEqual(new, [self.sub])
+        self.index.apply_dir(self.sub, 1, {"notes.txt": False, "report.md": False})
+
+    def search(self, term, under=None):
+        found = []
+        self.index.search(term, trigrams(term), under, 100, found)
+        return sorted(e.name for e in found)
+
+    def test_substring_search(self):
+        self.assertEqual(self.search("report"), ["Report_2024.xlsx", "report.md"])
+        self.assertEqual(self.search("port_"), ["Report_2024.xlsx"])
+        self.assertEqual(self.search("zzz"), [])
+
+    def test_short_terms_scan_all_names(self):
+        self.assertEqual(self.search("su"), ["sub"])
+
+    def test_scope_below_folder(self):
+        self.assertEqual(self.search("report", under=self.sub), ["report.md"])
+
+    def test_reread_removes_and_adds(self):
+        self.index.apply_dir(self.sub, 2, {"report.md": False, "plan.txt": False})
+        self.assertEqual(self.search("txt"), ["plan.txt"])
+        self.assertEqual(self.index.removed, 1)
+
+    def test_removed_folder_drops_its_tree(self):
+        self.index.apply_dir(self.root, 2, {"Report_2024.xlsx": False})
+        self.assertEqual(self.search("report"), ["Report_2024.xlsx"])
+        self.assertNotIn(self.sub, self.index.dir_ids)
+
+    def test_compact_keeps_results(self):
+        self.index.apply_dir(self.sub, 2, {"report.md": False})
+        self.index.compact()
+        self.assertEqual(self.index.removed, 0)
+        self.assertEqual(self.search("report"), ["Report_2024.xlsx", "report.md"])
+
+    def test_round_trip(self):
+        loaded = RootIndex.loads(self.index.dumps(), self.root, None)
+        self.assertEqual(len(loaded), len(self.index))
+        found = []
+        loaded.search("report", trigrams("report"), None, 100, found)
+        self.assertEqual(len(found), 2)
+        self.assertIsNone(RootIndex.loads(self.index.dumps(), self.root, ("x",)))
+        self.assertIsNone(RootIndex.loads(b"garbage", self.root, None))
+
+
+class TestNameIndex(unittest.TestCase):
+    """Tests for building, saving and updating the index."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.test_dir, "proj")
+        touch(os.path.join(self.root, "a", "alpha_report.txt"))
+        touch(os.path.join(self.root, "b", "beta.txt"))
+        touch(os.path.join(self.root, "node_modules", "report_lib.js"))
+        self.store = os.path.join(self.test_dir, "store")
+        for patcher in (patch.object(NameIndex, "directory", self.store),
+                        patch.object(DirectorySessions, "watch_tree", return_value=None),
+                        patch.object(NameIndex, "FLUSH_DELAY_S", 0)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.rules = compile_rules(("node_modules/",))
+
+    def tearDown(self):
+        NameIndex.configure([])
+        settle()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def names(self, term, under=None):
+        return sorted(e.name for e in NameIndex.search(term, under)[0])
+
+    def test_build_and_search(self):
+        NameIndex.configure([self.root], self.rules)
+        settle()
+        self.assertTrue(NameIndex.ready())
+        self.assertTrue(NameIndex.covers(os.path.join(self.root, "a")))
+        self.assertEqual(self.names("report"), ["alpha_report.txt"])
+        self.assertEqual(self.names(".txt", under=os.path.join(self.root, "b")), ["beta.txt"])
+
+    def test_saved_index_is_reused_and_revalidated(self):
+        NameIndex.configure([self.root], self.rules)
+        settle()
+        NameIndex.save()
+        NameIndex.configure([])
+        touch(os.path.join(self.root, "b", "gamma_report.txt"))
+
+        with patch.object(RootIndex, "loads", wraps=RootIndex.loads) as loads:
+            NameIndex.configure([self.root], self.rules)
+            settle()
+            self.assertIsNotNone(loads.call_args)
+        self.assertEqual(self.names("report"), ["alpha_report.txt", "gamma_report.txt"])
+
+    def test_watcher_changes_are_applied(self):
+        NameIndex.configure([self.root], self.rules)
+        settle()
+        path = os.path.join(self.root, "a", "delta_report.txt")
+        touch(path)
+        NameIndex.mark_changed(path)
+        settle()
+        self.assertEqual(self.names("report"), ["alpha_report.txt", "delta_report.txt"])
+
+    def test_shutdown_stops_a_running_build(self):
+        """Test shutdown does not wait for a build to finish, nor save half of it."""
+        for i in range(30):
+            touch(os.path.join(self.root, "many", f"d{i}", "f.txt"))
+        real_scandir = os.scandir
+
+        def slow_scandir(path):
+            time.sleep(0.1)
+            return real_scandir(path)
+
+        with patch.object(os, "scandir", slow_scandir):
+            NameIndex.configure([self.root], self.rules)
+            time.sleep(0.3)
+            started = time.monotonic()
+            NameIndex.shutdown()
+            # The indexer thread is joined at exit
+            settle()
+            self.assertLess(time.monotonic() - started, 1.0)
+        self.assertFalse(NameIndex.ready())
+        self.assertFalse(os.path.exists(self.store) and os.listdir(self.store))
+
+        NameIndex.configure([])
+        NameIndex.configure([self.root], self.rules)
+        settle()
+        self.assertTrue(NameIndex.ready())
+
+    def test_index_query_runs_off_thread(self):
+        NameIndex.configure([self.root], self.rules)
+        settle()
+        query = IndexQuery()
+        query.submit("beta")
+        deadline = time.monotonic() + 5
+        result = None
+        while result is None and time.monotonic() < deadline:
+            result = query.poll()
+            time.sleep(0.01)
+        entries, truncated, seconds = result
+        self.assertEqual([e.name for e in entries], ["beta.txt"])
+        self.assertFalse(truncated)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Unit tests for NavigationHistory.
+"""
+
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import FileEntry
+from services.navigation_history import HistoryEntry, NavigationHistory
+
+
+def snapshot(count):
+    return [FileEntry(f"f{i}", f"/x/f{i}", False) for i in range(count)]
+
+
+class TestNavigationHistory(unittest.TestCase):
+    """Tests for NavigationHistory."""
+
+    def test_back_and_forward(self):
+        """Test back/forward walk the visited folders in order."""
+        history = NavigationHistory()
+        history.visit(HistoryEntry("/a"))
+        history.visit(HistoryEntry("/b"))
+
+        entry = history.go_back(HistoryEntry("/c"))
+        self.assertEqual(entry.path, "/b")
+        entry = history.go_back(entry)
+        self.assertEqual(entry.path, "/a")
+        self.assertFalse(history.can_go_back)
+
+        entry = history.go_forward(entry)
+        self.assertEqual(entry.path, "/b")
+        entry = history.go_forward(entry)
+        self.assertEqual(entry.path, "/c")
+        self.assertFalse(history.can_go_forward)
+
+    def test_visit_clears_forward(self):
+        """Test navigating somewhere new drops the forward stack."""
+        history = NavigationHistory()
+        history.visit(HistoryEntry("/a"))
+        history.go_back(HistoryEntry("/b"))
+        history.visit(HistoryEntry("/a"))
+        self.assertFalse(history.can_go_forward)
+
+    def test_view_state_kept(self):
+        """Test scroll and selection come back with the entry."""
+        history = NavigationHistory()
+        history.visit(HistoryEntry("/a", snapshot(3), ("tree", 0.5), ["/x/f1"]))
+        entry = history.go_back(HistoryEntry("/b"))
+
+        self.assertEqual(entry.scroll, ("tree", 0.5))
+        self.assertEqual(entry.selection, ["/x/f1"])
+        self.assertEqual(len(entry.entries), 3)
+
+    def test_snapshots_bounded(self):
+        """Test the oldest snapshots are dropped past the entry budget."""
+        history = NavigationHistory()
+        history.MAX_SNAPSHOT_ENTRIES = 250
+        for name in "abc":
+            history.visit(HistoryEntry(f"/{name}", snapshot(100)))
+
+        kept = [e.path for e in history.back if e.entries is not None]
+        self.assertEqual(kept, ["/b", "/c"])
+        self.assertEqual(len(history.back), 3)
+
+    def test_depth_bounded(self):
+        """Test the back stack is capped at MAX_DEPTH."""
+        history = NavigationHistory()
+        for i in range(NavigationHistory.MAX_DEPTH + 10):
+            history.visit(HistoryEntry(f"/{i}"))
+        self.assertEqual(len(history.back), NavigationHistory.MAX_DEPTH)
+        self.assertEqual(history.back[0].path, "/10")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Unit tests for Office document text extraction.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import zipfile
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.content_index import ContentIndex
+from services.directory_scanner import DirectoryScanner
+from services.listing_filter import ListingQuery, content_candidates, filter_entries
+from services.office_text import OfficeText, extract_text
+from services.text_search import search_file
+
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+S = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+
+
+def write_docx(path, paragraphs, header=None):
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in paragraphs)
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("[Content_Types].xml", "<Types/>")
+        z.writestr("word/document.xml", f"<w:document {W}><w:body>{body}</w:body></w:document>")
+        if header:
+            z.writestr("word/header1.xml", f"<w:hdr {W}><w:p><w:r><w:t>{header}</w:t>"
+                                           f"<w:tab/><w:t>right</w:t></w:r></w:p></w:hdr>")
+
+
+def write_xlsx(path):
+    shared = f'<sst {S}><si><t>Region</t></si><si><r><t>North</t></r><r><t>East</t></r></si></sst>'
+    sheet1 = (f'<worksheet {S}><sheetData>'
+              '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="inlineStr"><is><t>Total</t></is></c></row>'
+              '<row r="2"><c r="A2" t="s"><v>1</v></c><c r="B2"><v>42.5</v></c></row>'
+              '</sheetData></worksheet>')
+    sheet2 = f'<worksheet {S}><sheetData><row r="1"><c r="A1" t="b"><v>1</v></c></row></sheetData></worksheet>'
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("xl/sharedStrings.xml", shared)
+        z.writestr("xl/worksheets/sheet2.xml", sheet2)
+        z.writestr("xl/worksheets/sheet1.xml", sheet1)
+
+
+class TestExtractText(unittest.TestCase):
+    """Tests for extract_text."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_docx_paragraphs_and_header(self):
+        path = os.path.join(self.test_dir, "memo.docx")
+        write_docx(path, ["Dear team,", "Budget approved."], header="ACME")
+        self.assertEqual(extract_text(path), "Dear team,\nBudget approved.\nACME\tright")
+
+    def test_xlsx_rows(self):
+        path = os.path.join(self.test_dir, "sales.xlsx")
+        write_xlsx(path)
+        self.assertEqual(extract_text(path), "Region\tTotal\nNorthEast\t42.5\n1")
+
+    def test_not_a_zip(self):
+        path = os.path.join(self.test_dir, "fake.docx")
+        with open(path, "w") as f:
+            f.write("plain text")
+        self.assertEqual(extract_text(path), "")
+
+    def test_max_chars(self):
+        path = os.path.join(self.test_dir, "long.docx")
+        write_docx(path, ["x" * 100] * 50)
+        self.assertEqual(len(extract_text(path, max_chars=250)), 250)
+
+
+class TestOfficeSearch(unittest.TestCase):
+    """Tests for the OfficeText cache and Office files in content search."""
+
+    @classmethod
+    def tearDownClass(cls):
+        OfficeText.shutdown()
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.docx = os.path.join(self.test_dir, "memo.docx")
+        write_docx(self.docx, ["Dear team,", "The Budget is approved."])
+        write_xlsx(os.path.join(self.test_dir, "sales.xlsx"))
+        OfficeText.clear()
+        patcher = patch.object(ContentIndex, "enabled", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        OfficeText.clear()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_extracted_once_per_version(self):
+        with patch.object(OfficeText, "_extract", side_effect=extract_text) as extract:
+            OfficeText.get(self.docx)
+            OfficeText.get(self.docx)
+            self.assertEqual(extract.call_count, 1)
+            write_docx(self.docx, ["Changed and longer than before"])
+            self.assertIn("Changed", OfficeText.get(self.docx))
+            self.assertEqual(extract.call_count, 2)
+
+    def test_process_pool_extraction(self):
+        self.assertIn("Budget", OfficeText.get(self.docx))
+        self.assertEqual(OfficeText.cached()["documents"], 1)
+
+    def test_search_reports_paragraph(self):
+        with patch.object(OfficeText, "_extract", side_effect=extract_text):
+            match = search_file(self.docx, "budget")[0]
+        self.assertEqual((match.line, match.snippet), (2, "The Budget is approved."))
+
+    def test_content_search_includes_office_files(self):
+        entries = DirectoryScanner.scan(self.test_dir)
+        query = ListingQuery(search_term="northeast", content_search=True)
+        self.assertEqual(len(content_candidates(entries, query)), 2)
+        with patch.object(OfficeText, "_extract", side_effect=extract_text):
+            self.assertEqual([e.name for e in filter_entries(entries, query)], ["sales.xlsx"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Unit tests for PagedLoader and capped listings.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import DirectoryScanner
+from services.listing_cache import ListingCache
+from services.listing_filter import ListingQuery
+from services.listing_worker import ListingWorker
+from services.paged_listing import ORDER_NEWEST, ORDER_OLDEST, PagedLoader
+
+
+def next_final(loader, timeout=10.0):
+    """Poll until the next final page arrives; return it."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for page in loader.poll():
+            if page.final:
+                return page
+        time.sleep(0.01)
+    raise AssertionError("page did not arrive")
+
+
+class TestPagedLoader(unittest.TestCase):
+    """Tests for PagedLoader."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        base = 1_600_000_000
+        for i in range(25):
+            path = os.path.join(self.test_dir, f"f{i:02d}.txt")
+            with open(path, 'w') as f:
+                f.write("x")
+            # f24 is the newest
+            os.utime(path, (base + i, base + i))
+        patcher = patch.object(PagedLoader, "PAGE_SIZE", 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def read_all(self, loader):
+        pages = [next_final(loader)]
+        while not pages[-1].done:
+            self.assertTrue(loader.more())
+            pages.append(next_final(loader))
+        return pages
+
+    def test_directory_order_pages(self):
+        loader = PagedLoader()
+        loader.start(self.test_dir, ListingQuery())
+        pages = self.read_all(loader)
+        self.assertEqual([len(p.entries) for p in pages][:2], [10, 10])
+        names = [e.name for p in pages for e in p.entries]
+        self.assertEqual(sorted(names), [f"f{i:02d}.txt" for i in range(25)])
+        self.assertFalse(loader.more())
+
+    def test_newest_first(self):
+        loader = PagedLoader()
+        loader.start(self.test_dir, ListingQuery(), ORDER_NEWEST)
+        pages = self.read_all(loader)
+        names = [e.name for p in pages for e in p.entries]
+        self.assertEqual(names, [f"f{i:02d}.txt" for i in reversed(range(25))])
+        self.assertEqual([len(p.entries) for p in pages], [10, 10, 5])
+        self.assertEqual(pages[-1].seen, 25)
+
+    def test_oldest_first(self):
+        loader = PagedLoader()
+        loader.start(self.test_dir, ListingQuery(), ORDER_OLDEST)
+        page = next_final(loader)
+        self.assertEqual([e.name for e in page.entries], [f"f{i:02d}.txt" for i in range(10)])
+
+    def test_filter_applies_per_page(self):
+        loader = PagedLoader()
+        loader.start(self.test_dir, ListingQuery(search_term="f1"), ORDER_NEWEST)
+        page = next_final(loader)
+        self.assertEqual([e.name for e in page.entries], [f"f1{i}.txt" for i in reversed(range(10))])
+
+    def test_provisional_pages_while_reading(self):
+        loader = PagedLoader()
+        with patch.object(PagedLoader, "PROGRESS_EVERY", 1), \
+                patch("services.paged_listing.CANCEL_CHECK_INTERVAL", 5):
+            loader.start(self.test_dir, ListingQuery(), ORDER_NEWEST)
+            deadline = time.monotonic() + 10
+            pages = []
+            while not any(p.final for p in pages) and time.monotonic() < deadline:
+                pages.extend(loader.poll())
+                time.sleep(0.01)
+        self.assertFalse(pages[0].final)
+        self.assertTrue(pages[-1].final)
+
+    def test_restart_drops_old_pages(self):
+        loader = PagedLoader()
+        loader.start(self.test_dir, ListingQuery())
+        loader.start(self.test_dir, ListingQuery(), ORDER_NEWEST)
+        page = next_final(loader)
+        self.assertEqual(page.entries[0].name, "f24.txt")
+
+    def test_missing_folder_ends_listing(self):
+        loader = PagedLoader()
+        loader.start(os.path.join(self.test_dir, "gone"), ListingQuery())
+        page = next_final(loader)
+        self.assertEqual(page.entries, [])
+        self.assertTrue(page.done)
+
+
+class TestCappedListing(unittest.TestCase):
+    """Tests for listings over the worker's entry cap."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for i in range(5):
+            with open(os.path.join(self.test_dir, f"f{i}.txt"), 'w') as f:
+                f.write("x")
+        ListingCache.invalidate()
+
+    def tearDown(self):
+        ListingCache.invalidate()
+        ListingWorker.forget_size(self.test_dir)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_cache_returns_none_over_cap(self):
+        self.assertIsNone(ListingCache.scan(self.test_dir, max_entries=3))
+        self.assertIsNone(ListingCache.get(self.test_dir))
+        self.assertEqual(len(ListingCache.scan(self.test_dir, max_entries=5)), 5)
+
+    def result(self, worker):
+        worker.submit(self.test_dir, ListingQuery())
+        deadline = time.monotonic() + 5
+        result = None
+        while result is None and time.monotonic() < deadline:
+            result = worker.poll()
+            time.sleep(0.01)
+        return result
+
+    def test_worker_reports_too_large(self):
+        worker = ListingWorker(max_entries=3)
+        with patch.object(DirectoryScanner, "entry_from_direntry") as built:
+            result = self.result(worker)
+        self.assertTrue(result.too_large)
+        self.assertEqual(result.entries, [])
+        # Found by counting names, without building (or stat'ing) entries
+        built.assert_not_called()
+
+    def test_too_large_is_remembered(self):
+        worker = ListingWorker(max_entries=3)
+        self.assertTrue(self.result(worker).too_large)
+        with patch.object(DirectoryScanner, "count") as count:
+            self.assertTrue(self.result(worker).too_large)
+        count.assert_not_called()
+        self.assertFalse(self.result(ListingWorker(max_entries=10)).too_large)
+        # The panel forgets it once a paged read finds it has shrunk
+        ListingWorker.forget_size(self.test_dir)
+        for name in os.listdir(self.test_dir)[:3]:
+            os.remove(os.path.join(self.test_dir, name))
+        self.assertEqual(len(self.result(worker).entries), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Unit tests for Prefetcher.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.listing_cache import ListingCache
+from services.prefetcher import Prefetcher
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestPrefetcher(unittest.TestCase):
+    """Tests for Prefetcher."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.sub_dir = os.path.join(self.test_dir, "sub")
+        os.makedirs(self.sub_dir)
+        with open(os.path.join(self.sub_dir, "a.txt"), 'w') as f:
+            f.write("a")
+        ListingCache.invalidate()
+        ListingCache.configure(max_listings=64, max_bytes=64 * 1024 * 1024)
+
+    def tearDown(self):
+        ListingCache.invalidate()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_prefetch_fills_cache(self):
+        """Test prefetched folders are served from the cache afterwards."""
+        Prefetcher().prefetch([self.sub_dir, self.test_dir])
+        self.assertTrue(wait_until(lambda: ListingCache.get(self.sub_dir) is not None
+                                   and ListingCache.get(self.test_dir) is not None))
+        self.assertEqual([e.name for e in ListingCache.get(self.sub_dir)], ["a.txt"])
+
+    def test_cancelled_prefetch_not_cached(self):
+        """Test a cancelled prefetch leaves nothing behind."""
+        prefetcher = Prefetcher()
+        prefetcher.cancel()
+        prefetcher.generation = -1  # every job is stale
+        prefetcher._run(0, self.sub_dir)
+        self.assertIsNone(ListingCache.get(self.sub_dir))
+
+    def test_large_folders_skipped(self):
+        """Test folders over MAX_ENTRIES are not prefetched."""
+        prefetcher = Prefetcher()
+        prefetcher.MAX_ENTRIES = 0
+        prefetcher._run(prefetcher.generation, self.sub_dir)
+        self.assertIsNone(ListingCache.get(self.sub_dir))
+
+    def test_prefetch_does_not_evict(self):
+        """Test prefetches only use spare cache capacity."""
+        ListingCache.configure(max_listings=1)
+        ListingCache.scan(self.test_dir)
+        prefetcher = Prefetcher()
+        prefetcher._run(prefetcher.generation, self.sub_dir)
+
+        self.assertIsNotNone(ListingCache.get(self.test_dir))
+        self.assertIsNone(ListingCache.get(self.sub_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Unit tests for RecursiveWalker.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ignore_rules import IgnoreRules
+from services.listing_filter import ListingQuery
+from services.recursive_walker import RecursiveWalker, relative_folder
+
+
+def walk_all(walker, timeout=10.0):
+    """Poll until the current walk finishes; return the files found."""
+    found = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        batch, done = walker.poll()
+        found.extend(batch)
+        if done:
+            return found
+        time.sleep(0.01)
+    raise AssertionError("walk did not finish")
+
+
+class TestRecursiveWalker(unittest.TestCase):
+    """Tests for RecursiveWalker."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for rel in ("a.txt", "one/b.txt", "one/two/c.pdf", "three/d.txt", ".git/hidden.txt"):
+            path = os.path.join(self.test_dir, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write("x")
+        self.query = ListingQuery((), "", False)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def rel_paths(self, entries):
+        return sorted(os.path.relpath(e.path, self.test_dir).replace(os.sep, "/") for e in entries)
+
+    def test_walks_whole_tree(self):
+        """Test every file below the root is found once, dot-folders skipped."""
+        walker = RecursiveWalker()
+        walker.start(self.test_dir, self.query)
+        found = walk_all(walker)
+
+        self.assertEqual(self.rel_paths(found), ["a.txt", "one/b.txt", "one/two/c.pdf", "three/d.txt"])
+        self.assertEqual(walker.state.dirs_scanned, 4)
+        self.assertGreater(walker.state.throughput(), 0)
+
+    def test_query_filters_files(self):
+        """Test the panel's filters apply to walked files."""
+        walker = RecursiveWalker()
+        walker.start(self.test_dir, ListingQuery((".pdf",), "", False))
+        self.assertEqual(self.rel_paths(walk_all(walker)), ["one/two/c.pdf"])
+
+    @unittest.skipIf(not hasattr(os, "symlink"), "no symlinks")
+    def test_symlink_loop_terminates(self):
+        """Test a link back to an ancestor is not followed twice."""
+        try:
+            os.symlink(self.test_dir, os.path.join(self.test_dir, "one", "loop"))
+        except OSError as e:
+            self.skipTest(f"cannot create symlink: {e}")
+        walker = RecursiveWalker()
+        walker.start(self.test_dir, self.query)
+        found = walk_all(walker)
+
+        self.assertEqual(len(found), 4)
+        self.assertEqual(walker.state.loops_skipped, 1)
+
+    def test_ignored_folders_not_entered(self):
+        """Test an ignored folder's files are never walked."""
+        ignore = IgnoreRules(["two/"]).bind(self.test_dir)
+        walker = RecursiveWalker()
+        walker.start(self.test_dir, ListingQuery(ignore=ignore))
+        self.assertEqual(self.rel_paths(walk_all(walker)), ["a.txt", "one/b.txt", "three/d.txt"])
+        self.assertEqual(walker.state.ignored, 1)
+
+    def test_restart_drops_old_results(self):
+        """Test results of a superseded walk never reach poll()."""
+        walker = RecursiveWalker()
+        walker.start(self.test_dir, self.query)
+        walker.start(os.path.join(self.test_dir, "three"), self.query)
+        self.assertEqual(self.rel_paths(walk_all(walker)), ["three/d.txt"])
+
+    def test_relative_folder(self):
+        """Test the folder column is relative to the walk root."""
+        root = os.path.join("r", "proj")
+        self.assertEqual(relative_folder(root, os.path.join(root, "a.txt")), "")
+        self.assertEqual(relative_folder(root, os.path.join(root, "x", "y", "a.txt")),
+                         os.path.join("x", "y"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for RowRecord and item_options.
+"""
+
+import unittest
+import os
+import sys
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import FileEntry
+from services.listing_columns import ListingColumns, RowRecord
+from ui.row_model import item_options, row_tag
+from ui.styles import TAG_COLORS
+from ui.tree_sync import TreeSync
+from tests.test_listing_diff import RecordingTree
+
+
+def refresh_records(n, round_no):
+    """A listing of fresh paths, some of them colour-tagged."""
+    entries = [FileEntry(f"file{i}.txt", f"/data/run{round_no}/file{i}.txt", False, i, 10 ** 18)
+               for i in range(n)]
+    colors = list(TAG_COLORS)
+    return ListingColumns.from_entries(
+        entries, lambda path: (colors[len(path) % len(colors)] if path.endswith("0.txt") else None, False))
+
+
+class TestRowRecord(unittest.TestCase):
+    """Tests for RowRecord."""
+
+    def test_record_is_signature(self):
+        """Test records compare by value so unchanged rows are not redrawn."""
+        entry = FileEntry("a.txt", "/d/a.txt", False, 10, 5)
+        same = FileEntry("a.txt", "/d/a.txt", False, 10, 5)
+        self.assertEqual(RowRecord.from_entry(entry), RowRecord.from_entry(same))
+        self.assertNotEqual(RowRecord.from_entry(entry), RowRecord.from_entry(entry, "red"))
+
+    def test_only_colour_tags(self):
+        """Test rows carry no path tags and unknown colours are ignored."""
+        entry = FileEntry("a.txt", "/d/a.txt", False, 10, 5)
+        self.assertEqual(item_options(RowRecord.from_entry(entry))["tags"], ())
+        self.assertEqual(item_options(RowRecord.from_entry(entry, *row_tag({"color": "red"})))["tags"],
+                         ("red",))
+        self.assertEqual(row_tag({"color": "/d/a.txt"}), (None, False))
+        folder = FileEntry("sub", "/d/sub", True)
+        self.assertEqual(item_options(RowRecord.from_entry(folder, "red"))["tags"], ())
+
+    def test_note_marker_and_columns(self):
+        """Test display text and columns match the old rendering."""
+        entry = FileEntry("a.txt", "/d/a.txt", False, 1024 * 1024, -1)
+        options = item_options(RowRecord.from_entry(entry, *row_tag({"note": "hi"})))
+        self.assertEqual(options["text"], "a.txt 📝")
+        self.assertEqual(options["values"], ["1.00 MB", "Unknown"])
+
+    def test_no_tag_growth_over_refreshes(self):
+        """Test 1,000 refreshes of new paths use only TAG_COLORS tags."""
+        tree = RecordingTree()
+        sync = TreeSync(tree)
+        for round_no in range(1000):
+            records = refresh_records(20, round_no)
+            sync.apply(records, lambda key: item_options(records[key]))
+        used = {tag for item in tree.items.values() for tag in item["tags"]}
+        self.assertLessEqual(used, set(TAG_COLORS))
+        self.assertEqual(len(tree.items), 20)
+
+
+class TestTkTagTable(unittest.TestCase):
+    """The same leak check against a real Treeview (needs a display)."""
+
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError as e:
+            self.skipTest(f"no display: {e}")
+        self.tree = ttk.Treeview(self.root, columns=("size", "date"))
+
+    def tearDown(self):
+        if hasattr(self, "root"):
+            self.root.destroy()
+
+    def test_tag_table_bounded(self):
+        """Test the Tk tag table does not grow with the paths shown."""
+        sync = TreeSync(self.tree)
+        for round_no in range(1000):
+            records = refresh_records(20, round_no)
+            sync.apply(records, lambda key: item_options(records[key]))
+        tags = set(self.root.tk.splitlist(self.tree.tk.call(self.tree, "tag", "names")))
+        self.assertLessEqual(tags, set(TAG_COLORS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Unit tests for slow filesystem handling (SlowPaths, StatFiller).
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import MTIME_PENDING, MTIME_UNAVAILABLE, DirectoryScanner, FileEntry
+from services.listing_cache import ListingCache
+from services.listing_filter import ListingQuery
+from services.listing_worker import ListingWorker
+from services.slow_fs import SlowPaths, StatFiller
+
+
+def poll_until(filler, count, timeout=10.0):
+    """Poll until ``count`` entries were answered or timed out."""
+    done, timed_out = [], []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        d, t = filler.poll()
+        done.extend(d)
+        timed_out.extend(t)
+        if len(done) + len(timed_out) >= count:
+            return done, timed_out
+        time.sleep(0.01)
+    raise AssertionError("stats did not finish")
+
+
+class TestSlowPaths(unittest.TestCase):
+    """Tests for SlowPaths."""
+
+    def setUp(self):
+        SlowPaths.forget()
+        SlowPaths.configure()
+
+    def tearDown(self):
+        SlowPaths.forget()
+        SlowPaths.configure()
+
+    def test_unmeasured_path_is_fast(self):
+        self.assertFalse(SlowPaths.is_slow(os.path.join(os.sep, "share", "x")))
+
+    def test_slow_measurement_applies_below(self):
+        share = os.path.join(os.sep, "share")
+        SlowPaths.record(share, 2.0, calls=10)
+        self.assertTrue(SlowPaths.is_slow(share))
+        self.assertTrue(SlowPaths.is_slow(os.path.join(share, "a", "b")))
+        self.assertFalse(SlowPaths.is_slow(os.path.join(os.sep, "local")))
+
+    def test_nearest_measurement_wins(self):
+        share = os.path.join(os.sep, "share")
+        SlowPaths.record(share, 2.0, calls=10)
+        SlowPaths.record(os.path.join(share, "cached"), 0.0001, calls=10)
+        self.assertFalse(SlowPaths.is_slow(os.path.join(share, "cached", "x")))
+
+    def test_moving_average_recovers(self):
+        share = os.path.join(os.sep, "share")
+        SlowPaths.record(share, 0.02)
+        self.assertTrue(SlowPaths.is_slow(share))
+        for _ in range(5):
+            SlowPaths.record(share, 0.0001)
+        self.assertFalse(SlowPaths.is_slow(share))
+
+    def test_forced_paths(self):
+        share = os.path.join(os.sep, "nas")
+        SlowPaths.configure([share])
+        self.assertTrue(SlowPaths.is_slow(os.path.join(share, "photos")))
+
+
+class TestNamesFirstListing(unittest.TestCase):
+    """Tests for listings without file stats."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.test_dir, "a.txt"), 'w') as f:
+            f.write("abc")
+        os.makedirs(os.path.join(self.test_dir, "sub"))
+        ListingCache.invalidate()
+        SlowPaths.forget()
+
+    def tearDown(self):
+        ListingCache.invalidate()
+        SlowPaths.forget()
+        SlowPaths.configure()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_scan_without_stats(self):
+        entries = {e.name: e for e in DirectoryScanner.scan(self.test_dir, stat_files=False)}
+        self.assertEqual(entries["a.txt"].mtime_ns, MTIME_PENDING)
+        self.assertEqual(entries["a.txt"].size_str, "…")
+        self.assertTrue(entries["sub"].is_dir)
+
+    def test_unavailable_display(self):
+        entry = FileEntry("a.txt", "a.txt", False, 0, MTIME_UNAVAILABLE)
+        self.assertEqual((entry.size_str, entry.mod_str), ("unavailable", "unavailable"))
+
+    def test_worker_lists_slow_folder_by_name(self):
+        SlowPaths.configure([self.test_dir])
+        worker = ListingWorker()
+        worker.submit(self.test_dir, ListingQuery())
+        deadline = time.monotonic() + 5
+        result = None
+        while result is None and time.monotonic() < deadline:
+            result = worker.poll()
+            time.sleep(0.01)
+        files = [e for e in result.entries if not e.is_dir]
+        self.assertEqual([e.mtime_ns for e in files], [MTIME_PENDING])
+
+    def test_full_scan_records_latency(self):
+        ListingCache.scan(self.test_dir)
+        self.assertFalse(SlowPaths.is_slow(self.test_dir))
+        self.assertIn(os.path.normpath(self.test_dir), SlowPaths._latency)
+
+
+class TestStatFiller(unittest.TestCase):
+    """Tests for StatFiller."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.entries = []
+        for name, content in [("a.txt", "a"), ("b.txt", "bbbb")]:
+            path = os.path.join(self.test_dir, name)
+            with open(path, 'w') as f:
+                f.write(content)
+            self.entries.append(FileEntry(name, path, False, 0, MTIME_PENDING))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_fills_sizes_and_dates(self):
+        filler = StatFiller()
+        filler.fill(self.entries)
+        done, timed_out = poll_until(filler, 2)
+        self.assertEqual(timed_out, [])
+        sizes = {entry.name: size for entry, size, mtime_ns in done}
+        self.assertEqual(sizes, {"a.txt": 1, "b.txt": 4})
+        self.assertTrue(all(mtime_ns > 0 for _, _, mtime_ns in done))
+        self.assertFalse(filler.pending)
+
+    def test_missing_file_is_unavailable(self):
+        filler = StatFiller()
+        filler.fill([FileEntry("gone", os.path.join(self.test_dir, "gone"), False, 0, MTIME_PENDING)])
+        (entry, size, mtime_ns), = poll_until(filler, 1)[0]
+        self.assertEqual(mtime_ns, MTIME_UNAVAILABLE)
+
+    def test_hung_stat_times_out(self):
+        release = threading.Event()
+        real_stat = os.stat
+
+        def hanging_stat(path, *args, **kwargs):
+            if path.endswith("b.txt"):
+                release.wait(10)
+            return real_stat(path, *args, **kwargs)
+
+        filler = StatFiller()
+        with patch.object(StatFiller, "STAT_TIMEOUT_SECONDS", 0.2), \
+                patch("services.slow_fs.os.stat", hanging_stat):
+            filler.fill(self.entries)
+            done, timed_out = poll_until(filler, 2)
+            release.set()
+        self.assertEqual([e.name for e, _, _ in done], ["a.txt"])
+        self.assertEqual([e.name for e in timed_out], ["b.txt"])
+        self.assertFalse(filler.pending)
+
+    def test_queued_stats_time_out_behind_hung_workers(self):
+        """Test entries that never start (every worker hung) still time out."""
+        release = threading.Event()
+        real_stat = os.stat
+
+        def hanging_stat(path, *args, **kwargs):
+            release.wait(10)
+            return real_stat(path, *args, **kwargs)
+
+        entries = [FileEntry(f"f{i}", os.path.join(self.test_dir, f"f{i}"), False, 0, MTIME_PENDING)
+                   for i in range(StatFiller.MAX_WORKERS * 5)]
+        filler = StatFiller()
+        with patch.object(StatFiller, "STAT_TIMEOUT_SECONDS", 0.2), \
+                patch("services.slow_fs.os.stat", hanging_stat):
+            try:
+                filler.fill(entries)
+                done, timed_out = poll_until(filler, len(entries), timeout=3)
+            finally:
+                release.set()
+        self.assertEqual(done, [])
+        self.assertEqual(len(timed_out), len(entries))
+        self.assertFalse(filler.pending)
+
+    def test_refill_drops_older_request(self):
+        filler = StatFiller()
+        filler.fill(self.entries)
+        filler.fill(self.entries[:1])
+        time.sleep(0.2)
+        done, _ = poll_until(filler, 1)
+        self.assertEqual([e.name for e, _, _ in done], ["a.txt"])
+
+
+if __name__ == '__main__':
+    unittest.main()
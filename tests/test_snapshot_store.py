@@ -0,0 +1,79 @@
+"""
+Unit tests for SnapshotStore.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.directory_scanner import DirectoryScanner
+from services.snapshot_store import SnapshotStore
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Tests for SnapshotStore."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.store_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.test_dir, "sub"))
+        with open(os.path.join(self.test_dir, "a.txt"), 'w') as f:
+            f.write("hello")
+        self._saved_dir = SnapshotStore.directory
+        SnapshotStore.directory = self.store_dir
+
+    def tearDown(self):
+        SnapshotStore.directory = self._saved_dir
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Test a saved listing loads back unchanged."""
+        entries = DirectoryScanner.scan(self.test_dir)
+        self.assertTrue(SnapshotStore.save(self.test_dir, entries))
+
+        loaded = SnapshotStore.load(self.test_dir)
+        self.assertEqual(
+            [(e.name, e.path, e.is_dir, e.size, e.mtime_ns) for e in loaded],
+            [(e.name, e.path, e.is_dir, e.size, e.mtime_ns) for e in entries]
+        )
+
+    def test_missing_or_corrupt_snapshot(self):
+        """Test unknown folders and damaged files load as None."""
+        self.assertIsNone(SnapshotStore.load(self.test_dir))
+        SnapshotStore.save(self.test_dir, [])
+        for name in os.listdir(self.store_dir):
+            with open(os.path.join(self.store_dir, name), 'wb') as f:
+                f.write(b"not gzip")
+        self.assertIsNone(SnapshotStore.load(self.test_dir))
+
+    def test_oversized_listing_not_saved(self):
+        """Test listings over MAX_ENTRIES replace any old snapshot with none."""
+        entries = DirectoryScanner.scan(self.test_dir)
+        SnapshotStore.save(self.test_dir, entries)
+        original = SnapshotStore.MAX_ENTRIES
+        SnapshotStore.MAX_ENTRIES = 1
+        try:
+            self.assertFalse(SnapshotStore.save(self.test_dir, entries))
+        finally:
+            SnapshotStore.MAX_ENTRIES = original
+        self.assertIsNone(SnapshotStore.load(self.test_dir))
+
+    def test_prune_bounds_files(self):
+        """Test the snapshot store stays bounded at MAX_FILES."""
+        original = SnapshotStore.MAX_FILES
+        SnapshotStore.MAX_FILES = 2
+        try:
+            for i in range(4):
+                SnapshotStore.save(os.path.join(self.test_dir, str(i)), [])
+        finally:
+            SnapshotStore.MAX_FILES = original
+        self.assertEqual(len(os.listdir(self.store_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
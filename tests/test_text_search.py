@@ -0,0 +1,75 @@
+"""
+Unit tests for the mmap-based text search.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import sys
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import text_search
+from services.listing_filter import file_contains
+from services.text_search import detect_encoding, search_buffer, search_file
+
+
+class TestSearchFile(unittest.TestCase):
+    """Tests for search_file."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write(self, name, text, encoding="utf-8"):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "w", encoding=encoding, newline="") as f:
+            f.write(text)
+        return path
+
+    def test_line_and_snippet(self):
+        path = self.write("a.log", "first\nsecond\n  the NEEDLE is here\r\nlast needle\n")
+        matches = search_file(path, "needle", max_matches=5)
+        self.assertEqual([(m.line, m.snippet) for m in matches],
+                         [(3, "the NEEDLE is here"), (4, "last needle")])
+
+    def test_match_past_old_read_limit(self):
+        path = self.write("big.log", ("x" * 99 + "\n") * 5000 + "Deep Match\n")
+        matches = search_file(path, "deep match")
+        self.assertEqual(matches[0].line, 5001)
+        self.assertTrue(file_contains(path, "deep match"))
+
+    def test_size_ceiling(self):
+        path = self.write("big.log", "a" * 1000 + "needle")
+        self.assertEqual(search_file(path, "needle", limit=1000), [])
+        self.assertEqual(len(search_file(path, "needle", limit=2000)), 1)
+
+    def test_utf16_with_bom(self):
+        path = self.write("w.txt", "héllo\nGRÜSSE aus Köln\n", encoding="utf-16")
+        self.assertEqual(search_file(path, "köln")[0].line, 2)
+        self.assertEqual(search_file(path, "aus")[0].snippet, "GRÜSSE aus Köln")
+
+    def test_utf16_without_bom(self):
+        path = self.write("w.txt", "plain ascii text\nwith a Needle\n", encoding="utf-16-le")
+        self.assertEqual(detect_encoding(open(path, "rb").read(512)), ("utf-16-le", 0))
+        self.assertEqual(search_file(path, "needle")[0].line, 2)
+
+    def test_non_ascii_term_in_utf8(self):
+        path = self.write("u.txt", "Straße\nÄRGER im Büro\n")
+        self.assertEqual(search_file(path, "ärger im büro")[0].line, 2)
+
+    def test_matches_across_chunks(self):
+        with patch.object(text_search, "CHUNK_BYTES", 4):
+            matches = search_buffer(b"abNEEDLEcdneedleneedle\nxxneedle", "needle", max_matches=10)
+        self.assertEqual([m.offset for m in matches], [2, 10, 16, 25])
+
+    def test_empty_file(self):
+        self.assertEqual(search_file(self.write("e.txt", ""), "x"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
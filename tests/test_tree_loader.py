@@ -0,0 +1,145 @@
+"""
+Unit tests for NodeLoader and NodeBudget.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.listing_filter import ListingQuery
+from services.tree_loader import NodeBudget, NodeLoader, is_within
+
+
+def wait_for(loader, count, timeout=10.0):
+    """Poll until ``count`` results arrived; return them."""
+    found = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        found.extend(loader.poll())
+        if len(found) >= count:
+            return found
+        time.sleep(0.01)
+    raise AssertionError("loader did not finish")
+
+
+class TestNodeLoader(unittest.TestCase):
+    """Tests for NodeLoader."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for rel in ("one/a.txt", "one/b.pdf", "two/c.txt"):
+            path = os.path.join(self.test_dir, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write("x")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_loads_each_node_independently(self):
+        loader = NodeLoader()
+        one = os.path.join(self.test_dir, "one")
+        two = os.path.join(self.test_dir, "two")
+        loader.submit(one, ListingQuery())
+        loader.submit(two, ListingQuery())
+        results = {r.path: r for r in wait_for(loader, 2)}
+        self.assertEqual(sorted(e.name for e in results[one].entries), ["a.txt", "b.pdf"])
+        self.assertEqual([e.name for e in results[two].entries], ["c.txt"])
+        self.assertFalse(loader.pending)
+
+    def test_query_is_applied(self):
+        loader = NodeLoader()
+        one = os.path.join(self.test_dir, "one")
+        loader.submit(one, ListingQuery(exts=(".pdf",)))
+        result, = wait_for(loader, 1)
+        self.assertEqual([e.name for e in result.entries], ["b.pdf"])
+
+    def test_resubmit_drops_older_result_for_same_node(self):
+        loader = NodeLoader()
+        one = os.path.join(self.test_dir, "one")
+        loader.submit(one, ListingQuery(exts=(".txt",)))
+        loader.submit(one, ListingQuery(exts=(".pdf",)))
+        time.sleep(0.2)
+        results = wait_for(loader, 1)
+        self.assertEqual(len(results), 1)
+        self.assertEqual([e.name for e in results[0].entries], ["b.pdf"])
+
+    def test_cancelled_node_is_dropped(self):
+        loader = NodeLoader()
+        one = os.path.join(self.test_dir, "one")
+        two = os.path.join(self.test_dir, "two")
+        loader.submit(one, ListingQuery())
+        loader.submit(two, ListingQuery())
+        loader.cancel(one)
+        time.sleep(0.2)
+        self.assertEqual([r.path for r in wait_for(loader, 1)], [two])
+
+    def test_missing_folder_reports_error(self):
+        loader = NodeLoader()
+        loader.submit(os.path.join(self.test_dir, "gone"), ListingQuery())
+        result, = wait_for(loader, 1)
+        self.assertIsInstance(result.error, OSError)
+
+
+A, B, C = (os.path.join(os.sep, name) for name in "abc")
+AX = os.path.join(A, "x")
+
+
+class TestNodeBudget(unittest.TestCase):
+    """Tests for NodeBudget."""
+
+    def test_is_within(self):
+        root = os.path.join("x", "a")
+        self.assertTrue(is_within(root, root))
+        self.assertTrue(is_within(os.path.join(root, "b"), root))
+        self.assertFalse(is_within(os.path.join("x", "ab"), root))
+
+    def test_within_budget_unloads_nothing(self):
+        budget = NodeBudget(100)
+        budget.loaded(A, 60)
+        budget.closed(A)
+        self.assertEqual(budget.to_unload(), [])
+
+    def test_oldest_collapsed_unloaded_first(self):
+        budget = NodeBudget(100)
+        for path in (A, B, C):
+            budget.loaded(path, 60)
+            budget.closed(path)
+        self.assertEqual(budget.to_unload(), [A, B])
+
+    def test_reexpanded_node_is_kept(self):
+        budget = NodeBudget(100)
+        for path in (A, B):
+            budget.loaded(path, 60)
+            budget.closed(path)
+        budget.expanded(A)
+        self.assertEqual(budget.to_unload(), [])
+
+    def test_nested_collapsed_nodes_count_with_their_ancestor(self):
+        budget = NodeBudget(100)
+        budget.loaded(A, 10)
+        budget.loaded(AX, 80)
+        budget.closed(AX)
+        budget.closed(A)
+        budget.loaded(B, 50)
+        budget.closed(B)
+        # /a hides 90 rows including /a/x; unloading it is enough
+        self.assertEqual(budget.to_unload(), [A])
+
+    def test_forget_drops_descendants(self):
+        budget = NodeBudget(100)
+        budget.loaded(A, 10)
+        budget.loaded(AX, 80)
+        budget.closed(AX)
+        budget.forget(A)
+        self.assertEqual(budget.rows, {})
+        self.assertEqual(list(budget.collapsed), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Unit tests for TreeNodes expand/collapse handling.
+
+The Treeview is a MagicMock (no Tk root is needed) and the loader is
+replaced so the tests can see what gets re-listed.
+"""
+
+import unittest
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.listing_filter import ListingQuery
+from ui.tree_nodes import TreeNode, TreeNodes
+from ui.tree_sync import TreeSync
+
+
+FOLDER = os.path.join(os.sep, "data", "sub")
+
+
+class TestReopen(unittest.TestCase):
+    """Tests for reopening a node whose children are already loaded."""
+
+    def setUp(self):
+        self.tree = MagicMock()
+        self.tree.focus.return_value = "I001"
+        self.watch = MagicMock()
+        self.nodes = TreeNodes(self.tree, lambda iid: FOLDER if iid == "I001" else None,
+                               ListingQuery, MagicMock(), MagicMock(), MagicMock(),
+                               watch=self.watch, unwatch=MagicMock())
+        self.nodes.loader = MagicMock()
+        self.nodes.enable()
+        self.nodes.nodes[FOLDER] = TreeNode(FOLDER, "I001", TreeSync(self.tree, "I001"))
+
+    def test_reopened_node_is_relisted(self):
+        """Test changes made while a node was collapsed (and unwatched) are picked up."""
+        self.nodes._on_close()
+        self.assertNotIn(FOLDER, self.nodes.watched)
+        self.nodes._on_open()
+        self.nodes.loader.submit.assert_called_once()
+        self.assertEqual(self.nodes.loader.submit.call_args[0][0], FOLDER)
+        self.tree.after.assert_called()
+        self.assertIn(FOLDER, self.nodes.watched)
+
+
+if __name__ == '__main__':
+    unittest.main()
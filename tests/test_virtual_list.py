@@ -0,0 +1,68 @@
+"""
+Tests for the windowed VirtualList (need a display; skipped without one).
+"""
+
+import unittest
+import os
+import sys
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.virtual_list import VirtualList
+
+
+class TestVirtualList(unittest.TestCase):
+    """Tests for VirtualList against a real Treeview."""
+
+    def setUp(self):
+        try:
+            self.root = tk.Tk()
+        except tk.TclError as e:
+            self.skipTest(f"no display: {e}")
+        self.root.geometry("400x300")
+        self.tree = ttk.Treeview(self.root, columns=("size",))
+        self.vsb = ttk.Scrollbar(self.root, orient="vertical")
+        self.tree.pack(fill="both", expand=True)
+        self.root.update()
+
+        self.vlist = VirtualList(self.tree, self.vsb)
+        self.vlist.enable()
+        self.rows = {f"/d/f{i:06d}": i for i in range(200000)}
+        self.vlist.set_rows(self.rows, lambda k: {"text": k, "values": [self.rows[k]]})
+
+    def tearDown(self):
+        if hasattr(self, "root"):
+            self.root.destroy()
+
+    def test_only_window_materialized(self):
+        """Test the tree holds a window, not the whole listing."""
+        count = len(self.tree.get_children())
+        self.assertLessEqual(count, self.vlist._visible_rows() + VirtualList.OVERSCAN)
+        self.assertGreater(count, 0)
+
+    def test_scroll_moves_window(self):
+        """Test scrolling renders rows from further down the model."""
+        self.vlist.yview("moveto", "0.5")
+        first = self.tree.get_children()[0]
+        self.assertEqual(self.tree.item(first, "text"), self.vlist.keys[self.vlist.offset])
+        self.assertGreaterEqual(self.vlist.offset, 99000)
+
+    def test_selection_survives_scrolling(self):
+        """Test a selected row stays selected after leaving the window."""
+        first = self.tree.get_children()[0]
+        self.tree.selection_set(first)
+        self.root.update()
+        self.vlist.scroll_to(1000)
+        self.root.update()
+        self.assertEqual(self.vlist.selected_keys(), ["/d/f000000"])
+
+    def test_disable_restores_tree(self):
+        """Test leaving virtual mode empties the window."""
+        self.vlist.disable()
+        self.assertEqual(self.tree.get_children(), ())
+
+
+if __name__ == '__main__':
+    unittest.main()
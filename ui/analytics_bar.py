@@ -7,9 +7,11 @@ It shows file count, total size, and a visual bar of file type distribution.
 
 import os
 import tkinter as tk
-from typing import List, Tuple, Dict
+from typing import Iterable, List, Tuple, Dict
 import customtkinter as ctk
 
+from services.listing_columns import ListingColumns
+
 from ui.styles import TYPE_COLORS, DEFAULT_TYPE_COLOR
 
 
@@ -33,6 +35,8 @@ class AnalyticsBar(ctk.CTkFrame):
         
         self.theme_data = theme_data
         self.base_font_size = base_font_size
+        self._note = ""
+        self.start_stream()
         
         # Canvas for distribution bar (increased height for visibility)
         self.stats_canvas = tk.Canvas(
@@ -58,15 +62,63 @@ class AnalyticsBar(ctk.CTkFrame):
         Args:
             files_data: List of tuples (name, size_str, date, size_bytes)
         """
-        total_files = len(files_data)
-        total_size_bytes = sum(f[3] for f in files_data)
-        total_size_mb = total_size_bytes / (1024 * 1024)
+        self.start_stream()
+        self._accumulate(files_data)
+        self._render(partial=False)
+
+    def start_stream(self) -> None:
+        """Reset the totals before files are added progressively."""
+        self._type_counts: Dict[str, int] = {}
+        self._total_files = 0
+        self._total_size_bytes = 0
+
+    def add_files(self, files_data: List[Tuple[str, str, str, int]]) -> None:
+        """Add a batch of files to a progressive update.
+        
+        Args:
+            files_data: List of tuples (name, size_str, date, size_bytes)
+        """
+        self._accumulate(files_data)
+        self._render(partial=True)
+
+    def update_listing(self, listing: ListingColumns) -> None:
+        """Update analytics from a panel's columnar listing (folders are skipped).
+        
+        Args:
+            listing: The listing shown in the panel
+        """
+        self.start_stream()
+        self._add_stats(*listing.file_stats())
+        self._render(partial=False)
+
+    def add_rows(self, listing: ListingColumns, indices: Iterable[int]) -> None:
+        """Add some rows of a listing to a progressive update.
         
-        # Calculate type distribution
-        type_counts: Dict[str, int] = {}
+        Args:
+            listing: The listing being shown
+            indices: Row numbers that were just displayed
+        """
+        self._add_stats(*listing.file_stats(indices))
+        self._render(partial=True)
+
+    def _accumulate(self, files_data: List[Tuple[str, str, str, int]]) -> None:
+        type_counts = {}
         for f in files_data:
             ext = os.path.splitext(f[0])[1].lower()
             type_counts[ext] = type_counts.get(ext, 0) + 1
+        self._add_stats(len(files_data), sum(f[3] for f in files_data), type_counts)
+
+    def _add_stats(self, count: int, size_bytes: int, type_counts: Dict[str, int]) -> None:
+        totals = self._type_counts
+        for ext, n in type_counts.items():
+            totals[ext] = totals.get(ext, 0) + n
+        self._total_files += count
+        self._total_size_bytes += size_bytes
+
+    def _render(self, partial: bool) -> None:
+        total_files = self._total_files
+        total_size_mb = self._total_size_bytes / (1024 * 1024)
+        type_counts = self._type_counts
         
         # Sort by frequency
         sorted_types = sorted(type_counts.items(), key=lambda x: x[1], reverse=True)
@@ -80,12 +132,29 @@ class AnalyticsBar(ctk.CTkFrame):
         display_text = f"{total_files} Files ({total_size_mb:,.2f} MB)"
         if type_str:
             display_text += f"  •  {type_str}"
+        if self._note:
+            display_text += f"  •  {self._note}"
+        if partial:
+            display_text += "  …"
         
         self.stats_label.configure(text=display_text)
         
         # Update visual bar
         self._draw_distribution_bar(type_counts, total_files)
 
+    def set_note(self, note: str) -> None:
+        """Show an extra figure (e.g. scan throughput) after the totals."""
+        self._note = note
+
+    def show_note(self, note: str) -> None:
+        """Replace the note and redraw the current totals with it."""
+        self._note = note
+        self._render(partial=False)
+
+    def show_loading(self) -> None:
+        """Indicate that the panel's listing is still being read."""
+        self.stats_label.configure(text="Loading...")
+
     def _draw_distribution_bar(self, type_counts: Dict[str, int], total_files: int) -> None:
         """Draw the colored distribution bar.
         
@@ -5,13 +5,28 @@ import customtkinter as ctk
 from tkinter import ttk, messagebox
 
 from config.manager import ConfigManager
+from services.listing_cache import ListingCache
+from services.slow_fs import SlowPaths
+from services.content_index import ContentIndex
+from services.directory_session import DirectorySessions
+from services.ignore_rules import rules_from_config
+from services.goto_index import GotoIndex
+from services.name_index import NameIndex, workspace_roots
+from services.office_text import OfficeText
+from services.tree_loader import is_within
 from ui.styles import THEMES, ACCENT_COLORS, TAG_COLORS
 from ui.folder_card import FolderCard
 from ui.tagged_files_dialog import TaggedFilesDialog
+from ui.ignore_rules_dialog import IgnoreRulesDialog
+from ui.global_search_window import GlobalSearchWindow
+from ui.goto_palette import GotoPalette
 import json
 from utils.files import open_path
 
 class WorkDashboard(ctk.CTk):
+    # How often the Go to file index looks for name index changes
+    GOTO_WARM_INTERVAL_MS = 5000
+
     def __init__(self):
         super().__init__()
         self.title("Professional Work Dashboard")
@@ -33,6 +48,18 @@ class WorkDashboard(ctk.CTk):
         self.base_font_size = self.config_data.get("font_size", 16)
         
         self.focused_panel_id = None 
+
+        # Listing cache bounds (see services/listing_cache.py)
+        ListingCache.configure(
+            max_listings=self.config_data.get("listing_cache_max_listings"),
+            max_bytes=self.config_data.get("listing_cache_max_mb", 64) * 1024 * 1024
+        )
+        # Folders always listed names-first (see services/slow_fs.py)
+        SlowPaths.configure(self.config_data.get("slow_paths"))
+        # Full-text index behind "Content" search (see services/content_index.py)
+        ContentIndex.configure(enabled=self.config_data.get("content_index", True))
+        # Folders searched by the panels' "This tree"/"All workspaces" scopes
+        self.configure_name_index()
         
         self.apply_theme(self.current_theme)
         
@@ -51,6 +78,7 @@ class WorkDashboard(ctk.CTk):
         # Global Search with debouncing
         self.global_search_var = ctk.StringVar()
         self.global_search_after_id = None
+        self.global_search_window = None
         self.global_search_var.trace_add("write", self._on_global_search_change)
         
         self.global_search_entry = ctk.CTkEntry(self.toolbar, textvariable=self.global_search_var,
@@ -81,6 +109,9 @@ class WorkDashboard(ctk.CTk):
         self.btn_tagged = ctk.CTkButton(self.toolbar, text="Tagged Files", command=self.show_tagged_files, width=140, height=36, font=("Segoe UI", 14))
         self.btn_tagged.pack(side="right", padx=3)
 
+        self.btn_ignore = ctk.CTkButton(self.toolbar, text="Ignore Rules", command=self.show_ignore_rules, width=130, height=36, font=("Segoe UI", 14))
+        self.btn_ignore.pack(side="right", padx=3)
+
         # Main Container (ZERO PADDING)
         self.main_container = ctk.CTkFrame(self, fg_color=THEMES[self.current_theme]["bg"])
         self.main_container.grid(row=1, column=0, sticky="nsew")
@@ -89,6 +120,12 @@ class WorkDashboard(ctk.CTk):
         self.update_global_styles()
         self.setup_layout(self.num_panels, self.layout_mode)
 
+        # Ctrl+P "Go to file" over every workspace file
+        self.goto_palette = None
+        self.bind_all("<Control-p>", lambda e: self.show_goto_palette())
+        self.bind_all("<Control-P>", lambda e: self.show_goto_palette())
+        self._warm_goto_index()
+
     def _on_global_search_change(self, *args):
         """Debounced global search handler - waits 300ms after user stops typing"""
         if self.global_search_after_id:
@@ -96,11 +133,47 @@ class WorkDashboard(ctk.CTk):
         self.global_search_after_id = self.after(300, self.on_global_search)
 
     def on_global_search(self):
-        """Apply global search term to all panels"""
-        term = self.global_search_var.get()
-        for panel in self.panels:
-            panel.search_var.set(term)
-            # refresh_files is triggered automatically by the trace on panel.search_var
+        """Search every panel's folder at once; results collect in one window."""
+        term = self.global_search_var.get().strip()
+        window = self.global_search_window
+        if window is None or not window.winfo_exists():
+            if not term:
+                return
+            window = self.global_search_window = GlobalSearchWindow(
+                self, self.config_data, self._panel_paths, lambda: rules_from_config(self.config_data),
+                self.reveal_in_panel, self.save_config, self.base_font_size)
+        window.run(term)
+
+    def _panel_paths(self):
+        """(panel id, folder) of every panel, including those hidden by focus mode."""
+        return [(str(i), self.config_data.get(str(i), "")) for i in range(1, self.num_panels + 1)]
+
+    def reveal_in_panel(self, path):
+        """Show a search or Go to file result in the panel already nearest to it."""
+        if not self.panels:
+            return
+        folder = os.path.normcase(os.path.dirname(path))
+
+        def distance(panel):
+            current = os.path.normcase(os.path.normpath(panel.current_path)) if panel.current_path else ""
+            if current == folder:
+                return 0
+            return 1 if current and is_within(folder, current) else 2
+
+        min(self.panels, key=distance).reveal(path)
+
+    def show_goto_palette(self):
+        """Open (or bring back) the Ctrl+P palette."""
+        palette = self.goto_palette
+        if palette is None or not palette.winfo_exists():
+            palette = self.goto_palette = GotoPalette(self, self.reveal_in_panel, self.base_font_size)
+        palette.lift()
+        palette.entry.focus_set()
+
+    def _warm_goto_index(self):
+        """Keep the palette's index in step with the name index (see GotoIndex.warm)."""
+        GotoIndex.warm()
+        self.after(self.GOTO_WARM_INTERVAL_MS, self._warm_goto_index)
 
     def apply_theme(self, t_name):
         t = THEMES[t_name]
@@ -220,8 +293,13 @@ class WorkDashboard(ctk.CTk):
         if name:
             ws_data = {"num_panels": self.num_panels, "layout_mode": self.layout_mode, "paths": {str(i+1): self.config_data.get(str(i+1), "") for i in range(self.num_panels)}}
             if "workspaces" not in self.config_data: self.config_data["workspaces"] = {}
+            # Keep the ignore rules of the workspace being saved (or overwritten)
+            source = self.config_data["workspaces"].get(name) or self.config_data["workspaces"].get(self.config_data.get("active_workspace")) or {}
+            ws_data["ignore_patterns"] = list(source.get("ignore_patterns", []))
             self.config_data["workspaces"][name] = ws_data
+            self.config_data["active_workspace"] = name
             self.save_config()
+            self.configure_name_index()
             w.destroy()
 
     def load_workspace(self, name, w):
@@ -229,13 +307,19 @@ class WorkDashboard(ctk.CTk):
         self.num_panels = ws["num_panels"]
         self.layout_mode = ws["layout_mode"]
         for k, v in ws["paths"].items(): self.config_data[k] = v
+        self.config_data["active_workspace"] = name
         self.save_config()
+        self.configure_name_index()
         self.setup_layout(self.num_panels, self.layout_mode)
         w.destroy()
 
     def delete_workspace(self, name, w):
         del self.config_data["workspaces"][name]
+        if self.config_data.get("active_workspace") == name:
+            self.config_data.pop("active_workspace")
+            self.refresh_all()
         self.save_config()
+        self.configure_name_index()
         w.destroy()
         self.open_workspace_menu()
 
@@ -249,9 +333,9 @@ class WorkDashboard(ctk.CTk):
             # Entering Focus Mode
             self.focused_panel_id = panel_id
             
-            # 1. Properly cleanup observers before destroying panels
+            # 1. Properly release watches before destroying panels
             for p in self.panels:
-                p.destroy()  # Ensures observers are stopped
+                p.destroy()  # Cancels the panel's folder subscriptions
             
             # 2. DESTROY the old container completely to wipe grid weights
             if self.main_container:
@@ -364,14 +448,28 @@ class WorkDashboard(ctk.CTk):
 
     def get_panels(self): return self.panels
     def refresh_all(self): 
-        for p in self.panels: p.refresh_files()
+        for p in self.panels: p.reload_files()
+        NameIndex.revalidate()
+
+    def configure_name_index(self):
+        """Index the workspace folders with the ignore rules in effect."""
+        NameIndex.configure(workspace_roots(self.config_data), rules_from_config(self.config_data))
 
     def show_tagged_files(self):
         """Show the improved Tagged Files Dialog."""
         TaggedFilesDialog(self, self.current_theme, self.base_font_size)
 
+    def show_ignore_rules(self):
+        """Edit the ignore patterns; panels rescan with the new rules."""
+        def on_save():
+            self.save_config()
+            self.configure_name_index()
+            self.refresh_all()
+        IgnoreRulesDialog(self, self.config_data, on_save, self.base_font_size)
+
     def save_config(self): ConfigManager.save_config(self.config_data)
     def on_closing(self):
-        for p in self.panels: 
-            if p.observer: p.observer.stop()
+        NameIndex.shutdown()
+        OfficeText.shutdown()
+        DirectorySessions.shutdown()
         self.destroy()
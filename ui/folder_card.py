@@ -9,26 +9,77 @@ and operations. It delegates to specialized modules for:
 """
 
 import os
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import customtkinter as ctk
-from watchdog.observers import Observer
 
 from ui.styles import TAG_COLORS
 from ui.quick_look import QuickLookWindow
 from ui.context_menu import ContextMenuBuilder
 from ui.analytics_bar import AnalyticsBar
+from ui.tree_sync import TreeSync
+from ui.virtual_list import VirtualList
+from ui.tree_nodes import TreeNodes
+from ui.row_model import item_options, row_tag
 from services.clipboard import InternalClipboard
-from services.watchdog_service import FolderChangeHandler
+from services.content_search import ContentSearch
+from services.directory_session import DirectorySessions
 from services.metadata_service import MetadataService
 from services.file_operations import FileOperations
-from utils.files import open_path, get_file_info
+from services.ignore_rules import rules_from_config
+from services.listing_cache import ListingCache
+from services.listing_columns import ListingColumns
+from services.listing_filter import ListingQuery, filter_entries
+from services.listing_sort import SORT_COLUMNS, ListingSorter, SortState
+from services.listing_worker import ListingResult, ListingWorker
+from services.paged_listing import ORDER_NEWEST, ORDER_OLDEST, PagedLoader
+from services.name_index import SCOPE_FOLDER, SCOPE_TREE, SEARCH_SCOPES, IndexQuery, NameIndex
+from services.navigation_history import HistoryEntry, NavigationHistory
+from services.prefetcher import Prefetcher
+from services.recursive_walker import RecursiveWalker, relative_folder
+from services.directory_scanner import MTIME_PENDING, MTIME_UNAVAILABLE
+from services.slow_fs import SlowPaths, StatFiller
+from services.snapshot_store import SnapshotStore
+from utils.files import open_path
 from utils.debounce import Debouncer
 
 
 class FolderCard(ctk.CTkFrame):
     """A file browser panel with search, filtering, and file operations."""
 
+    # How often to check the listing worker for results
+    POLL_INTERVAL_MS = 30
+
+    # Rows are streamed into the tree in slices of at most this many ms,
+    # letting Tk repaint between slices
+    STREAM_SLICE_MS = 12
+
+    # Listings at least this long are shown as a virtual (windowed) list;
+    # override with "virtual_list_threshold" in dashboard_config.json
+    VIRTUAL_LIST_THRESHOLD = 5000
+
+    # How often a recursive walk's results are added to the list
+    WALK_POLL_INTERVAL_MS = 100
+
+    # How often sizes/dates of a names-first (slow filesystem) listing
+    # are filled in
+    STAT_POLL_INTERVAL_MS = 100
+
+    # A listing taking longer than this marks the folder as not responding
+    UNREACHABLE_AFTER_S = 5.0
+
+    # Folders with more entries than this are listed a page at a time
+    # ("paged_listing_threshold" in dashboard_config.json). Above the
+    # ~200k rows the virtual list is meant for, so folders of that size
+    # stay fully listed, sorted and filtered; paged mode sorts and filters
+    # only the pages loaded so far
+    PAGED_LISTING_THRESHOLD = 250000
+    PAGE_POLL_INTERVAL_MS = 100
+
+    # Column heading labels; the active sort column gets an arrow
+    SORT_HEADINGS = {"#0": "Name", "size": "Size", "date": "Date"}
+
     def __init__(self, parent, panel_id, accent_color, config_data, save_callback,
                  get_panels_callback, app_theme_data, base_font_size,
                  toggle_focus_callback, is_focused=False):
@@ -44,9 +95,77 @@ class FolderCard(ctk.CTkFrame):
         self.base_font_size = base_font_size
         self.toggle_focus_callback = toggle_focus_callback
         self.is_focused = is_focused
-        self.observer = None
+        self._watch = None
         self.clipboard_indicator = None
 
+        # Background listing state
+        self.listing_worker = ListingWorker(max_entries=int(self.config_data.get(
+            "paged_listing_threshold", self.PAGED_LISTING_THRESHOLD)))
+        self._poll_after_id = None
+        self._loading = False
+        self._listed_path = None
+        self._listing = ListingColumns()
+        self._stream = None
+        self._stream_token = 0
+        self._listing_snapshot = None
+        self._saved_listing = None
+        self._listing_started = None
+
+        # Content search matches, streamed in after the name matches
+        mb = 1024 * 1024
+        budget_mb = self.config_data.get("content_search_budget_mb")
+        max_file_mb = self.config_data.get("content_search_max_mb")
+        self.content_search = ContentSearch(budget_mb * mb if budget_mb else None,
+                                            max_file_mb * mb if max_file_mb else None)
+        self._content_after_id = None
+        # Content matches on screen, the name matches they were added to,
+        # and whether they came from the running search (or are left over
+        # from the previous one until it reports)
+        self._content_matches = []
+        self._content_entries = []
+        self._content_fresh = True
+        self._content_term = ""
+        self._listing_note = ""
+        self._content_note = ""
+        self._hit_note = ""
+
+        # Sizes and dates of names-first listings on slow filesystems
+        self.stat_filler = StatFiller()
+        self._stat_after_id = None
+
+        # Paged listing of folders too big to list in one go
+        self.pager = PagedLoader()
+        self._paged_path = None
+        self._paged_rows = []
+        self._page_after_id = None
+
+        # Recursive (flatten) view
+        self.walker = RecursiveWalker()
+        self._walk_after_id = None
+
+        # Name index search beyond the current folder
+        self.index_query = IndexQuery()
+        self._index_after_id = None
+        self._index_search = False
+        self._index_under = None
+
+        # Back/forward navigation
+        self.history = NavigationHistory()
+        self._pending_view = None
+
+        # Background scans of the folders likely to be opened next
+        self.prefetcher = Prefetcher()
+        self.prefetch_debouncer = Debouncer(self, self._prefetch_neighbours, 150)
+        # Sort column and direction, kept across refreshes and restarts
+        saved_sort = self.config_data.get("panel_sort", {}).get(self.panel_id)
+        self.sorter = ListingSorter(
+            SortState(saved_sort[0], bool(saved_sort[1]))
+            if saved_sort and saved_sort[0] in SORT_COLUMNS else None
+        )
+
+        self.virtual_threshold = int(self.config_data.get("virtual_list_threshold",
+                                                          self.VIRTUAL_LIST_THRESHOLD))
+
         # Initialize helpers
         self.menu_builder = ContextMenuBuilder(self, "Segoe UI", self.base_font_size)
 
@@ -69,6 +188,10 @@ class FolderCard(ctk.CTkFrame):
         if self.current_path:
             MetadataService.load_tags()
             self.update_header()
+            # Draw last session's listing right away, then revalidate it
+            saved = SnapshotStore.load(self.current_path)
+            if saved is not None:
+                self._show_snapshot(HistoryEntry(self.current_path, saved))
             self.refresh_files()
             self.start_watchdog()
 
@@ -77,9 +200,15 @@ class FolderCard(ctk.CTkFrame):
         self.tree.bind("<Control-x>", lambda e: self._cut_selected())
         self.tree.bind("<Control-v>", lambda e: self._paste_file())
         self.tree.bind("<Delete>", lambda e: self._delete_selected())
-        self.tree.bind("<F5>", lambda e: self.refresh_files())
+        self.tree.bind("<F5>", lambda e: self.reload_files())
         self.tree.bind("<space>", lambda e: self._quick_look())
         self.tree.bind("<BackSpace>", lambda e: self.go_up())
+        self.tree.bind("<Alt-Left>", lambda e: self.go_back())
+        self.tree.bind("<Alt-Right>", lambda e: self.go_forward())
+        if self.tree.tk.call("tk", "windowingsystem") == "win32":
+            # Mouse back/forward buttons
+            self.tree.bind("<Button-4>", lambda e: self.go_back())
+            self.tree.bind("<Button-5>", lambda e: self.go_forward())
 
     # ========== Icon Loading ==========
 
@@ -196,6 +325,25 @@ class FolderCard(ctk.CTkFrame):
         )
         self.btn_browse.pack(side="left", padx=(0, 5))
 
+        # Back / forward buttons
+        self.btn_back = ctk.CTkButton(
+            self.controls_frame, text="◀", command=self.go_back,
+            font=("Segoe UI", self.base_font_size, "bold"),
+            width=32, height=32, corner_radius=8, state="disabled",
+            fg_color=self.theme_data["bg"], text_color=self.theme_data["text"],
+            hover_color=self.theme_data["hover"]
+        )
+        self.btn_back.pack(side="left", padx=2)
+
+        self.btn_forward = ctk.CTkButton(
+            self.controls_frame, text="▶", command=self.go_forward,
+            font=("Segoe UI", self.base_font_size, "bold"),
+            width=32, height=32, corner_radius=8, state="disabled",
+            fg_color=self.theme_data["bg"], text_color=self.theme_data["text"],
+            hover_color=self.theme_data["hover"]
+        )
+        self.btn_forward.pack(side="left", padx=2)
+
         # Up button
         self.btn_up = ctk.CTkButton(
             self.controls_frame, text="⬆", command=self.go_up,
@@ -220,7 +368,7 @@ class FolderCard(ctk.CTkFrame):
         # Search with debouncing
         self.search_var = ctk.StringVar()
         self.search_debouncer = Debouncer(self, self.refresh_files, 300)
-        self.search_var.trace_add("write", lambda *args: self.search_debouncer.trigger())
+        self.search_var.trace_add("write", lambda *args: self._on_search_typed())
 
         self.search_entry = ctk.CTkEntry(
             self.controls_frame, textvariable=self.search_var,
@@ -231,6 +379,18 @@ class FolderCard(ctk.CTkFrame):
         )
         self.search_entry.pack(side="right")
 
+        # Where the search box looks: this folder, or the name index
+        self.search_scope_var = ctk.StringVar(value=SCOPE_FOLDER)
+        self.search_scope_menu = ctk.CTkOptionMenu(
+            self.controls_frame, variable=self.search_scope_var,
+            values=list(SEARCH_SCOPES), width=120, height=32,
+            command=lambda _: self.refresh_files(),
+            font=("Segoe UI", self.base_font_size),
+            dropdown_font=("Segoe UI", self.base_font_size),
+            corner_radius=8
+        )
+        self.search_scope_menu.pack(side="right", padx=(5, 2))
+
         # Filter combo
         self.filter_var = ctk.StringVar(value="All Types")
         self.filter_combo = ctk.CTkComboBox(
@@ -254,28 +414,73 @@ class FolderCard(ctk.CTkFrame):
         )
         self.content_search_cb.pack(side="right", padx=5)
 
+        # Recursive (flatten) view toggle
+        self.recursive_var = ctk.BooleanVar()
+        self.recursive_cb = ctk.CTkCheckBox(
+            self.controls_frame, text="Recursive",
+            variable=self.recursive_var,
+            command=self.refresh_files,
+            font=("Segoe UI", self.base_font_size)
+        )
+        self.recursive_cb.pack(side="right", padx=5)
+
+        # Expandable tree mode (folders open in place)
+        self.tree_mode_var = ctk.BooleanVar()
+        self.tree_mode_cb = ctk.CTkCheckBox(
+            self.controls_frame, text="Tree",
+            variable=self.tree_mode_var,
+            command=self._on_tree_mode_toggled,
+            font=("Segoe UI", self.base_font_size)
+        )
+        self.tree_mode_cb.pack(side="right", padx=5)
+
+        # Temporarily show entries hidden by the ignore rules
+        self.show_ignored_var = ctk.BooleanVar()
+        self.show_ignored_cb = ctk.CTkCheckBox(
+            self.controls_frame, text="Ignored",
+            variable=self.show_ignored_var,
+            command=self.refresh_files,
+            font=("Segoe UI", self.base_font_size)
+        )
+        self.show_ignored_cb.pack(side="right", padx=5)
+
     def _create_treeview(self):
         """Create the file list treeview."""
         self.tree_container = ctk.CTkFrame(self, fg_color="transparent")
         self.tree_container.grid(row=3, column=0, sticky="nsew", padx=2, pady=(0, 2))
 
-        columns = ("size", "date")
+        # "folder" (relative to the panel's folder) is only displayed in
+        # the recursive view
+        columns = ("size", "date", "folder")
         self.tree = ttk.Treeview(
             self.tree_container, columns=columns,
             show="tree headings", selectmode="extended"
         )
 
-        self.tree.heading("#0", text="Name", command=lambda: self._sort_tree("#0", False))
+        self.tree.heading("#0", command=lambda: self._sort_tree("#0"))
         self.tree.column("#0", width=300, stretch=True)
-        self.tree.heading("size", text="Size", command=lambda: self._sort_tree("size", False))
-        self.tree.heading("date", text="Date", command=lambda: self._sort_tree("date", False))
+        self.tree.heading("size", command=lambda: self._sort_tree("size"))
+        self.tree.heading("date", command=lambda: self._sort_tree("date"))
+        self._update_sort_headings()
         self.tree.column("size", width=100, anchor="e", stretch=False)
         self.tree.column("date", width=180, anchor="e", stretch=False)  # Widened and right-aligned
+        self.tree.heading("folder", text="Folder")
+        self.tree.column("folder", width=200, anchor="w", stretch=False)
+        self.tree.configure(displaycolumns=("size", "date"))
 
         # Scrollbars
         vsb = ttk.Scrollbar(self.tree_container, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(self.tree_container, orient="horizontal", command=self.tree.xview)
         self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree_sync = TreeSync(self.tree)
+        self.virtual_list = VirtualList(self.tree, vsb)
+        self.tree_nodes = TreeNodes(
+            self.tree, self._path_for_item, self._get_query,
+            lambda result: self._build_listing(result.entries),
+            self.sorter.sorted_rows, self._render_for,
+            watch=self._watch_node, unwatch=self._unwatch_node
+        )
+        self._node_watches = {}
         vsb.pack(side="right", fill="y")
         hsb.pack(side="bottom", fill="x")
         self.tree.pack(fill="both", expand=True)
@@ -296,6 +501,7 @@ class FolderCard(ctk.CTkFrame):
 
         # Event bindings
         self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<<TreeviewSelect>>", self._on_selection_changed, add="+")
         self.tree.bind("<Button-3>", self._on_right_click)
         
         # Empty folder placeholder
@@ -308,6 +514,23 @@ class FolderCard(ctk.CTkFrame):
         )
         # Initially hidden (will show if no path)
 
+        # Shown while the listing worker is busy
+        self.loading_label = ctk.CTkLabel(
+            self.tree_container,
+            text="⏳ Loading...",
+            font=("Segoe UI", self.base_font_size),
+            text_color=self.theme_data["subtext"]
+        )
+
+        # Shown at the bottom of a paged listing with more to read
+        self.load_more_btn = ctk.CTkButton(
+            self.tree_container, text="⬇ Load more", width=120,
+            font=("Segoe UI", self.base_font_size),
+            fg_color=self.theme_data["bg"], hover_color=self.theme_data["hover"],
+            text_color=self.theme_data["text"],
+            command=self._load_more_page
+        )
+
     def _create_analytics_bar(self):
         """Create the analytics bar widget."""
         self.analytics_bar = AnalyticsBar(self, self.theme_data, self.base_font_size)
@@ -315,9 +538,13 @@ class FolderCard(ctk.CTkFrame):
 
     # ========== Navigation ==========
 
+    def _path_reachable(self, path):
+        """Cheap existence check that never blocks on a slow filesystem."""
+        return SlowPaths.is_slow(path) or os.path.exists(path)
+
     def update_header(self):
         """Update the header labels with current path info."""
-        if self.current_path and os.path.exists(self.current_path):
+        if self.current_path and self._path_reachable(self.current_path):
             folder_name = os.path.basename(self.current_path) or self.current_path
             self.title_label.configure(text=folder_name)
             # Show last 2-3 folders for better readability
@@ -339,30 +566,138 @@ class FolderCard(ctk.CTkFrame):
 
     def go_up(self):
         """Navigate to parent directory."""
-        if self.current_path and os.path.exists(self.current_path):
+        if self.current_path and self._path_reachable(self.current_path):
             parent = os.path.dirname(self.current_path)
-            if parent and os.path.exists(parent):
+            if parent and self._path_reachable(parent):
                 self.set_path(parent)
 
     def set_path(self, path):
         """Set current path and refresh."""
+        if path != self.current_path:
+            self.history.visit(self._capture_view())
+        self._open_path(path)
+
+    def go_back(self):
+        """Return to the previous folder, restoring its listing and view."""
+        entry = self.history.go_back(self._capture_view())
+        if entry is not None:
+            self._open_path(entry.path, restore=entry)
+
+    def go_forward(self):
+        """Redo a go_back()."""
+        entry = self.history.go_forward(self._capture_view())
+        if entry is not None:
+            self._open_path(entry.path, restore=entry)
+
+    def _open_path(self, path, restore=None):
+        """Switch to ``path``; ``restore`` is a HistoryEntry to redraw from."""
         self.current_path = path
         self.config_data[self.panel_id] = path
         self.save_callback()
         self.update_header()
+        self._pending_view = restore
+        if restore is not None and restore.entries is not None:
+            self._show_snapshot(restore)
+        # Scans (or revalidates the snapshot) in the background
         self.refresh_files()
         self.start_watchdog()
+        self._update_history_buttons()
+
+    def _capture_view(self):
+        """HistoryEntry for the folder currently shown, or None."""
+        if not self.current_path:
+            return None
+        if self.virtual_list.active:
+            scroll = ("virtual", self.virtual_list.offset)
+        else:
+            scroll = ("tree", self.tree.yview()[0])
+        snapshot = self._listing_snapshot if self._listed_path == self.current_path else None
+        return HistoryEntry(self.current_path, snapshot, scroll, self._selected_paths())
+
+    def _show_snapshot(self, entry):
+        """Draw a history snapshot immediately, before it is revalidated."""
+        query = self._get_query()
+        if (query.content_search and query.search_term) or self.recursive_var.get():
+            # Content matching reads files and the recursive view walks
+            # the tree; leave those to the workers
+            return
+        self.empty_placeholder.place_forget()
+        self._clear_tree()
+        entries = filter_entries(entry.entries, query)
+        self._render_listing(ListingResult(0, entry.path, query, entries, entry.entries))
+
+    def _apply_pending_view(self):
+        """Restore the scroll position and selection of a history entry."""
+        view = self._pending_view
+        if view is None or view.path != self._listed_path:
+            return
+        self._pending_view = None
+        kind, value = view.scroll or (None, None)
+        if self.virtual_list.active:
+            if kind == "virtual":
+                self.virtual_list.offset = value
+            elif view.selection and view.selection[0] in self.virtual_list.rows:
+                self.virtual_list.scroll_to(self.virtual_list.keys.index(view.selection[0]))
+            self.virtual_list.select_keys(view.selection)
+        else:
+            iids = [self.tree_sync.iids[p] for p in view.selection if p in self.tree_sync.iids]
+            if iids:
+                self.tree.selection_set(iids)
+            if kind == "tree":
+                self.tree.yview_moveto(value)
+            elif iids:
+                self.tree.see(iids[0])
+
+    def reveal(self, path):
+        """Open the folder holding ``path`` and select it once listed."""
+        folder = os.path.dirname(path)
+        relisting = bool(self.search_var.get())
+        if relisting:
+            # The search box could hide it
+            self.search_var.set("")
+        if folder != self.current_path:
+            self.set_path(folder)
+            relisting = True
+        self._pending_view = HistoryEntry(folder, selection=[path])
+        if not relisting:
+            self._apply_pending_view()
+
+    def _update_history_buttons(self):
+        self.btn_back.configure(state="normal" if self.history.can_go_back else "disabled")
+        self.btn_forward.configure(state="normal" if self.history.can_go_forward else "disabled")
 
     def start_watchdog(self):
-        """Start file system watcher for current path."""
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
+        """Follow changes to the current path.
+
+        The folder's DirectorySession watches it once for every panel
+        showing it, and invalidates its cached listing before notifying.
+        """
+        if self._watch is not None:
+            self._watch.cancel()
+            self._watch = None
+        if SlowPaths.is_slow(self.current_path or ""):
+            # Network shares rarely deliver change events, and setting up
+            # the watch stats the folder on the Tk thread; use F5 there
+            return
         if self.current_path and os.path.exists(self.current_path):
-            self.observer = Observer()
-            event_handler = FolderChangeHandler(lambda: self.after(100, self.refresh_files))
-            self.observer.schedule(event_handler, self.current_path, recursive=False)
-            self.observer.start()
+            self._watch = DirectorySessions.subscribe(
+                self.current_path, lambda: self.after(100, self.refresh_files))
+
+    def _watch_node(self, path):
+        """Follow changes to an expanded tree node."""
+        if path not in self._node_watches:
+            self._node_watches[path] = DirectorySessions.subscribe(
+                path, lambda: self.after(100, lambda: self._reload_node(path)))
+
+    def _unwatch_node(self, path):
+        watch = self._node_watches.pop(path, None)
+        if watch is not None:
+            watch.cancel()
+
+    def _reload_node(self, path):
+        """Re-read a changed tree node (its session already dropped the cache)."""
+        if path in self.tree_nodes.watched:
+            self.tree_nodes.reload(path)
 
     def _open_current_folder(self):
         """Open current folder in system file manager."""
@@ -371,11 +706,11 @@ class FolderCard(ctk.CTkFrame):
 
     def _quick_look(self):
         """Open QuickLook preview for selected file."""
-        item = self.tree.selection()
-        if item:
-            fpath = self.tree.item(item, "tags")[0]
-            if os.path.exists(fpath) and os.path.isfile(fpath):
-                QuickLookWindow(self, fpath)
+        paths = self._selected_paths()
+        if paths:
+            record = self._record_for_path(paths[0])
+            if record is not None and not record.is_dir:
+                QuickLookWindow(self, record.path)
 
     # ========== File List Display ==========
 
@@ -391,130 +726,810 @@ class FolderCard(ctk.CTkFrame):
         }
         return filters.get(selection, [])
 
-    def refresh_files(self, _=None):
-        """Refresh the file list."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def _ignore_rules(self):
+        """Compiled ignore rules in effect, or None while they are revealed."""
+        if self.show_ignored_var.get():
+            return None
+        return rules_from_config(self.config_data)
+
+    def _get_query(self):
+        """Snapshot the filter and search controls for a listing request."""
+        rules = self._ignore_rules()
+        return ListingQuery(
+            exts=tuple(self._get_extensions()),
+            search_term=self.search_var.get().lower(),
+            content_search=bool(self.content_search_var.get()),
+            ignore=rules.bind(self.current_path) if rules is not None and self.current_path else None
+        )
 
-        if not self.current_path or not os.path.exists(self.current_path):
+    def refresh_files(self, _=None):
+        """Request a fresh listing; rows are filled in when the worker replies."""
+        if not self.current_path:
+            self.listing_worker.cancel()
+            self._stop_walk()
+            self._stop_paged()
+            self._stop_index_search()
+            self._set_loading(False)
+            self._clear_tree()
             self.update_header()
             self.analytics_bar.update([])
             # Show empty placeholder
             self.empty_placeholder.place(relx=0.5, rely=0.5, anchor="center")
             return
-        
+
         # Hide placeholder when folder is selected
         self.empty_placeholder.place_forget()
 
         self.update_header()
-        valid_exts = self._get_extensions()
-        search_term = self.search_var.get().lower()
-        content_search = self.content_search_var.get()
-        text_exts = ['.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.log', '.xml', '.ini', '.cfg']
+        term = self.search_var.get().strip()
+        if term and self.search_scope_var.get() != SCOPE_FOLDER:
+            self.tree_nodes.disable()
+            self._start_index_search(term)
+            return
+        if self._index_search:
+            # Leaving the index results
+            self._stop_index_search()
+            self._clear_tree()
+            self._listed_path = None
+        if self.recursive_var.get():
+            self.tree_nodes.disable()
+            self._start_walk()
+            return
+        if self._walk_after_id is not None or self.walker.state is not None:
+            # Leaving the recursive view
+            self._stop_walk()
+            self._clear_tree()
+            self._listed_path = None
+        if self.current_path != self._listed_path:
+            # Don't leave the previous folder's rows up while loading
+            self._clear_tree()
+            self._listed_path = None
+        if self._paged_path is not None and self._paged_path != self.current_path:
+            self._stop_paged()
+
+        if self.tree_mode_var.get():
+            self.tree_nodes.enable()
+            # Expanded folders follow the new filter/search too
+            self.tree_nodes.reload()
+        if self._paged_path == self.current_path:
+            # Known to be too big to list at once
+            self._start_paged()
+            return
+        self.listing_worker.submit(self.current_path, self._get_query())
+        self._listing_started = time.perf_counter()
+        self._set_loading(True)
+        if self._poll_after_id is None:
+            self._poll_after_id = self.after(self.POLL_INTERVAL_MS, self._poll_listing)
+
+    def _on_tree_mode_toggled(self):
+        """Switch between the flat list and the expandable tree."""
+        self.tree_nodes.disable()
+        self._clear_tree()
+        self._listed_path = None
+        self.refresh_files()
 
-        files_data = []
+    def reload_files(self):
+        """Re-read the folder from disk, bypassing the listing cache.
 
-        try:
-            all_items = sorted(os.listdir(self.current_path), key=str.lower)
-
-            # Separate and display folders first
-            for item in all_items:
-                full_path = os.path.join(self.current_path, item)
-                if os.path.isdir(full_path) and not item.startswith('.'):
-                    if search_term and search_term not in item.lower():
-                        continue
-                    icon = self._get_file_icon(item, is_folder=True)
-                    item_kwargs = {"text": item, "values": ["", ""], "tags": (full_path, "folder")}
-                    if icon:
-                        item_kwargs["image"] = icon
-                    self.tree.insert("", "end", **item_kwargs)
-
-            # Then display files
-            for item in all_items:
-                full_path = os.path.join(self.current_path, item)
-                if not os.path.isfile(full_path):
-                    continue
-
-                ext = os.path.splitext(item)[1].lower()
-                if valid_exts and ext not in valid_exts:
-                    continue
-
-                # Search matching
-                if search_term:
-                    name_match = search_term in item.lower()
-                    content_match = False
-                    if content_search and ext in text_exts:
-                        try:
-                            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read(10000).lower()
-                                content_match = search_term in content
-                        except Exception:
-                            content_match = False
-                    if not (name_match or content_match):
-                        continue
-
-                raw_size, size_mb, mod = get_file_info(full_path)
-                size_str = f"{size_mb:.2f} MB"
-
-                # Check for tags & notes
-                tags = [full_path]
-                meta = MetadataService.get_tag(full_path)
-                display_name = item
-                if meta.get("note"):
-                    display_name += " 📝"
-                if meta.get("color"):
-                    tags.append(meta["color"])
-
-                files_data.append((item, size_str, mod, raw_size))
-
-                icon = self._get_file_icon(item)
-                item_kwargs = {"text": display_name, "values": [size_str, mod], "tags": tuple(tags)}
-                if icon:
-                    item_kwargs["image"] = icon
-                self.tree.insert("", "end", **item_kwargs)
-
-        except OSError as e:
-            print(f"Error reading directory {self.current_path}: {e}")
-
-        self.analytics_bar.update(files_data)
-
-    def _sort_tree(self, col, reverse):
-        """Sort treeview by column."""
-        items = [(self.tree.set(k, col) if col != "#0" else self.tree.item(k, "text"), k)
-                 for k in self.tree.get_children('')]
-        if col == "size":
-            items.sort(key=lambda x: float(x[0].split()[0]) if x[0] else 0, reverse=reverse)
+        Used when the folder is known to have changed (watcher events, F5):
+        the cache is validated by the directory's mtime, which does not
+        change when a file is rewritten in place.
+        """
+        if self.current_path:
+            ListingCache.invalidate(self.current_path)
+        self.refresh_files()
+
+    def _poll_listing(self):
+        """Pick up the worker's result on the Tk thread."""
+        self._poll_after_id = None
+        result = self.listing_worker.poll()
+        if result is not None:
+            self._set_loading(False)
+            if result.too_large:
+                self._start_paged()
+            else:
+                self._render_listing(result)
+        elif self._loading:
+            if time.perf_counter() - self._listing_started > self.UNREACHABLE_AFTER_S:
+                # Still waiting: a hung mount shows as a panel state, and
+                # the result is picked up whenever it arrives
+                self.loading_label.configure(text="⚠ Not responding - the folder may be unreachable")
+            self._poll_after_id = self.after(self.POLL_INTERVAL_MS, self._poll_listing)
+
+    def _set_loading(self, loading):
+        """Show or hide the loading indicator.
+
+        While rows of the current folder are already shown (a saved or
+        history snapshot, or the previous listing) they stay up and are
+        marked as being revalidated instead.
+        """
+        self._loading = loading
+        if loading:
+            if self._listed_path == self.current_path:
+                self.loading_label.configure(text="⟳ Revalidating...")
+            else:
+                self.loading_label.configure(text="⏳ Loading...")
+                self.analytics_bar.show_loading()
+            self.loading_label.place(relx=0.5, rely=0.0, anchor="n", y=40)
+        else:
+            self.loading_label.place_forget()
+
+    def _clear_tree(self):
+        self._cancel_stream()
+        self._stop_content_search()
+        self.stat_filler.cancel()
+        self.tree_nodes.clear()
+        self.tree_sync.clear()
+        self.virtual_list.disable()
+        self._listing = ListingColumns()
+
+    def _row_options(self, record, folder=None):
+        """Treeview item options for a row; tags are only TAG_COLORS names."""
+        return item_options(record, self._get_file_icon(record.name, is_folder=record.is_dir), folder)
+
+    def _render_for(self, listing):
+        """Render callback for the rows of ``listing``."""
+        state = self.walker.state
+        if self._index_search and state is None:
+            # Index results: folders relative to this folder, or in full
+            under = self._index_under
+            if under is None:
+                return lambda path: self._row_options(listing[path], os.path.dirname(path))
+            return lambda path: self._row_options(listing[path], relative_folder(under, path))
+        if state is None:
+            return lambda path: self._row_options(listing[path])
+        # Recursive view: fill in each file's folder relative to the root
+        root = state.root
+        return lambda path: self._row_options(listing[path], relative_folder(root, path))
+
+    def _build_listing(self, entries):
+        """Sorted columnar model of listed entries.
+
+        Its RowRecords double as row signatures, so rows are redrawn only
+        when their record changes.
+        """
+        get_tag = MetadataService.get_tag
+        return self.sorter.sorted_rows(ListingColumns.from_entries(
+            entries, lambda path: row_tag(get_tag(path))))
+
+    def _render_listing(self, result):
+        """Apply a finished listing to the tree, touching only changed rows."""
+        if result.error is not None:
+            print(f"Error reading directory {result.path}: {result.error}")
+            self._clear_tree()
+            self._listed_path = None
+            self.analytics_bar.update([])
+            if isinstance(result.error, (FileNotFoundError, NotADirectoryError)):
+                self.empty_placeholder.place(relx=0.5, rely=0.5, anchor="center")
+            else:
+                # Permissions, dropped network shares, timeouts...
+                reason = result.error.strerror or result.error
+                self.loading_label.configure(text=f"⚠ Cannot read folder: {reason}")
+                self.loading_label.place(relx=0.5, rely=0.0, anchor="n", y=40)
+            return
+
+        self._listed_path = result.path
+        self._listing_snapshot = result.listing
+        if result.generation:
+            notes = [f"{result.ignored:,} ignored"] if result.ignored else []
+            if result.query.content_search and result.query.search_term:
+                notes.append(self._content_index_note(result.index_stats))
+            self._listing_note = "  •  ".join(notes)
+            self.analytics_bar.set_note(self._listing_note)
+        if result.generation and result.listing is not self._saved_listing:
+            # A real scan (snapshots are rendered with generation 0) that
+            # differs from what was last persisted
+            self._saved_listing = result.listing
+            SnapshotStore.save_async(result.path, result.listing)
+        carried = self._carried_matches(result)
+        listing = self._build_listing(result.entries + carried if carried else result.entries)
+
+        self._cancel_stream()
+        self._listing = listing
+        self.prefetch_debouncer.trigger()
+        self._fill_stats(result.entries)
+        render = self._render_for(listing)
+        if len(listing) >= self.virtual_threshold:
+            # Only the viewport is materialized, nothing to stream
+            if not self.virtual_list.active:
+                # Too many rows for expanders; tree mode stays flat here
+                self.tree_nodes.clear()
+                self.tree_sync.clear()
+                self.virtual_list.enable()
+            self.virtual_list.set_rows(listing, render)
+            self.analytics_bar.update_listing(listing)
+            self._apply_pending_view()
+        else:
+            self.virtual_list.disable()
+            self._start_stream(listing, render)
+        if result.content_candidates:
+            self._start_content_search(result.content_candidates, result.query.search_term,
+                                       result.entries, carried)
+        elif result.generation:
+            self._stop_content_search()
+
+    # ========== Content Search ==========
+
+    def _on_search_typed(self):
+        """Stop the running content search at once; re-search after the pause."""
+        self._stop_content_search()
+        self.search_debouncer.trigger()
+
+    def _carried_matches(self, result):
+        """Previous content matches to keep showing while ``result`` is searched.
+
+        A watcher-driven refresh restarts the content search; its matches
+        stay up (refreshed from the new candidates) until the new search
+        reports, instead of vanishing and streaming back in.
+        """
+        if not (result.content_candidates and self._content_matches
+                and result.query.search_term == self._content_term):
+            return []
+        shown = {e.path for e in self._content_matches}
+        return [e for e in result.content_candidates if e.path in shown]
+
+    def _start_content_search(self, candidates, term, entries, carried=()):
+        """Look inside ``candidates`` on the content pool, streaming matches in.
+
+        Args:
+            candidates: Files to look inside
+            term: Lower-case search term
+            entries: The name matches on screen
+            carried: Matches of the previous search shown with them
+        """
+        self.content_search.start(candidates, term)
+        self._content_term = term
+        self._content_entries = entries
+        self._content_matches = list(carried)
+        self._content_fresh = False
+        self._hit_note = ""
+        if self._content_after_id is None:
+            self._content_after_id = self.after(self.POLL_INTERVAL_MS, self._poll_content)
+
+    def _stop_content_search(self):
+        self.content_search.cancel()
+        self._content_note = self._hit_note = ""
+        self._content_matches = []
+        self._content_entries = []
+        self._content_fresh = True
+        if self._content_after_id is not None:
+            self.after_cancel(self._content_after_id)
+            self._content_after_id = None
+
+    def _poll_content(self):
+        """Add the content matches found since the last poll to the list."""
+        self._content_after_id = None
+        if self._stream is not None:
+            # The name matches are still being inserted
+            self._content_after_id = self.after(self.POLL_INTERVAL_MS, self._poll_content)
+            return
+        matches, progress = self.content_search.poll()
+        if progress is None:
+            return
+        listing = self._listing
+        changed = False
+        if not self._content_fresh and (matches or progress.done):
+            self._content_fresh = True
+            if self._content_matches:
+                # The new search has reported: its matches replace the ones
+                # kept up from the previous search
+                self._content_matches = list(matches)
+                listing = self._build_listing(self._content_entries + matches)
+                changed = True
+                matches = []
+        if matches:
+            # A new listing each time: TreeSync diffs against the last one
+            self._content_matches.extend(matches)
+            get_tag = MetadataService.get_tag
+            listing = listing.copy()
+            listing.extend(matches, lambda path: row_tag(get_tag(path)))
+            listing = self.sorter.sorted_rows(listing)
+            changed = True
+        if changed:
+            self._listing = listing
+            render = self._render_for(listing)
+            if self.virtual_list.active:
+                self.virtual_list.set_rows(listing, render)
+            elif len(listing) >= self.virtual_threshold:
+                self.tree_sync.clear()
+                self.virtual_list.enable()
+                self.virtual_list.set_rows(listing, render)
+            else:
+                self.tree_sync.apply(listing, render)
+
+        mb = 1024 * 1024
+        note = (f"Content: {progress.checked:,}/{progress.total:,} files, "
+                f"{progress.bytes_read / mb:.1f} of {progress.budget / mb:.0f} MB")
+        if progress.skipped:
+            note += f", {progress.skipped:,} skipped (budget)"
+        self._content_note = note
+        self.analytics_bar.set_note(self._notes())
+        self.analytics_bar.update_listing(listing)
+        if not progress.done:
+            self._content_after_id = self.after(self.POLL_INTERVAL_MS, self._poll_content)
+
+    def _notes(self):
+        """Listing, content search and selected-match notes for the analytics bar."""
+        return "  •  ".join(n for n in (self._listing_note, self._content_note, self._hit_note) if n)
+
+    def _show_content_hit(self):
+        """Show where the selected file matched the content search."""
+        paths = self._selected_paths()
+        match = self.content_search.hits.get(paths[0]) if len(paths) == 1 else None
+        hit_note = f"Line {match.line:,}: {match.snippet}" if match is not None else ""
+        if hit_note != self._hit_note:
+            self._hit_note = hit_note
+            self.analytics_bar.show_note(self._notes())
+
+    def _content_index_note(self, stats):
+        """Size and progress of the content index, for the analytics bar.
+
+        ``stats`` come with the listing (ContentIndex.stats() queries
+        SQLite, so it runs on the listing pool); None means the index is off.
+        """
+        if stats is None:
+            return "Content index off"
+        note = (f"Content index: {stats['files']:,} files, {stats['bytes'] / (1024 * 1024):.1f} MB"
+                f" @ {stats['bytes_per_second'] / (1024 * 1024):.1f} MB/s")
+        if stats["pending"]:
+            note += f", {stats['pending']:,} queued"
+        return note
+
+    # ========== Slow Filesystems ==========
+
+    def _fill_stats(self, entries):
+        """Stat the files a names-first listing left out, off the Tk thread."""
+        pending = [e for e in entries if e.mtime_ns == MTIME_PENDING]
+        if not pending:
+            self.stat_filler.cancel()
+            return
+        self.stat_filler.fill(pending)
+        if self._stat_after_id is None:
+            self._stat_after_id = self.after(self.STAT_POLL_INTERVAL_MS, self._poll_stats)
+
+    def _poll_stats(self):
+        """Show the sizes and dates that arrived; timed-out ones say unavailable."""
+        self._stat_after_id = None
+        done, timed_out = self.stat_filler.poll()
+        listing = self._listing
+        changed = []
+        for entry, size, mtime_ns in done:
+            # The entry is shared with the cached listing, which is now complete
+            entry.size, entry.mtime_ns = size, mtime_ns
+            if listing.set_stat(entry.path, size, mtime_ns):
+                changed.append(entry.path)
+        for entry in timed_out:
+            # Only the row says so; the cached entry is retried next time
+            if listing.set_stat(entry.path, 0, MTIME_UNAVAILABLE):
+                changed.append(entry.path)
+
+        if changed:
+            # Updated in place, so TreeSync has nothing to diff: redraw the
+            # rows on screen. Rows a stream has still to insert read the
+            # new values
+            render = self._render_for(listing)
+            if self.virtual_list.active:
+                self.virtual_list.set_rows(listing, render)
+            else:
+                self.tree_sync.redraw(changed, render)
+        if self._stream is not None:
+            # Sorting and the analytics wait until the stream is done
+            self._stat_after_id = self.after(self.STAT_POLL_INTERVAL_MS, self._poll_stats)
+            return
+        finished = not self.stat_filler.pending
+        if finished and self.sorter.state is not None and self.sorter.state.column != "#0":
+            listing = self._listing = self.sorter.sorted_rows(listing)
+            render = self._render_for(listing)
+            if self.virtual_list.active:
+                self.virtual_list.set_rows(listing, render)
+            else:
+                self.tree_sync.apply(listing, render)
+            self.analytics_bar.update_listing(listing)
+        elif changed:
+            self.analytics_bar.update_listing(listing)
+        if not finished:
+            self._stat_after_id = self.after(self.STAT_POLL_INTERVAL_MS, self._poll_stats)
+
+    # ========== Paged Listing ==========
+
+    def _page_order(self):
+        """Read pages newest/oldest first while sorted by date, else in directory order."""
+        state = self.sorter.state
+        if state is None or state.column != "date":
+            return None
+        return ORDER_NEWEST if state.reverse else ORDER_OLDEST
+
+    def _start_paged(self):
+        """List a folder too big to list at once, a page at a time.
+
+        Restarting (refresh, watcher events, a new filter or date sort)
+        goes back to the first page.
+        """
+        self.listing_worker.cancel()
+        self._clear_tree()
+        self._listed_path = None
+        self._paged_path = self.current_path
+        self._paged_rows = []
+        self.load_more_btn.place_forget()
+        self.pager.start(self.current_path, self._get_query(), self._page_order())
+        self._listing_started = time.perf_counter()
+        self._set_loading(True)
+        if self._page_after_id is None:
+            self._page_after_id = self.after(self.PAGE_POLL_INTERVAL_MS, self._poll_pages)
+
+    def _stop_paged(self):
+        """Leave paged mode (another folder, the recursive view, no folder)."""
+        self.pager.cancel()
+        if self._page_after_id is not None:
+            self.after_cancel(self._page_after_id)
+            self._page_after_id = None
+        self.load_more_btn.place_forget()
+        self._paged_path = None
+        self._paged_rows = []
+
+    def _load_more_page(self):
+        """Read the next page of a paged listing."""
+        if not self.pager.more():
+            return
+        self.load_more_btn.place_forget()
+        self.loading_label.configure(text="⏳ Loading more...")
+        self.loading_label.place(relx=0.5, rely=0.0, anchor="n", y=40)
+        if self._page_after_id is None:
+            self._page_after_id = self.after(self.PAGE_POLL_INTERVAL_MS, self._poll_pages)
+
+    def _poll_pages(self):
+        """Show the pages (or the provisional top of a page) read since the last poll."""
+        self._page_after_id = None
+        state = self.pager.state
+        if state is None:
+            return
+        pages = self.pager.poll()
+        if pages:
+            provisional = []
+            for page in pages:
+                if page.final:
+                    self._paged_rows.extend(page.entries)
+                    provisional = []
+                else:
+                    provisional = page.entries
+            last = pages[-1]
+            entries = self._paged_rows + provisional
+            self._render_listing(ListingResult(0, state.path, state.query, entries))
+
+            seen = f"{last.seen:,}+" if state.order is None and not last.done else f"{last.seen:,}"
+            note = f"Paged: {len(entries):,} of {seen} entries"
+            if last.ignored:
+                note += f"  •  {last.ignored:,} ignored"
+            self.analytics_bar.set_note(note)
+            if last.final:
+                self._set_loading(False)
+                if not last.done:
+                    self.load_more_btn.place(relx=0.5, rely=1.0, anchor="s", y=-24)
+                elif last.seen <= self.listing_worker.max_entries:
+                    # Read to the end and no longer too big: list it in
+                    # full next time
+                    ListingWorker.forget_size(state.path)
+        elif self._loading and time.perf_counter() - self._listing_started > self.UNREACHABLE_AFTER_S \
+                and not self._paged_rows:
+            self.loading_label.configure(text="⚠ Not responding - the folder may be unreachable")
+        if self.pager.busy or self.pager.results.qsize():
+            self._page_after_id = self.after(self.PAGE_POLL_INTERVAL_MS, self._poll_pages)
+
+    # ========== Streaming Population ==========
+
+    def _start_stream(self, listing, render):
+        """Apply a listing to the tree in time-sliced batches.
+
+        A fresh listing fills the analytics bar progressively as rows
+        appear; a refresh of the shown folder only touches changed rows
+        and updates the analytics once at the end.
+        """
+        fresh = not self.tree_sync.rows
+        steps = self.tree_sync.apply_steps(listing, render)
+        next(steps)  # diff computed, nothing applied yet
+
+        if fresh:
+            self.analytics_bar.start_stream()
+            index = listing.index
+
+            def on_slice(keys):
+                self.analytics_bar.add_rows(listing, [index[k] for k in keys])
+        else:
+            on_slice = None
+
+        def on_done():
+            self.analytics_bar.update_listing(listing)
+            # Expanders for new folder rows; nodes whose row went away are dropped
+            self.tree_nodes.add_placeholders(self.tree_sync, listing, listing)
+            self.tree_nodes.prune()
+            self._apply_pending_view()
+
+        self._stream_token += 1
+        self._stream = (steps, on_slice, on_done)
+        token = self._stream_token
+        self.after_idle(lambda: self._stream_slice(token))
+
+    def _stream_slice(self, token):
+        """Run one time-budgeted batch, then yield to Tk to repaint."""
+        if token != self._stream_token or self._stream is None:
+            return
+        steps, on_slice, on_done = self._stream
+        deadline = time.perf_counter() + self.STREAM_SLICE_MS / 1000
+        keys = []
+        finished = True
+        for key in steps:
+            keys.append(key)
+            if time.perf_counter() >= deadline:
+                finished = False
+                break
+
+        if on_slice and keys:
+            on_slice(keys)
+        if finished:
+            self._stream = None
+            on_done()
+        else:
+            # after_idle lets pending redraws run first; after(0) then
+            # queues the next batch behind them
+            self.after_idle(lambda: self.after(0, lambda: self._stream_slice(token)))
+
+    def _cancel_stream(self):
+        """Stop an in-progress stream, keeping the rows inserted so far."""
+        self._stream_token += 1
+        if self._stream is not None:
+            self._stream[0].close()
+            self._stream = None
+
+    def _finish_stream(self):
+        """Run an in-progress stream to completion right away."""
+        if self._stream is not None:
+            steps, _, on_done = self._stream
+            self._stream = None
+            self._stream_token += 1
+            for _ in steps:
+                pass
+            on_done()
+
+    # ========== Recursive View ==========
+
+    def _start_walk(self):
+        """List every file under the current folder, streaming rows in."""
+        self.listing_worker.cancel()
+        self._stop_paged()
+        if self._poll_after_id is not None:
+            self.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        self._stop_walk()
+        self._clear_tree()
+        self._listed_path = None
+        self.tree.configure(displaycolumns=("folder", "size", "date"))
+        self.analytics_bar.start_stream()
+        self.analytics_bar.set_note("")
+        self.walker.start(self.current_path, self._get_query())
+        self._set_loading(True)
+        self._walk_after_id = self.after(self.WALK_POLL_INTERVAL_MS, self._poll_walk)
+
+    def _stop_walk(self):
+        """Cancel a recursive walk and restore the normal columns."""
+        self.walker.cancel()
+        self.walker.state = None
+        if self._walk_after_id is not None:
+            self.after_cancel(self._walk_after_id)
+            self._walk_after_id = None
+        self.tree.configure(displaycolumns=("size", "date"))
+        self.analytics_bar.set_note("")
+
+    def _poll_walk(self):
+        """Add the files found since the last poll to the list."""
+        self._walk_after_id = None
+        state = self.walker.state
+        if state is None:
+            return
+        found, done = self.walker.poll()
+        listing = self._listing
+        first = len(listing)
+        if found:
+            # A new listing each time: TreeSync diffs against the last one
+            get_tag = MetadataService.get_tag
+            listing = self._listing = listing.copy()
+            listing.extend(found, lambda path: row_tag(get_tag(path)))
+        if done:
+            # Rows arrive in walk order; apply the panel's sort once complete
+            listing = self._listing = self.sorter.sorted_rows(listing)
+
+        render = self._render_for(listing)
+        if len(listing) >= self.virtual_threshold:
+            if not self.virtual_list.active:
+                self.tree_sync.clear()
+                self.virtual_list.enable()
+            self.virtual_list.set_rows(listing, render)
+        else:
+            self.tree_sync.apply(listing, render)
+
+        note = f"{state.throughput():,.0f} entries/s"
+        if state.ignored:
+            note += f"  •  {state.ignored:,} ignored"
+        self.analytics_bar.set_note(note)
+        if done:
+            self._set_loading(False)
+            self.analytics_bar.update_listing(listing)
+        else:
+            self.analytics_bar.add_rows(listing, range(first, len(listing)))
+            self._walk_after_id = self.after(self.WALK_POLL_INTERVAL_MS, self._poll_walk)
+
+    # ========== Index Search ==========
+
+    def _start_index_search(self, term):
+        """Search the name index for ``term`` in this tree or all workspaces.
+
+        A tree outside the indexed roots is searched by walking it instead.
+        """
+        self.listing_worker.cancel()
+        if self._poll_after_id is not None:
+            self.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        self._stop_paged()
+        under = self.current_path if self.search_scope_var.get() == SCOPE_TREE else None
+        if under is not None and not NameIndex.covers(under):
+            self._stop_index_search()
+            self._start_walk()
+            return
+        if self.walker.state is not None:
+            self._stop_walk()
+        if not self._index_search:
+            self._clear_tree()
+        self._listed_path = None
+        self._index_search = True
+        self._index_under = under
+        self.tree.configure(displaycolumns=("folder", "size", "date"))
+        self.index_query.submit(term, under)
+        self._set_loading(True)
+        if self._index_after_id is None:
+            self._index_after_id = self.after(self.POLL_INTERVAL_MS, self._poll_index)
+
+    def _stop_index_search(self):
+        """Drop index results and restore the normal columns."""
+        self.index_query.cancel()
+        if self._index_after_id is not None:
+            self.after_cancel(self._index_after_id)
+            self._index_after_id = None
+        if self._index_search:
+            self._index_search = False
+            self._index_under = None
+            self.tree.configure(displaycolumns=("size", "date"))
+            self.analytics_bar.set_note("")
+
+    def _poll_index(self):
+        """Show the index's answer."""
+        self._index_after_id = None
+        result = self.index_query.poll()
+        if result is None:
+            self._index_after_id = self.after(self.POLL_INTERVAL_MS, self._poll_index)
+            return
+        entries, truncated, seconds = result
+        self._set_loading(False)
+        self._cancel_stream()
+        listing = self._listing = self._build_listing(entries)
+        self.virtual_list.disable()
+        self.tree_sync.apply(listing, self._render_for(listing))
+        self.analytics_bar.update_listing(listing)
+        self._fill_stats(entries)
+
+        note = f"Index: {len(entries):,}{'+' if truncated else ''} matches in {seconds * 1000:.0f} ms"
+        if not NameIndex.ready():
+            note += "  •  still indexing"
+        self.analytics_bar.set_note(note)
+
+    # ========== Prefetching ==========
+
+    def _on_selection_changed(self, event=None):
+        """Drop prefetches for the old selection and schedule new ones."""
+        self.prefetcher.cancel()
+        self.prefetch_debouncer.trigger()
+        if self.content_search.hits:
+            self._show_content_hit()
+
+    def _prefetch_neighbours(self):
+        """Prefetch the highlighted sub-folder and the parent folder."""
+        if not self.current_path:
+            return
+        targets = []
+        paths = self._selected_paths()
+        if len(paths) == 1:
+            record = self._listing.get(paths[0])
+            if record is not None and record.is_dir:
+                targets.append(record.path)
+        parent = os.path.dirname(self.current_path)
+        if parent and parent != self.current_path:
+            targets.append(parent)
+        self.prefetcher.prefetch(targets, self._ignore_rules())
+
+    def _record_for_item(self, iid):
+        """RowRecord shown by a Treeview item, or None."""
+        if self.virtual_list.active:
+            return self._listing.get(self.virtual_list.sync.key_for(iid))
+        key = self.tree_sync.key_for(iid)
+        if key is not None:
+            return self._listing.get(key)
+        # A row inside an expanded tree node
+        return self.tree_nodes.record_for_item(iid)
+
+    def _record_for_path(self, path):
+        """RowRecord for a shown path (top level or inside a tree node), or None."""
+        record = self._listing.get(path)
+        return record if record is not None else self.tree_nodes.record_for_path(path)
+
+    def _path_for_item(self, iid):
+        """Full path shown by a Treeview item, or None."""
+        record = self._record_for_item(iid)
+        return record.path if record is not None else None
+
+    def _selected_paths(self):
+        """Full paths of the selected rows, in display order."""
+        if self.virtual_list.active:
+            return self.virtual_list.selected_keys()
+        paths = (self._path_for_item(iid) for iid in self.tree.selection())
+        return [path for path in paths if path is not None]
+
+    def _sort_tree(self, col):
+        """Sort by a column; clicking the active column flips the direction."""
+        state = self.sorter.state
+        reverse = not state.reverse if state is not None and state.column == col else False
+        order = self._page_order()
+        self.sorter.set_state(SortState(col, reverse))
+        self.config_data.setdefault("panel_sort", {})[self.panel_id] = [col, reverse]
+        self.save_callback()
+        self._update_sort_headings()
+
+        if self._paged_path == self.current_path and self._page_order() != order:
+            # Pages of a giant folder are read in date order, so re-read them
+            self._start_paged()
+            return
+
+        self._finish_stream()
+        listing = self.sorter.sorted_rows(self._listing)
+        self._listing = listing
+        render = self._render_for(listing)
+        if self.virtual_list.active:
+            self.virtual_list.set_rows(listing, render)
         else:
-            items.sort(key=lambda x: x[0].lower(), reverse=reverse)
-        for i, (_, k) in enumerate(items):
-            self.tree.move(k, '', i)
-        self.tree.heading(col, command=lambda: self._sort_tree(col, not reverse))
+            # Only the order differs, so this is a single set_children call
+            self.tree_sync.apply(listing, render)
+            self.tree_nodes.resort()
+
+    def _update_sort_headings(self):
+        """Show the active sort column and direction in the headings."""
+        state = self.sorter.state
+        for col, label in self.SORT_HEADINGS.items():
+            if state is not None and state.column == col:
+                label += " ▼" if state.reverse else " ▲"
+            self.tree.heading(col, text=label)
 
     # ========== Event Handlers ==========
 
     def _on_double_click(self, event):
         """Handle double-click on tree item."""
-        item = self.tree.selection()
-        if item:
-            fpath = self.tree.item(item, "tags")[0]
-            if os.path.isdir(fpath):
-                self.set_path(fpath)
+        paths = self._selected_paths()
+        if paths:
+            # Use what the listing already knows rather than stat'ing here
+            record = self._record_for_path(paths[0])
+            if record is None:
+                return
+            if record.is_dir:
+                self.set_path(record.path)
             else:
-                open_path(fpath)
+                open_path(record.path)
 
     def _on_right_click(self, event):
         """Handle right-click context menu."""
         item = self.tree.identify_row(event.y)
-        selected_items = self.tree.selection()
+        selected_paths = self._selected_paths()
         panels = self.get_panels_callback()
 
-        if len(selected_items) > 1:
+        if len(selected_paths) > 1:
             # Bulk operations
-            file_paths = [
-                self.tree.item(sel, "tags")[0]
-                for sel in selected_items
-                if os.path.isfile(self.tree.item(sel, "tags")[0])
-            ]
+            records = (self._record_for_path(path) for path in selected_paths)
+            file_paths = [r.path for r in records if r is not None and not r.is_dir]
             if file_paths:
                 menu = self.menu_builder.build_bulk_menu(
                     file_paths=file_paths,
@@ -528,7 +1543,7 @@ class FolderCard(ctk.CTkFrame):
                 menu.tk_popup(event.x_root, event.y_root)
         elif item:
             self.tree.selection_set(item)
-            fpath = self.tree.item(item, "tags")[0]
+            fpath = self._path_for_item(item)
 
             menu = self.menu_builder.build_single_file_menu(
                 fpath=fpath,
@@ -551,19 +1566,19 @@ class FolderCard(ctk.CTkFrame):
     # ========== File Operations ==========
 
     def _copy_selected(self):
-        item = self.tree.selection()
-        if item:
-            self._copy_file(self.tree.item(item, "tags")[0])
+        paths = self._selected_paths()
+        if paths:
+            self._copy_file(paths[0])
 
     def _cut_selected(self):
-        item = self.tree.selection()
-        if item:
-            self._cut_file(self.tree.item(item, "tags")[0])
+        paths = self._selected_paths()
+        if paths:
+            self._cut_file(paths[0])
 
     def _delete_selected(self):
-        item = self.tree.selection()
-        if item:
-            self._delete_file(self.tree.item(item, "tags")[0])
+        paths = self._selected_paths()
+        if paths:
+            self._delete_file(paths[0])
 
     def _copy_file(self, fpath):
         InternalClipboard.set(fpath, 'copy', self)
@@ -675,6 +1690,8 @@ class FolderCard(ctk.CTkFrame):
         self.title_label.configure(font=("Segoe UI", new_size + 6, "bold"))
         self.path_label.configure(font=("Segoe UI", new_size - 2))
         self.btn_browse.configure(font=("Segoe UI", new_size, "bold"), height=int(new_size * 2.0))
+        self.btn_back.configure(font=("Segoe UI", new_size, "bold"), height=int(new_size * 2.0))
+        self.btn_forward.configure(font=("Segoe UI", new_size, "bold"), height=int(new_size * 2.0))
         self.btn_up.configure(font=("Segoe UI", new_size, "bold"), height=int(new_size * 2.0))
         self.btn_open_folder.configure(font=("Segoe UI", new_size), height=int(new_size * 2.0))
         self.search_entry.configure(font=("Segoe UI", new_size), height=int(new_size * 2.0))
@@ -687,7 +1704,36 @@ class FolderCard(ctk.CTkFrame):
 
     def destroy(self):
         """Clean up resources on destroy."""
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
+        self.listing_worker.cancel()
+        self.pager.cancel()
+        self.index_query.cancel()
+        self.content_search.cancel()
+        self.walker.cancel()
+        self.prefetcher.cancel()
+        self.stat_filler.cancel()
+        self.prefetch_debouncer.cancel()
+        self.search_debouncer.cancel()
+        self._cancel_stream()
+        self.tree_nodes.clear()
+        if self._poll_after_id is not None:
+            self.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        if self._walk_after_id is not None:
+            self.after_cancel(self._walk_after_id)
+            self._walk_after_id = None
+        if self._stat_after_id is not None:
+            self.after_cancel(self._stat_after_id)
+            self._stat_after_id = None
+        if self._page_after_id is not None:
+            self.after_cancel(self._page_after_id)
+            self._page_after_id = None
+        if self._index_after_id is not None:
+            self.after_cancel(self._index_after_id)
+            self._index_after_id = None
+        if self._content_after_id is not None:
+            self.after_cancel(self._content_after_id)
+            self._content_after_id = None
+        if self._watch is not None:
+            self._watch.cancel()
+            self._watch = None
         super().destroy()
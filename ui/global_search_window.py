@@ -0,0 +1,166 @@
+"""
+Global Search Window - Ranked results of a search across every panel.
+
+The search itself runs in the background (services/global_search.py);
+this window polls it and inserts each new match at its rank, so the
+best results stay on top while slower folders are still being read.
+"""
+
+import bisect
+import os
+from tkinter import ttk
+
+import customtkinter as ctk
+
+from services.global_search import GlobalSearch, search_roots
+from services.tree_loader import is_within
+from utils.files import open_path
+
+
+class GlobalSearchWindow(ctk.CTkToplevel):
+    """Ranked, de-duplicated results of the toolbar's global search.
+
+    ``get_panel_paths`` returns (panel_id, folder) for every panel,
+    ``get_rules`` the ignore rules in effect (or None), ``on_reveal``
+    is called with a result's path to show it in a panel, and
+    ``on_save`` after a setting in the config has been changed.
+    """
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, parent, config_data, get_panel_paths, get_rules, on_reveal, on_save,
+                 font_size=14):
+        super().__init__(parent)
+        self.config_data = config_data
+        self.get_panel_paths = get_panel_paths
+        self.get_rules = get_rules
+        self.on_reveal = on_reveal
+        self.on_save = on_save
+        self.search = GlobalSearch()
+        self.term = ""
+        self._after_id = None
+        self._keys = []          # Rank keys of the rows, in display order
+        self._paths = {}         # Treeview item -> path
+        self._panel_paths = []
+
+        self.title("Global Search")
+        self.geometry("820x560")
+        self.attributes('-topmost', True)
+        font = ("Segoe UI", font_size)
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.pack(fill="x", padx=15, pady=(15, 5))
+        self.title_label = ctk.CTkLabel(header, text="Global Search", font=("Segoe UI", 18, "bold"))
+        self.title_label.pack(side="left")
+        self.recursive_var = ctk.BooleanVar(value=bool(config_data.get("global_search_recursive", False)))
+        ctk.CTkCheckBox(header, text="Include sub-folders", variable=self.recursive_var,
+                        command=self._on_recursive_toggled, font=font).pack(side="right")
+
+        self.status_label = ctk.CTkLabel(self, text="", font=("Segoe UI", font_size - 2), anchor="w")
+        self.status_label.pack(fill="x", padx=15)
+
+        frame = ctk.CTkFrame(self, fg_color="transparent")
+        frame.pack(fill="both", expand=True, padx=15, pady=5)
+        self.tree = ttk.Treeview(frame, columns=("folder", "panel"), selectmode="browse")
+        self.tree.heading("#0", text="Name", anchor="w")
+        self.tree.heading("folder", text="Folder", anchor="w")
+        self.tree.heading("panel", text="Panel", anchor="w")
+        self.tree.column("#0", width=260)
+        self.tree.column("folder", width=420)
+        self.tree.column("panel", width=70, stretch=False)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+        self.tree.bind("<Return>", lambda e: self.reveal_selected())
+
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(fill="x", padx=15, pady=(5, 15))
+        ctk.CTkButton(buttons, text="Reveal in panel", command=self.reveal_selected).pack(side="left")
+        ctk.CTkButton(buttons, text="Open", command=self.open_selected).pack(side="left", padx=10)
+
+    def run(self, term):
+        """Search every panel's folder for ``term``, replacing the results."""
+        self.term = term
+        self._clear()
+        if not term:
+            self.search.cancel()
+            self.status_label.configure(text="")
+            return
+        recursive = self.recursive_var.get()
+        self._panel_paths = [(pid, os.path.normcase(os.path.normpath(path)))
+                             for pid, path in self.get_panel_paths() if path]
+        roots = search_roots((path for _, path in self.get_panel_paths()), recursive)
+        self.search.start(roots, term, self.get_rules(), recursive)
+        self.title_label.configure(text=f"Results for '{term}'")
+        self._set_status(len(roots))
+        if self._after_id is None:
+            self._after_id = self.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _on_recursive_toggled(self):
+        self.config_data["global_search_recursive"] = self.recursive_var.get()
+        self.on_save()
+        self.run(self.term)
+
+    def _clear(self):
+        self.tree.delete(*self.tree.get_children())
+        self._keys = []
+        self._paths = {}
+
+    def _poll(self):
+        """Insert new matches at their rank."""
+        self._after_id = None
+        hits = self.search.poll()
+        for hit in hits:
+            key = (hit.rank, hit.entry.path)
+            index = bisect.bisect(self._keys, key)
+            self._keys.insert(index, key)
+            folder = os.path.dirname(hit.entry.path)
+            iid = self.tree.insert("", index, text=hit.entry.name,
+                                   values=(folder, self._panels_for(hit.entry.path, hit.root)))
+            self._paths[iid] = hit.entry.path
+        self._set_status()
+        if not self.search.done:
+            self._after_id = self.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _panels_for(self, path, root):
+        """Panels showing ``root`` (or, recursively, a folder above ``path``)."""
+        key = os.path.normcase(root)
+        folder = os.path.normcase(os.path.dirname(path))
+        recursive = self.recursive_var.get()
+        ids = [str(pid) for pid, panel_path in self._panel_paths
+               if panel_path == key or (recursive and is_within(folder, panel_path))]
+        return ", ".join(dict.fromkeys(ids))
+
+    def _set_status(self, roots=None):
+        search = self.search
+        text = f"{search.count:,}{'+' if search.truncated else ''} matches"
+        if roots is not None:
+            text = f"Searching {roots} folder{'s' if roots != 1 else ''}…"
+        elif not search.done:
+            text += "  •  searching…"
+        if search.errors:
+            text += f"  •  {search.errors} folder(s) unreadable"
+        self.status_label.configure(text=text)
+
+    def _selected_path(self):
+        selection = self.tree.selection()
+        return self._paths.get(selection[0]) if selection else None
+
+    def reveal_selected(self):
+        path = self._selected_path()
+        if path:
+            self.on_reveal(path)
+
+    def open_selected(self):
+        path = self._selected_path()
+        if path:
+            open_path(path)
+
+    def destroy(self):
+        self.search.cancel()
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
@@ -0,0 +1,138 @@
+import os
+import time
+from tkinter import ttk
+
+import customtkinter as ctk
+
+from services.goto_index import GotoIndex
+from services.name_index import NameIndex
+from utils.files import open_path
+
+
+class GotoPalette(ctk.CTkToplevel):
+    """Ctrl+P "Go to file": fuzzy name search over every workspace file.
+
+    Results are re-ranked on each keystroke from the GotoIndex snapshot.
+    Enter opens the selected file; Ctrl+Enter (or Shift+Enter) calls
+    ``on_reveal`` with its path to show it in a panel.
+    """
+
+    MAX_RESULTS = 50
+
+    # How often an open palette looks for a newer snapshot
+    REFRESH_MS = 1000
+
+    def __init__(self, parent, on_reveal, font_size=14):
+        super().__init__(parent)
+        self.on_reveal = on_reveal
+        self.index = None
+        self.result = None
+        self._paths = []
+        self._after_id = None
+
+        self.title("Go to File")
+        self.geometry("720x460")
+        self.attributes('-topmost', True)
+        font = ("Segoe UI", font_size)
+
+        self.query_var = ctk.StringVar()
+        self.entry = ctk.CTkEntry(self, textvariable=self.query_var, height=36, font=font,
+                                  placeholder_text="Type a file name…")
+        self.entry.pack(fill="x", padx=15, pady=(15, 5))
+        self.status_label = ctk.CTkLabel(self, text="", font=("Segoe UI", font_size - 2), anchor="w")
+        self.status_label.pack(fill="x", padx=15)
+
+        self.tree = ttk.Treeview(self, columns=("folder",), selectmode="browse")
+        self.tree.heading("#0", text="Name", anchor="w")
+        self.tree.heading("folder", text="Folder", anchor="w")
+        self.tree.column("#0", width=260)
+        self.tree.column("folder", width=420)
+        self.tree.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+        self.tree.bind("<Return>", lambda e: self.open_selected())
+
+        self.query_var.trace_add("write", lambda *args: self.refresh())
+        self.entry.bind("<Down>", lambda e: self._move(1))
+        self.entry.bind("<Up>", lambda e: self._move(-1))
+        self.entry.bind("<Next>", lambda e: self._move(10))
+        self.entry.bind("<Prior>", lambda e: self._move(-10))
+        self.entry.bind("<Return>", lambda e: self.open_selected())
+        self.entry.bind("<Control-Return>", lambda e: self.reveal_selected())
+        self.entry.bind("<Shift-Return>", lambda e: self.reveal_selected())
+        self.bind("<Escape>", lambda e: self.destroy())
+
+        GotoIndex.warm(force=True)
+        self._check_index()
+        self.after(50, self.entry.focus_set)
+
+    def _check_index(self):
+        """Pick up a newer snapshot (re-running the query) while open."""
+        self._after_id = self.after(self.REFRESH_MS, self._check_index)
+        index = GotoIndex.current()
+        if index is not self.index:
+            self.index = index
+            self.result = None
+            self.refresh()
+
+    def refresh(self):
+        """Re-rank the results for the current query."""
+        query = self.query_var.get()
+        index = self.index
+        self.tree.delete(*self.tree.get_children())
+        self._paths = []
+        if index is None:
+            self.status_label.configure(text="Indexing workspace files…")
+            return
+        started = time.perf_counter()
+        self.result = index.search(query, self.MAX_RESULTS, self.result)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for row, match in enumerate(self.result.matches):
+            self.tree.insert("", "end", iid=str(row), text=match.name, values=(match.folder,))
+            self._paths.append(match.path)
+        if self._paths:
+            self.tree.selection_set("0")
+        text = f"{len(index):,} files"
+        if query.strip():
+            text = f"{len(self._paths)} shown  •  {text}  •  {elapsed_ms:.0f} ms"
+        if not NameIndex.ready() or GotoIndex.stale():
+            text += "  •  updating…"
+        self.status_label.configure(text=text)
+
+    def _move(self, step):
+        """Move the selection while the focus stays in the entry."""
+        if self._paths:
+            selection = self.tree.selection()
+            row = int(selection[0]) + step if selection else 0
+            row = str(max(0, min(len(self._paths) - 1, row)))
+            self.tree.selection_set(row)
+            self.tree.see(row)
+        return "break"
+
+    def _selected_path(self):
+        """The selected file, or None (noting it if it has gone since indexing)."""
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        path = self._paths[int(selection[0])]
+        if not os.path.exists(path):
+            self.status_label.configure(text=f"'{os.path.basename(path)}' no longer exists")
+            return None
+        return path
+
+    def open_selected(self):
+        path = self._selected_path()
+        if path:
+            self.destroy()
+            open_path(path)
+
+    def reveal_selected(self):
+        path = self._selected_path()
+        if path:
+            self.destroy()
+            self.on_reveal(path)
+
+    def destroy(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
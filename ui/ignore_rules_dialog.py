@@ -0,0 +1,56 @@
+import customtkinter as ctk
+
+from services.ignore_rules import DEFAULT_PATTERNS
+
+
+class IgnoreRulesDialog(ctk.CTkToplevel):
+    """Editor for the global and active-workspace ignore patterns.
+
+    Patterns use .gitignore syntax (see services/ignore_rules.py), one
+    per line. ``on_save`` is called after the config has been updated.
+    """
+
+    def __init__(self, parent, config_data, on_save, font_size=14):
+        super().__init__(parent)
+        self.config_data = config_data
+        self.on_save = on_save
+        self.workspace = config_data.get("active_workspace")
+        if self.workspace not in config_data.get("workspaces", {}):
+            self.workspace = None
+
+        self.title("Ignore Rules")
+        self.geometry("460x560")
+        self.attributes('-topmost', True)
+        font = ("Segoe UI", font_size)
+
+        ctk.CTkLabel(self, text="Ignore Rules", font=("Segoe UI", 18, "bold")).pack(pady=(15, 5))
+        ctk.CTkLabel(self, text="One .gitignore-style pattern per line, e.g. node_modules/ or *.tmp",
+                     font=("Segoe UI", font_size - 2)).pack(padx=15)
+
+        ctk.CTkLabel(self, text="All folders", font=font).pack(anchor="w", padx=15, pady=(10, 2))
+        self.global_text = ctk.CTkTextbox(self, height=170, font=font)
+        self.global_text.pack(fill="x", padx=15)
+        self.global_text.insert("1.0", "\n".join(config_data.get("ignore_patterns", DEFAULT_PATTERNS)))
+
+        label = f"Workspace '{self.workspace}'" if self.workspace else "Workspace (load or save one first)"
+        ctk.CTkLabel(self, text=label, font=font).pack(anchor="w", padx=15, pady=(10, 2))
+        self.workspace_text = ctk.CTkTextbox(self, height=120, font=font)
+        self.workspace_text.pack(fill="x", padx=15)
+        if self.workspace:
+            patterns = config_data["workspaces"][self.workspace].get("ignore_patterns", [])
+            self.workspace_text.insert("1.0", "\n".join(patterns))
+        else:
+            self.workspace_text.configure(state="disabled")
+
+        ctk.CTkButton(self, text="Save", command=self.save).pack(pady=15)
+
+    @staticmethod
+    def _lines(textbox):
+        return [line for line in textbox.get("1.0", "end").splitlines() if line.strip()]
+
+    def save(self):
+        self.config_data["ignore_patterns"] = self._lines(self.global_text)
+        if self.workspace:
+            self.config_data["workspaces"][self.workspace]["ignore_patterns"] = self._lines(self.workspace_text)
+        self.on_save()
+        self.destroy()
@@ -0,0 +1,41 @@
+"""
+Row Model - What a panel knows about each row it shows.
+
+Rows used to carry their full path as a Treeview tag so handlers could
+read it back with ``tree.item(iid, "tags")[0]``. Tk never frees a tag
+once it exists, so every path ever shown stayed in the interpreter's tag
+table. Instead each panel resolves item IDs to RowRecords through its
+TreeSync and ListingColumns (services/listing_columns.py), and tags are
+used only for the colours in TAG_COLORS.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from services.listing_columns import RowRecord
+from ui.styles import TAG_COLORS
+
+
+def row_tag(meta: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+    """(colour, has note) for a MetadataService tag; unknown colours are dropped."""
+    color = meta.get("color")
+    return (color if color in TAG_COLORS else None), bool(meta.get("note"))
+
+
+def item_options(record: RowRecord, icon: Any = None, folder: Optional[str] = None) -> Dict[str, Any]:
+    """Treeview item options for a record.
+
+    ``tags`` is always given (possibly empty) so that redrawing a row
+    whose colour was removed clears it. ``folder`` fills the relative
+    folder column of the recursive view.
+    """
+    if record.is_dir:
+        options = {"text": record.name, "values": ["", ""], "tags": ()}
+    else:
+        text = record.name + " 📝" if record.has_note else record.name
+        options = {"text": text, "values": [record.size_str, record.mod_str],
+                   "tags": (record.color,) if record.color else ()}
+    if folder is not None:
+        options["values"].append(folder)
+    if icon:
+        options["image"] = icon
+    return options
@@ -0,0 +1,268 @@
+"""
+Tree Nodes - Lazily loaded folder nodes for the expandable tree mode.
+
+In tree mode every folder row gets a placeholder child so Tk draws an
+expander. Opening the row (<<TreeviewOpen>>) lists the folder in the
+background (services/tree_loader.py); the result replaces the
+placeholder through a TreeSync parented to that row, so reloading a
+node later only touches its changed children. Closing a row keeps its
+children until the rows held by collapsed subtrees exceed the
+NodeBudget, then the oldest collapsed subtrees are unloaded back to a
+placeholder. Only expanded nodes are watched for changes, so a node
+that is opened again is reloaded.
+"""
+
+from tkinter import ttk
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from services.listing_columns import ListingColumns, RowRecord
+from services.listing_filter import ListingQuery
+from services.listing_worker import ListingResult
+from services.tree_loader import NodeBudget, NodeLoader, is_within
+from ui.tree_sync import TreeSync
+
+
+class TreeNode:
+    """A loaded folder row and the children shown under it."""
+
+    __slots__ = ("path", "iid", "sync", "listing")
+
+    def __init__(self, path: str, iid: str, sync: TreeSync):
+        self.path = path
+        self.iid = iid
+        self.sync = sync
+        self.listing = ListingColumns()
+
+
+class TreeNodes:
+    """Expands folder rows in place, loading their children on demand."""
+
+    POLL_INTERVAL_MS = 30
+    PLACEHOLDER_TEXT = "Loading..."
+
+    def __init__(self, tree: ttk.Treeview,
+                 path_for_item: Callable[[str], Optional[str]],
+                 get_query: Callable[[], ListingQuery],
+                 build_listing: Callable[[ListingResult], ListingColumns],
+                 sort_listing: Callable[[ListingColumns], ListingColumns],
+                 render_for: Callable[[ListingColumns], Callable[[Hashable], Dict[str, Any]]],
+                 watch: Optional[Callable[[str], None]] = None,
+                 unwatch: Optional[Callable[[str], None]] = None):
+        """Initialize (inactive until enable() is called).
+
+        Args:
+            tree: The panel's Treeview
+            path_for_item: Resolves a top-level row to its path
+            get_query: Current filter/search for child listings
+            build_listing: Turns a listing result into display-ordered columns
+            sort_listing: Re-sorts columns after the sort column changes
+            render_for: Render callback for the rows of some columns
+            watch: Called with a folder once it is expanded and loaded
+            unwatch: Called with a folder when it is collapsed or unloaded
+        """
+        self.tree = tree
+        self.path_for_item = path_for_item
+        self.get_query = get_query
+        self.build_listing = build_listing
+        self.sort_listing = sort_listing
+        self.render_for = render_for
+        self.watch = watch or (lambda path: None)
+        self.unwatch = unwatch or (lambda path: None)
+
+        self.active = False
+        self.loader = NodeLoader()
+        self.budget = NodeBudget()
+        self.nodes: Dict[str, TreeNode] = {}
+        self.placeholders: Dict[str, str] = {}    # folder iid -> placeholder iid
+        self.watched = set()
+        self._after_id = None
+
+        tree.bind("<<TreeviewOpen>>", self._on_open, add="+")
+        tree.bind("<<TreeviewClose>>", self._on_close, add="+")
+
+    # ========== Mode ==========
+
+    def enable(self) -> None:
+        self.active = True
+
+    def disable(self) -> None:
+        self.clear()
+        self.active = False
+
+    def clear(self) -> None:
+        """Forget every node (their rows are deleted by the caller)."""
+        self.loader.cancel()
+        for path in list(self.watched):
+            self.unwatch(path)
+        self.watched.clear()
+        self.nodes = {}
+        self.placeholders = {}
+        self.budget = NodeBudget(self.budget.max_collapsed_rows)
+        if self._after_id is not None:
+            self.tree.after_cancel(self._after_id)
+            self._after_id = None
+
+    # ========== Rows ==========
+
+    def add_placeholders(self, sync: TreeSync, listing: ListingColumns, keys: Iterable[Hashable]) -> None:
+        """Give newly drawn folder rows an expander."""
+        if not self.active:
+            return
+        for key in keys:
+            iid = sync.iids.get(key)
+            if iid is None or iid in self.placeholders or key in self.nodes:
+                continue
+            record = listing.get(key)
+            if record is not None and record.is_dir:
+                self.placeholders[iid] = self.tree.insert(iid, "end", text=self.PLACEHOLDER_TEXT)
+
+    def record_for_item(self, iid: str) -> Optional[RowRecord]:
+        """RowRecord for a row inside an expanded node, or None."""
+        for node in self.nodes.values():
+            key = node.sync.key_for(iid)
+            if key is not None:
+                return node.listing.get(key)
+        return None
+
+    def record_for_path(self, path: str) -> Optional[RowRecord]:
+        """RowRecord for ``path`` if it is shown inside an expanded node."""
+        for node in self.nodes.values():
+            record = node.listing.get(path)
+            if record is not None:
+                return record
+        return None
+
+    def prune(self) -> None:
+        """Drop nodes whose folder row was removed by a refresh."""
+        tree = self.tree
+        for path, node in list(self.nodes.items()):
+            if not tree.exists(node.iid):
+                self._drop(path)
+        self.placeholders = {iid: pid for iid, pid in self.placeholders.items() if tree.exists(pid)}
+
+    def resort(self) -> None:
+        """Re-apply the sort to every loaded node's children."""
+        for node in self.nodes.values():
+            node.listing = self.sort_listing(node.listing)
+            node.sync.apply(node.listing, self.render_for(node.listing))
+
+    def reload(self, path: Optional[str] = None) -> None:
+        """Re-list one loaded node, or all of them (e.g. after the query changed)."""
+        paths = [path] if path is not None else list(self.nodes)
+        query = self.get_query()
+        for p in paths:
+            if p in self.nodes:
+                self.loader.submit(p, query)
+        self._schedule_poll()
+
+    # ========== Expand / collapse ==========
+
+    def _path_of(self, iid: str) -> Optional[str]:
+        record = self.record_for_item(iid)
+        if record is not None:
+            return record.path
+        return self.path_for_item(iid)
+
+    def _on_open(self, event=None) -> None:
+        if not self.active:
+            return
+        iid = self.tree.focus()
+        path = self._path_of(iid)
+        if path is None:
+            return
+        self.budget.expanded(path)
+        if path in self.nodes:
+            # Not watched while collapsed: catch up on changes made since.
+            # Unchanged folders come from the listing cache (one stat) and
+            # only changed rows are redrawn
+            self._watch(path)
+            self.reload(path)
+            return
+        self.loader.submit(path, self.get_query())
+        self._schedule_poll()
+
+    def _on_close(self, event=None) -> None:
+        if not self.active:
+            return
+        path = self._path_of(self.tree.focus())
+        if path is None:
+            return
+        self.loader.cancel(path)
+        if path in self.watched:
+            self.watched.discard(path)
+            self.unwatch(path)
+        if path in self.nodes:
+            self.budget.closed(path)
+            for victim in self.budget.to_unload():
+                self._unload(victim)
+
+    def _watch(self, path: str) -> None:
+        if path not in self.watched:
+            self.watched.add(path)
+            self.watch(path)
+
+    # ========== Loading ==========
+
+    def _schedule_poll(self) -> None:
+        if self._after_id is None:
+            self._after_id = self.tree.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self) -> None:
+        self._after_id = None
+        for result in self.loader.poll():
+            self._render(result)
+        if self.loader.pending:
+            self._schedule_poll()
+
+    def _iid_for(self, path: str) -> Optional[str]:
+        """Row showing folder ``path`` at any level, or None."""
+        for node in self.nodes.values():
+            iid = node.sync.iids.get(path)
+            if iid is not None:
+                return iid
+        for iid in self.placeholders:
+            if self.path_for_item(iid) == path:
+                return iid
+        return None
+
+    def _render(self, result: ListingResult) -> None:
+        node = self.nodes.get(result.path)
+        iid = node.iid if node is not None else self._iid_for(result.path)
+        if iid is None or not self.tree.exists(iid):
+            return
+        placeholder = self.placeholders.pop(iid, None)
+        if placeholder is not None and self.tree.exists(placeholder):
+            self.tree.delete(placeholder)
+        if result.error is not None:
+            return
+
+        if node is None:
+            node = self.nodes[result.path] = TreeNode(result.path, iid, TreeSync(self.tree, iid))
+        listing = self.build_listing(result)
+        node.listing = listing
+        diff = node.sync.apply(listing, self.render_for(listing))
+        self.add_placeholders(node.sync, listing, [key for _, key in diff.added])
+        self.prune()
+        self.budget.loaded(result.path, len(listing))
+        if self.tree.item(iid, "open"):
+            self._watch(result.path)
+
+    def _unload(self, path: str) -> None:
+        """Delete a collapsed node's rows and put its placeholder back."""
+        node = self.nodes.get(path)
+        if node is None:
+            return
+        node.sync.clear()
+        self._drop(path)
+        if self.tree.exists(node.iid):
+            self.placeholders[node.iid] = self.tree.insert(node.iid, "end", text=self.PLACEHOLDER_TEXT)
+
+    def _drop(self, path: str) -> None:
+        """Forget ``path`` and every node below it."""
+        for p in [p for p in self.nodes if is_within(p, path)]:
+            del self.nodes[p]
+            self.loader.cancel(p)
+            if p in self.watched:
+                self.watched.discard(p)
+                self.unwatch(p)
+        self.budget.forget(path)
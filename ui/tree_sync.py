@@ -0,0 +1,131 @@
+"""
+Tree Sync - Keeps a ttk.Treeview in step with a keyed listing model.
+
+Instead of deleting and re-inserting every row on refresh, TreeSync
+remembers which key each row shows and its signature, diffs the next
+listing against that (services/listing_diff.py) and applies only the
+removals, insertions and redraws. Untouched rows keep their selection
+and the view keeps its scroll position.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator
+
+from services.listing_diff import ListingDiff, diff_listing
+
+
+class TreeSync:
+    """Applies listing diffs to the top level of a Treeview."""
+
+    def __init__(self, tree: Any, parent: str = ""):
+        """Initialize the sync.
+
+        Args:
+            tree: ttk.Treeview (or anything with the same item API)
+            parent: Parent item whose children are managed
+        """
+        self.tree = tree
+        self.parent = parent
+        self.rows: Dict[Hashable, Hashable] = {}   # key -> signature, display order
+        self.iids: Dict[Hashable, str] = {}        # key -> Treeview iid
+        self.keys: Dict[str, Hashable] = {}        # Treeview iid -> key
+
+    def clear(self) -> None:
+        """Remove every managed row."""
+        if self.iids:
+            self.tree.delete(*self.iids.values())
+        self.rows = {}
+        self.iids = {}
+        self.keys = {}
+
+    def apply(self, new: Dict[Hashable, Hashable],
+              render: Callable[[Hashable], Dict[str, Any]]) -> ListingDiff:
+        """Bring the tree in line with ``new`` in one go.
+
+        Args:
+            new: Wanted ``key -> signature`` in display order
+            render: Returns Treeview item options (text, values, tags,
+                image) for a key; only called for added or changed rows
+
+        Returns:
+            The diff that was applied
+        """
+        steps = self.apply_steps(new, render)
+        diff = next(steps)
+        for _ in steps:
+            pass
+        return diff
+
+    def apply_steps(self, new: Dict[Hashable, Hashable],
+                    render: Callable[[Hashable], Dict[str, Any]]) -> Iterator:
+        """Generator form of apply() for spreading the work over time.
+
+        The first value yielded is the ListingDiff; after that the key of
+        each inserted or redrawn row is yielded as soon as it is on screen.
+        Closing the generator early leaves ``rows`` describing exactly what
+        the tree shows, so the next apply() diffs from the right state.
+        """
+        old = self.rows
+        diff = diff_listing(old, new)
+        tree = self.tree
+        done = set()
+        started = complete = False
+
+        try:
+            yield diff
+            started = True
+
+            if diff.removed:
+                doomed = [self.iids.pop(key) for key in diff.removed]
+                for iid in doomed:
+                    del self.keys[iid]
+                tree.delete(*doomed)
+
+            if diff.reordered:
+                # Put surviving rows in their new relative order first so the
+                # insertion indices below land in the right place. Every
+                # child is managed here, so one set_children call replaces
+                # a move per row
+                iids = self.iids
+                tree.set_children(self.parent, *[iids[key] for key in new if key in old])
+
+            for index, key in diff.added:
+                iid = tree.insert(self.parent, index, **render(key))
+                self.iids[key] = iid
+                self.keys[iid] = key
+                done.add(key)
+                yield key
+
+            for key in diff.changed:
+                tree.item(self.iids[key], **render(key))
+                done.add(key)
+                yield key
+
+            complete = True
+        finally:
+            if complete:
+                self.rows = new
+            elif started:
+                self.rows = {key: (new[key] if key in done else old[key])
+                             for key in new if key in done or key in self.iids}
+
+    def redraw(self, keys: Iterable[Hashable], render: Callable[[Hashable], Dict[str, Any]]) -> None:
+        """Redraw rows whose model was updated in place.
+
+        apply() cannot see such a change: the listing it last applied is
+        the one that changed. Keys not on screen (yet) are skipped.
+        """
+        iids = self.iids
+        for key in keys:
+            iid = iids.get(key)
+            if iid is not None:
+                self.tree.item(iid, **render(key))
+
+    def key_for(self, iid: str) -> Hashable:
+        """Key shown by a Treeview item, or None if it is not managed."""
+        return self.keys.get(iid)
+
+    def adopt_tree_order(self) -> None:
+        """Record the tree's current row order after rows were moved directly."""
+        rows = self.rows
+        self.rows = {self.keys[iid]: rows[self.keys[iid]]
+                     for iid in self.tree.get_children(self.parent) if iid in self.keys}
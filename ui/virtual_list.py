@@ -0,0 +1,203 @@
+"""
+Virtual List - Windowed display of very large listings in a ttk.Treeview.
+
+A Treeview keeps one Tcl item per row, which gets slow and memory hungry
+past ~100k rows. In virtual mode the full listing lives only in Python
+(``keys`` + ``rows``); the Treeview holds just the rows in the viewport
+plus a small overscan, and the scrollbar, mouse wheel and paging keys
+move a window over the model. Rows entering the window are rendered with
+the same callback as the normal list, so columns, icons and tag colours
+are unchanged, and the selection is tracked by key so it survives
+scrolling rows out of view.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, Hashable, List
+
+from ui.tree_sync import TreeSync
+
+
+class VirtualList:
+    """Drives a Treeview as a window over an in-memory listing."""
+
+    OVERSCAN = 10
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar):
+        """Initialize the virtual list (inactive until enable() is called).
+
+        Args:
+            tree: Treeview that shows the window
+            scrollbar: Vertical scrollbar to drive from the model
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.sync = TreeSync(tree)
+        self.active = False
+
+        self.keys: List[Hashable] = []
+        self.rows: Dict[Hashable, Hashable] = {}
+        self.render: Callable[[Hashable], Dict[str, Any]] = None
+        self.offset = 0
+        self.selected = set()
+
+        tree.bind("<MouseWheel>", self._on_wheel, add="+")
+        if tree.tk.call("tk", "windowingsystem") == "x11":
+            # X11 reports the wheel as buttons 4/5 (elsewhere they are the
+            # back/forward mouse buttons)
+            tree.bind("<Button-4>", self._on_wheel, add="+")
+            tree.bind("<Button-5>", self._on_wheel, add="+")
+        tree.bind("<Configure>", lambda e: self.active and self._draw(), add="+")
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        tree.bind("<Up>", self._on_up, add="+")
+        tree.bind("<Prior>", lambda e: self._on_key_scroll(-self._visible_rows()), add="+")
+        tree.bind("<Next>", lambda e: self._on_key_scroll(self._visible_rows()), add="+")
+        tree.bind("<Home>", lambda e: self._on_key_scroll(-len(self.keys)), add="+")
+        tree.bind("<End>", lambda e: self._on_key_scroll(len(self.keys)), add="+")
+
+    # ========== Mode ==========
+
+    def enable(self) -> None:
+        """Take over the tree and scrollbar."""
+        if self.active:
+            return
+        self.active = True
+        self.offset = 0
+        self.tree.configure(yscrollcommand=self._on_tree_yscroll)
+        self.scrollbar.configure(command=self.yview)
+
+    def disable(self) -> None:
+        """Drop the window and hand scrolling back to the tree."""
+        if not self.active:
+            return
+        self.active = False
+        self.sync.clear()
+        self.keys = []
+        self.rows = {}
+        self.selected = set()
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+
+    # ========== Model ==========
+
+    def set_rows(self, rows: Dict[Hashable, Hashable],
+                 render: Callable[[Hashable], Dict[str, Any]]) -> None:
+        """Replace the model, keeping the scroll offset and selection.
+
+        Args:
+            rows: ``key -> signature`` in display order
+            render: Returns Treeview item options for a key
+        """
+        self.rows = rows
+        self.keys = list(rows)
+        self.render = render
+        self.selected = {key for key in self.selected if key in rows}
+        self._draw()
+
+    def reorder(self, keys: List[Hashable]) -> None:
+        """Show the same rows in a new order (e.g. after sorting)."""
+        self.keys = keys
+        self.rows = {key: self.rows[key] for key in keys}
+        self._draw()
+
+    def select_keys(self, keys: List[Hashable]) -> None:
+        """Replace the selection, including rows outside the window."""
+        self.selected = {key for key in keys if key in self.rows}
+        self._draw()
+
+    def selected_keys(self) -> List[Hashable]:
+        """Selected keys in display order, including rows scrolled out of view."""
+        if not self.selected:
+            return []
+        return [key for key in self.keys if key in self.selected]
+
+    # ========== Scrolling ==========
+
+    def yview(self, *args) -> None:
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, what)."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.keys)))
+        elif args[0] == "scroll":
+            step = self._visible_rows() if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def scroll_to(self, offset: int) -> None:
+        """Make model row ``offset`` the first visible row."""
+        offset = max(0, min(offset, len(self.keys) - self._visible_rows()))
+        if offset != self.offset:
+            self.offset = offset
+            self._draw()
+
+    def _visible_rows(self) -> int:
+        try:
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            row_height = 20
+        # One row's worth of the height is taken by the headings
+        return max(1, self.tree.winfo_height() // max(1, row_height) - 1)
+
+    def _draw(self) -> None:
+        """Materialize the rows in the current window."""
+        if not self.active or self.render is None:
+            return
+        visible = self._visible_rows()
+        self.offset = max(0, min(self.offset, len(self.keys) - visible))
+        window = self.keys[self.offset:self.offset + visible + self.OVERSCAN]
+        rows = self.rows
+        self.sync.apply({key: rows[key] for key in window}, self.render)
+        self.tree.yview_moveto(0)
+        self.tree.selection_set([self.sync.iids[key] for key in window if key in self.selected])
+        self._update_scrollbar(visible)
+
+    def _update_scrollbar(self, visible: int) -> None:
+        total = len(self.keys)
+        if total <= visible:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+
+    def _on_tree_yscroll(self, first, last) -> None:
+        """The tree scrolled itself (e.g. arrow keys past the last row)."""
+        first = float(first)
+        if first > 0 and self.sync.rows:
+            self.scroll_to(self.offset + round(first * len(self.sync.rows)))
+            self.tree.yview_moveto(0)
+
+    def _on_wheel(self, event):
+        if not self.active:
+            return None
+        if event.num == 4:
+            delta = -3
+        elif event.num == 5:
+            delta = 3
+        else:
+            delta = -3 if event.delta > 0 else 3
+        self.scroll_to(self.offset + delta)
+        return "break"
+
+    def _on_key_scroll(self, delta: int):
+        if not self.active:
+            return None
+        self.scroll_to(self.offset + delta)
+        return "break"
+
+    def _on_up(self, event):
+        """Scroll up one row when moving the focus above the first row."""
+        if not self.active or self.offset == 0:
+            return None
+        children = self.tree.get_children()
+        if children and self.tree.focus() == children[0]:
+            self.scroll_to(self.offset - 1)
+        return None
+
+    # ========== Selection ==========
+
+    def _on_select(self, event) -> None:
+        """Merge the window's selection into the model selection."""
+        if not self.active:
+            return
+        picked = {self.sync.key_for(iid) for iid in self.tree.selection()}
+        picked.discard(None)
+        self.selected = self.selected.difference(self.sync.rows).union(picked)
@@ -8,4 +8,13 @@ class Debouncer:
     def trigger(self):
         if self._timer_id:
             self.widget.after_cancel(self._timer_id)
-        self._timer_id = self.widget.after(self.delay, self.callback)
+        self._timer_id = self.widget.after(self.delay, self._fire)
+
+    def cancel(self):
+        if self._timer_id:
+            self.widget.after_cancel(self._timer_id)
+            self._timer_id = None
+
+    def _fire(self):
+        self._timer_id = None
+        self.callback()